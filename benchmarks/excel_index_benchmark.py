@@ -0,0 +1,75 @@
+"""
+Compares per-order DataFrame scans with the ExcelReader Order ID index.
+
+Usage:
+    python benchmarks/excel_index_benchmark.py [--rows 100000] [--reports-per-order 5] [--sample 500]
+
+The mask-and-to_dict path is O(rows) per order, so it is timed on --sample orders and
+extrapolated to every order; the index is timed on all of them.
+"""
+import argparse
+import logging
+import time
+
+import pandas as pd
+
+from automation.utilities.logger import logger
+from automation.utilities.excel_reader import ExcelReader
+
+
+def make_sheet(rows, reports_per_order):
+    """Builds a column-mapped sheet with `rows` rows spread over rows / reports_per_order orders."""
+    mapper = ExcelReader.COLUMNS_MAPPER
+    return pd.DataFrame({
+        mapper.ACCOUNT_NAME: [f"Account {i % 50}" for i in range(rows)],
+        mapper.ORDER_ID: [f"SO{i // reports_per_order:07d}" for i in range(rows)],
+        mapper.REPORT_TYPE: ["PDF"] * rows,
+        mapper.REPORT_NAME: [f"Report {i % reports_per_order}" for i in range(rows)],
+        mapper.PRIORITY: [i % 3 for i in range(rows)],
+        mapper.PAGE: ["INVOICE"] * rows,
+    })
+
+
+def scan(df, order_id):
+    """The lookup get_order_data_from_excel used before the index existed."""
+    return df[df[ExcelReader.COLUMNS_MAPPER.ORDER_ID] == order_id].to_dict(orient="records")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--reports-per-order", type=int, default=5)
+    parser.add_argument("--sample", type=int, default=500)
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+
+    df = make_sheet(args.rows, args.reports_per_order)
+    ExcelReader.EXCEL_FILE_DATA = df
+
+    started_at = time.perf_counter()
+    ExcelReader.ORDER_INDEX = ExcelReader.build_order_index(df)
+    build_seconds = time.perf_counter() - started_at
+
+    orders = ExcelReader.get_orders_from_excel()
+
+    started_at = time.perf_counter()
+    for order_id in orders:
+        ExcelReader.get_order_data_from_excel(order_id=order_id)
+    index_seconds = time.perf_counter() - started_at
+
+    sample = orders[:: max(1, len(orders) // args.sample)][: args.sample]
+    started_at = time.perf_counter()
+    for order_id in sample:
+        scan(df, order_id)
+    scan_seconds = (time.perf_counter() - started_at) / len(sample) * len(orders)
+
+    print(f"{args.rows} rows, {len(orders)} orders")
+    print(f"index:  built in {build_seconds:.2f}s, all lookups in {index_seconds:.3f}s "
+          f"(total {build_seconds + index_seconds:.2f}s)")
+    print(f"scan:   projected {scan_seconds:.1f}s for all lookups (timed on {len(sample)} orders)")
+    print(f"speedup: {scan_seconds / (build_seconds + index_seconds):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,564 @@
+"""
+A local stand-in for the RazorERP pages the download workflow drives.
+
+Usage:
+    python benchmarks/mock_erp.py [--port 8765] [--orders 50] [--latency 100]
+
+Serves the login form, the inbound orders page (RecyclingOrders.aspx with the
+g_RecyclingOrderList grid and the Settlements tab), SettlementList.aspx with the order
+and sales order pages behind it, the AuditOrders.aspx grid and the dlgPrint_* modal,
+which downloads a PDF (or a zip when several orders are selected). Grids are loaded over
+AJAX with --latency milliseconds of server delay, so the workflow's settle waits see the
+same jQuery / loading-indicator signals as on the real site. A tiny jQuery stand-in
+implements the few jQuery and jqGrid calls the workflow scripts make.
+
+Log in with any e-mail and the password given by --password (default "benchmark").
+"""
+import argparse
+import html
+import io
+import json
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+SESSION_COOKIE = "mock_session"
+
+# Report names offered by the inbound and settlement print dialogs
+REPORT_NAMES = ["Certificate Of Recycling", "Settlement Summary", "Asset Report"]
+
+# Just enough of jQuery and jqGrid for the workflow scripts: $(selector|element),
+# find/each/map/get/attr/length, jqGrid resetSelection/setSelection/getGridParam('selarrrow')
+# and jQuery.active, which the settle probe reads.
+MINI_JQUERY = """
+(function () {
+    function Q(items) { this.items = items; this.length = items.length; }
+    Q.prototype.find = function (selector) {
+        const found = [];
+        this.items.forEach(el => found.push(...el.querySelectorAll(selector)));
+        return new Q(found);
+    };
+    Q.prototype.each = function (fn) { this.items.forEach((el, i) => fn.call(el, i, el)); return this; };
+    Q.prototype.map = function (fn) {
+        return new Q(this.items.map((el, i) => fn.call(el, i, el)).filter(v => v !== null && v !== undefined));
+    };
+    Q.prototype.get = function () { return this.items.slice(); };
+    Q.prototype.attr = function (name) { return this.items[0] ? this.items[0].getAttribute(name) : undefined; };
+    Q.prototype.jqGrid = function (method, arg) {
+        const grid = this.items[0];
+        if (!grid) return undefined;
+        const box = (row) => row && row.querySelector('td input[type=checkbox]');
+        if (method === 'resetSelection') {
+            grid.querySelectorAll('tr.jqgrow td input[type=checkbox]').forEach(cb => { cb.checked = false; });
+        } else if (method === 'setSelection') {
+            const cb = box(document.getElementById(arg));
+            if (cb) cb.checked = true;
+        } else if (method === 'getGridParam' && arg === 'selarrrow') {
+            return Array.from(grid.querySelectorAll('tr.jqgrow'))
+                .filter(row => box(row) && box(row).checked).map(row => row.id);
+        }
+        return this;
+    };
+    const $ = function (selector) {
+        if (typeof selector === 'string') return new Q(Array.from(document.querySelectorAll(selector)));
+        return new Q(selector ? [selector] : []);
+    };
+    $.active = 0;
+    window.jQuery = window.$ = $;
+})();
+"""
+
+COMMON_SCRIPT = """
+function ajax(url, loading, render) {
+    jQuery.active++;
+    if (loading) loading.style.display = 'block';
+    return fetch(url, {credentials: 'same-origin'})
+        .then(response => response.json())
+        .then(render)
+        .finally(() => { jQuery.active--; if (loading) loading.style.display = 'none'; });
+}
+function loadJqGrid(gridId, params) {
+    const grid = document.getElementById(gridId);
+    return ajax('/api/orders?' + new URLSearchParams(params), grid.parentElement.querySelector('.loading'), rows => {
+        grid.querySelectorAll('tr.jqgrow').forEach(row => row.remove());
+        rows.forEach((order, i) => {
+            const row = document.createElement('tr');
+            row.className = 'jqgrow';
+            row.id = gridId + '_' + i;
+            row.innerHTML = '<td><input type="checkbox"></td><td></td><td></td>';
+            row.cells[1].title = row.cells[1].textContent = order.id;
+            row.cells[2].title = row.cells[2].textContent = order.account;
+            grid.querySelector('tbody').appendChild(row);
+        });
+    });
+}
+function onEnter(input, fn) {
+    input.addEventListener('keydown', event => { if (event.key === 'Enter') fn(input.value.trim()); });
+}
+function openPrint() {
+    jQuery.active++;
+    setTimeout(() => {
+        document.getElementById('div_PrintDialog').style.display = 'block';
+        jQuery.active--;
+    }, LATENCY_MS);
+}
+function closePrint() {
+    document.getElementById('div_PrintDialog').style.display = 'none';
+}
+function downloadSelected() {
+    const docs = Array.from(document.querySelectorAll('#div_PrintDialog input[data-doc]'))
+        .filter(cb => cb.checked).map(cb => cb.dataset.doc);
+    const orders = selectedOrders();
+    if (!docs.length || !orders.length) return;
+    let frame = document.getElementById('download_frame');
+    if (!frame) {
+        frame = document.createElement('iframe');
+        frame.id = 'download_frame';
+        frame.style.display = 'none';
+        document.body.appendChild(frame);
+    }
+    frame.src = '/Admin/Print/Download?' + new URLSearchParams({orders: orders.join(','), docs: docs.join(',')});
+}
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+  body {{ font-family: sans-serif; }}
+  .tabs li {{ display: inline-block; padding: 4px 8px; cursor: pointer; border: 1px solid #ccc; }}
+  .loading, .ag-overlay-loading-wrapper {{ display: none; }}
+  .ui-dialog {{ position: absolute; top: 60px; left: 200px; background: #fff; border: 1px solid #888; padding: 8px; }}
+  td, .ag-cell {{ padding: 2px 6px; }}
+</style>
+<script>const LATENCY_MS = {latency_ms};</script>
+<script>{mini_jquery}</script>
+<script>{common_script}</script>
+</head>
+<body>
+<div id="gritter-notice-wrapper">Welcome back.</div>
+{body}
+</body>
+</html>
+"""
+
+LOGIN_BODY = """
+<form method="post" action="/Account/Login">
+  <input name="email" type="text" placeholder="E-mail">
+  <input name="password" type="password" placeholder="Password">
+  <button type="submit">Log in</button>
+</form>
+{error}
+"""
+
+DASHBOARD_BODY = """
+<h1>Dashboard</h1>
+<a href="/Admin/RecyclingOrders.aspx">Inbound</a>
+<a href="/Admin/SettlementList.aspx">Settlements</a>
+<a href="/Admin/Recycling/AuditOrders.aspx">Audit</a>
+"""
+
+PRINT_DIALOG = """
+<div id="div_PrintDialog" class="ui-dialog" style="display:none">
+  <div class="ui-dialog-titlebar">Reporting Station
+    <button type="button" class="ui-dialog-titlebar-close" onclick="closePrint()">x</button>
+  </div>
+  {doctypes}
+  <div class="ui-dialog-buttonset">
+    <button type="button" id="dlgPrint_ButtonDownload" onclick="downloadSelected()">Download</button>
+    <button type="button" id="dlgPrint_ButtonPreview">Preview</button>
+    <button type="button" id="dlgPrint_ButtonClose" onclick="closePrint()">Close</button>
+  </div>
+</div>
+"""
+
+DOCTYPE = """
+  <div class="print-dialog-doctype">
+    <input type="checkbox" id="{checkbox_id}" data-doc="{doc}"><label for="{checkbox_id}">{label}</label>
+    {extra}
+  </div>
+"""
+
+JQGRID = """
+<div class="ui-jqgrid">
+  <div class="loading">Loading...</div>
+  <table id="{grid_id}"><tbody><tr class="jqgfirstrow"><th></th><th>Order</th><th>Account</th></tr></tbody></table>
+</div>
+"""
+
+INBOUND_BODY = """
+<ul class="tabs">
+  <li id="tab_Open">Open</li>
+  <li id="tab_SettlementComplete">Settlements</li>
+</ul>
+<input id="tb_RecyclingOrderListSearch" placeholder="Search">
+{grid}
+<button type="button" onclick="openPrint()">Print/Download</button>
+<button type="button" onclick="openPrint()">Print/Download New</button>
+<div id="div_ReportsContainer" style="display:none"></div>
+{dialog}
+<script>
+  let tab = 'open';
+  const search = document.getElementById('tb_RecyclingOrderListSearch');
+  const reload = () => loadJqGrid('g_RecyclingOrderList', {{tab: tab, search: search.value.trim()}});
+  document.getElementById('tab_Open').onclick = () => {{ tab = 'open'; reload(); }};
+  document.getElementById('tab_SettlementComplete').onclick = () => {{ tab = 'settlements'; reload(); }};
+  onEnter(search, reload);
+  function selectedOrders() {{
+    return $('#g_RecyclingOrderList').jqGrid('getGridParam', 'selarrrow')
+        .map(rowId => document.getElementById(rowId).cells[1].title);
+  }}
+  reload();
+</script>
+"""
+
+SETTLEMENT_LIST_BODY = """
+<input id="tb_Search_All" placeholder="Search">
+{grid}
+<button type="button" onclick="openPrint()">Print/Download</button>
+<button type="button" onclick="openPrint()">Print/Download New</button>
+<div id="div_ReportsContainer" style="display:none"></div>
+{dialog}
+<script>
+  const search = document.getElementById('tb_Search_All');
+  onEnter(search, value => loadJqGrid('g_SettlementList', {{search: value}}));
+  document.getElementById('g_SettlementList').addEventListener('dblclick', event => {{
+    const row = event.target.closest('tr.jqgrow');
+    if (row) window.open('/Admin/RecyclingOrder.aspx?id=' + encodeURIComponent(row.cells[1].title));
+  }});
+  function selectedOrders() {{
+    return Array.from(document.querySelectorAll('#g_SettlementList tr.jqgrow'))
+        .filter(row => row.cells[0].querySelector('input').checked).map(row => row.cells[1].title);
+  }}
+  loadJqGrid('g_SettlementList', {{}});
+</script>
+"""
+
+RECYCLING_ORDER_BODY = """
+<h1>Recycling Order {order}</h1>
+<a id="a_RecyclingOrder_LinkedSalesOrder" href="/Admin/SalesOrder.aspx?id={order_url}">Linked sales order</a>
+"""
+
+SALES_ORDER_BODY = """
+<h1>Sales Order for {order}</h1>
+<ul class="tabs"><li id="tab_Details">Details</li><li id="tab_Invoice">Invoices</li></ul>
+<div class="ui-jqgrid">
+  <div class="loading">Loading...</div>
+  <table id="jqg_SalesOrderReceive_Invoices"><tbody><tr class="jqgfirstrow"><th></th><th>Invoice</th></tr></tbody></table>
+</div>
+<button type="button" id="bt_PrintDownloadInvoicePdf" onclick="openPrint()">Print/Download</button>
+<button type="button" id="bt_OpenReportPrintDialog" onclick="openPrint()">Print/Download New</button>
+{dialog}
+<script>
+  const ORDER = {order_json};
+  document.getElementById('tab_Invoice').onclick = () => {{
+    const table = document.getElementById('jqg_SalesOrderReceive_Invoices');
+    ajax('/api/orders?search=' + encodeURIComponent(ORDER), table.parentElement.querySelector('.loading'), rows => {{
+      table.querySelectorAll('tr.jqgrow').forEach(row => row.remove());
+      rows.forEach(order => {{
+        const row = document.createElement('tr');
+        row.className = 'jqgrow';
+        row.innerHTML = '<td><input type="checkbox"></td><td></td>';
+        row.cells[1].textContent = 'INV-' + order.id;
+        table.querySelector('tbody').appendChild(row);
+      }});
+    }});
+  }};
+  function selectedOrders() {{ return [ORDER]; }}
+</script>
+"""
+
+AUDIT_BODY = """
+<div class="ag-root">
+  <div class="ag-header">
+    <div class="ag-header-cell" col-id="RecyclingOrderAutoName">Order #
+      <input aria-label="Order # Filter Input" placeholder="Filter">
+    </div>
+  </div>
+  <div class="ag-overlay-loading-wrapper">Loading...</div>
+  <div class="ag-body"></div>
+</div>
+<button type="button" id="bt_PrintDownload" onclick="openPrint()">Print/Download</button>
+{dialog}
+<script>
+  let selected = null;
+  const body = document.querySelector('.ag-body');
+  const reload = value => ajax('/api/orders?' + new URLSearchParams({{search: value}}),
+      document.querySelector('.ag-overlay-loading-wrapper'), rows => {{
+    body.innerHTML = '';
+    rows.forEach(order => {{
+      const row = document.createElement('div');
+      row.className = 'ag-row';
+      const cell = document.createElement('div');
+      cell.className = 'ag-cell';
+      cell.setAttribute('col-id', 'RecyclingOrderAutoName');
+      cell.textContent = order.id;
+      cell.onclick = () => {{ selected = order.id; }};
+      row.appendChild(cell);
+      body.appendChild(row);
+    }});
+  }});
+  onEnter(document.querySelector("[aria-label='Order # Filter Input']"), reload);
+  function selectedOrders() {{ return selected ? [selected] : []; }}
+  reload('');
+</script>
+"""
+
+
+def doc_key(report_name):
+    """The checkbox suffix the workflow derives from a report name ("Asset Report" -> "Asset_Report")."""
+    return "_".join(word.capitalize() for word in report_name.split())
+
+
+def print_dialog(doctypes):
+    """
+    Renders the dlgPrint_* modal.
+
+    Args:
+        doctypes (list): (checkbox id, document key, label, extra html) tuples.
+    """
+    return PRINT_DIALOG.format(doctypes="".join(
+        DOCTYPE.format(checkbox_id=checkbox_id, doc=doc, label=html.escape(label), extra=extra)
+        for checkbox_id, doc, label, extra in doctypes
+    ))
+
+
+REPORT_DOCTYPES = [
+    (f"cb_Doc_{doc_key(name)}", doc_key(name), name, f'<input type="checkbox" id="cb_Doc_{doc_key(name)}_Copies">')
+    for name in REPORT_NAMES
+]
+INVOICE_DOCTYPES = [("cb_Doc_AR_Invoice", "AR_Invoice", "AR Invoice", "")]
+AUDIT_DOCTYPES = [
+    ("cb_Doc_Audit_Report_Excel", "Audit_Report", "Audit Report (Excel)",
+     '<input type="checkbox" id="includeHardDrives"><label for="includeHardDrives">Include drives</label>'),
+]
+
+
+class MockErpServer:
+    """
+    Runs the mock site on a background thread.
+
+    Args:
+        orders (list): The order IDs shown in the grids.
+        port (int): Port to listen on; 0 picks a free one.
+        latency (float): Server delay, in seconds, for pages, grid loads and downloads.
+        password (str): The password the login form accepts.
+    """
+
+    def __init__(self, orders, port=0, latency=0.1, password="benchmark"):
+        self.orders = [str(order_id) for order_id in orders]
+        self.latency = latency
+        self.password = password
+        self.requests = {}
+        self.downloads = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-erp", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def count(self, path):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def count_download(self):
+        with self._lock:
+            self.downloads += 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(MockErpHandler):
+            mock = server
+
+        return Handler
+
+
+class MockErpHandler(BaseHTTPRequestHandler):
+    """Request handler; `mock` is the MockErpServer it serves."""
+
+    mock = None
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- Routing ---
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.mock.count(url.path)
+
+        if url.path == "/Account/Login":
+            return self._page("Log in", LOGIN_BODY.format(error=""))
+        if not self._authenticated():
+            return self._redirect("/Account/Login")
+
+        routes = {
+            "/": lambda: self._redirect("/Admin/Dashboard.aspx"),
+            "/Admin/Dashboard.aspx": lambda: self._page("Qualify | Dashboard", DASHBOARD_BODY),
+            "/Admin/RecyclingOrders.aspx": self._inbound,
+            "/Admin/SettlementList.aspx": self._settlement_list,
+            "/Admin/RecyclingOrder.aspx": lambda: self._recycling_order(query.get("id", "")),
+            "/Admin/SalesOrder.aspx": lambda: self._sales_order(query.get("id", "")),
+            "/Admin/Recycling/AuditOrders.aspx": self._audit,
+            "/api/orders": lambda: self._orders(query.get("search", "")),
+            "/Admin/Print/Download": lambda: self._download(query.get("orders", ""), query.get("docs", "")),
+        }
+        handler = routes.get(url.path)
+        if handler is None:
+            return self._send(404, "text/plain", b"Not found")
+        return handler()
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        self.mock.count(url.path)
+        if url.path != "/Account/Login":
+            return self._send(404, "text/plain", b"Not found")
+
+        length = int(self.headers.get("Content-Length") or 0)
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        if form.get("email") and form.get("password") == self.mock.password:
+            return self._redirect("/Admin/Dashboard.aspx", cookie=f"{SESSION_COOKIE}=ok; Path=/; HttpOnly")
+        return self._page("Log in", LOGIN_BODY.format(error="<p class='error'>Invalid credentials.</p>"))
+
+    # --- Pages ---
+
+    def _inbound(self):
+        self._page("Qualify | Inbound", INBOUND_BODY.format(
+            grid=JQGRID.format(grid_id="g_RecyclingOrderList"), dialog=print_dialog(REPORT_DOCTYPES),
+        ))
+
+    def _settlement_list(self):
+        self._page("Qualify | Settlements", SETTLEMENT_LIST_BODY.format(
+            grid=JQGRID.format(grid_id="g_SettlementList"), dialog=print_dialog(REPORT_DOCTYPES),
+        ))
+
+    def _recycling_order(self, order_id):
+        self._page("Qualify | Recycling Order", RECYCLING_ORDER_BODY.format(
+            order=html.escape(order_id), order_url=quote(order_id),
+        ))
+
+    def _sales_order(self, order_id):
+        self._page("Qualify | Sales Order", SALES_ORDER_BODY.format(
+            order=html.escape(order_id), order_json=json.dumps(order_id), dialog=print_dialog(INVOICE_DOCTYPES),
+        ))
+
+    def _audit(self):
+        self._page("Qualify | Audit Orders", AUDIT_BODY.format(dialog=print_dialog(AUDIT_DOCTYPES)))
+
+    # --- Data and downloads ---
+
+    def _orders(self, search):
+        time.sleep(self.mock.latency)
+        search = search.strip()
+        orders = [order_id for order_id in self.mock.orders if not search or search in order_id]
+        rows = [{"id": order_id, "account": f"Account {i % 7}"} for i, order_id in enumerate(orders[:200])]
+        self._send(200, "application/json", json.dumps(rows).encode("utf-8"))
+
+    def _download(self, orders, docs):
+        time.sleep(self.mock.latency)
+        orders = [order_id for order_id in orders.split(",") if order_id]
+        docs = [doc for doc in docs.split(",") if doc]
+        files = [(self._file_name(doc, order_id), self._file_body(doc, order_id)) for order_id in orders for doc in docs]
+        if not files:
+            return self._send(400, "text/plain", b"Nothing selected")
+
+        self.mock.count_download()
+        if len(files) == 1:
+            name, body = files[0]
+        else:
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w") as archive:
+                for file_name, file_body in files:
+                    archive.writestr(file_name, file_body)
+            name, body = f"Reports_{int(time.time() * 1000)}.zip", buffer.getvalue()
+        self._send(200, "application/octet-stream", body, headers={
+            "Content-Disposition": f'attachment; filename="{name}"',
+        })
+
+    @staticmethod
+    def _file_name(doc, order_id):
+        extension = "xlsx" if doc == "Audit_Report" else "pdf"
+        return f"{doc}_{order_id}.{extension}"
+
+    @staticmethod
+    def _file_body(doc, order_id):
+        # A minimal, valid one-page PDF; the audit "spreadsheet" is only a placeholder
+        text = f"{doc} {order_id}"
+        return (
+            "%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+            "2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+            "3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 200 100]>>endobj\n"
+            f"% {text}\ntrailer<</Root 1 0 R>>\n%%EOF\n"
+        ).encode("utf-8")
+
+    # --- Helpers ---
+
+    def _authenticated(self):
+        return f"{SESSION_COOKIE}=ok" in (self.headers.get("Cookie") or "")
+
+    def _page(self, title, body):
+        time.sleep(self.mock.latency)
+        page = PAGE_TEMPLATE.format(
+            title=html.escape(title), latency_ms=int(self.mock.latency * 1000),
+            mini_jquery=MINI_JQUERY, common_script=COMMON_SCRIPT, body=body,
+        )
+        self._send(200, "text/html; charset=utf-8", page.encode("utf-8"))
+
+    def _redirect(self, location, cookie=None):
+        headers = {"Location": location}
+        if cookie:
+            headers["Set-Cookie"] = cookie
+        self._send(303, "text/plain", b"", headers=headers)
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=100, help="Server delay in milliseconds.")
+    parser.add_argument("--password", default="benchmark")
+    args = parser.parse_args()
+
+    server = MockErpServer(
+        [f"SO{i:07d}" for i in range(1, args.orders + 1)],
+        port=args.port, latency=args.latency / 1000, password=args.password,
+    )
+    print(f"Mock ERP serving {args.orders} orders at {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
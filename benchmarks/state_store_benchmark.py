@@ -0,0 +1,70 @@
+"""
+Compares the CSV and SQLite download state backends.
+
+Usage:
+    python benchmarks/state_store_benchmark.py [--rows 100000] [--csv-rows 2000]
+
+The CSV backend rewrites the whole file on every add(), so it is measured on fewer rows
+(--csv-rows) and its per-row cost is extrapolated to --rows.
+"""
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from automation.utilities.logger import logger
+from automation.utilities.save_download_state import CsvStateBackend, SqliteStateBackend, export_csv
+
+
+def run(backend, rows):
+    """Writes `rows` rows (download then upload update) and looks up to 1000 orders up once."""
+    started_at = time.perf_counter()
+    for i in range(rows):
+        backend.add(f"SO{i:07d}", "Invoice", downloaded=True)
+    for i in range(rows):
+        backend.mark_uploaded(f"SO{i:07d}", "Invoice")
+    backend.flush()
+    write_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    lookups = min(rows, 1000)
+    for i in range(0, rows, max(1, rows // lookups)):
+        backend.exists(f"SO{i:07d}", "Invoice")
+    lookup_seconds = (time.perf_counter() - started_at) / lookups
+    return write_seconds, lookup_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--csv-rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        sqlite_backend = SqliteStateBackend(tmp / "downloads.db")
+        sqlite_write, sqlite_lookup = run(sqlite_backend, args.rows)
+
+        started_at = time.perf_counter()
+        export_csv(sqlite_backend, tmp / "export.csv")
+        export_seconds = time.perf_counter() - started_at
+        sqlite_backend.close()
+
+        csv_rows = min(args.csv_rows, args.rows)
+        csv_write, csv_lookup = run(CsvStateBackend(tmp / "downloads.csv"), csv_rows)
+        # add() and mark_uploaded() are O(n) per call, so n rows cost O(n^2); scale quadratically
+        csv_projected = csv_write * (args.rows / csv_rows) ** 2
+
+    print(f"sqlite: {args.rows} rows written and marked uploaded in {sqlite_write:.2f}s ({args.rows / sqlite_write:,.0f} rows/s), "
+          f"lookup {sqlite_lookup * 1e6:.0f}us, csv export {export_seconds:.2f}s")
+    print(f"csv:    {csv_rows} rows written and marked uploaded in {csv_write:.2f}s ({csv_rows / csv_write:,.0f} rows/s), "
+          f"lookup {csv_lookup * 1e3:.1f}ms at {csv_rows} rows")
+    print(f"csv:    projected {csv_projected:,.0f}s for {args.rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Measures download throughput of the workflow against the local mock ERP.
+
+Usage:
+    python benchmarks/throughput_benchmark.py [--orders 20] [--reports 2] [--pages INBOUND,AUDIT]
+        [--latency 100] [--workers 1] [--batch-size 1] [--headed] [--output results.json]
+
+Starts the mock ERP (benchmarks/mock_erp.py) on a free port, writes a workbook with
+--reports reports for each of --orders orders, and runs automation.main under headless
+Chrome with tracing on and every path pointed at a temporary directory. Prints orders/min,
+p50/p95 report latency and WebDriver command counts; --output also writes them as JSON so
+runs can be compared for regressions.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from mock_erp import MockErpServer, REPORT_NAMES
+
+# Report rows generated per page; INVOICE downloads the AR invoice of the sales order
+PAGE_REPORTS = {
+    "INBOUND": REPORT_NAMES,
+    "SETTLEMENT": REPORT_NAMES,
+    "INVOICE": ["AR Invoice"],
+    "AUDIT": ["Audit Report"],
+}
+
+PASSWORD = "benchmark"
+
+
+def write_workbook(path, orders, reports, pages):
+    """Writes the Excel sheet the workflow plans from."""
+    rows = []
+    for index, order_id in enumerate(orders):
+        for report in range(reports):
+            page = pages[(index + report) % len(pages)]
+            names = PAGE_REPORTS[page]
+            rows.append({
+                "ACCOUNT NAME": f"Account {index % 7}",
+                "AUTO NAME": order_id,
+                "REPORT TYPE": "standard",
+                "REPORT NAME": names[report % len(names)],
+                "PRIORITY": 1 + index % 3,
+                "PAGE": page,
+            })
+    pd.DataFrame(rows).to_excel(path, sheet_name="Sheet1", index=False)
+    return len(rows)
+
+
+def configure(tmp, base_url, workbook, args):
+    """Points the settings at the mock server and the temporary directory."""
+    os.environ.update({
+        "BASE_URL": base_url,
+        "USER_EMAIL": "benchmark@example.com",
+        "USER_PASSWORD": PASSWORD,
+        "HEADLESS": "false" if args.headed else "true",
+        "FRESH_SESSION": "true",
+        "EXCEL_FILE_PATH": str(workbook),
+        "EXCEL_CACHE": "false",
+        "DOWNLOAD_PATH": str(tmp / "downloads"),
+        "STATE_DB_PATH": str(tmp / "downloads.db"),
+        "RESUME_POLICY": "force",  # Every run downloads everything, whatever state was imported
+        "SESSION_STORAGE_PATH": str(tmp / "state.json"),
+        "LOG_FILE_PATH": str(tmp / "run.log"),
+        "TRACE_ENABLED": "true",
+        "TRACE_PATH": str(tmp / "trace.json"),
+        "INVOICE_CACHE_PATH": str(tmp / "sales_orders.json"),
+        "ORDER_DETAIL_URL_TEMPLATE": "/Admin/RecyclingOrder.aspx?id={order_id}",
+        "WORKERS": str(args.workers),
+        "INBOUND_BATCH_SIZE": str(args.batch_size),
+    })
+
+
+def count_files(download_path):
+    """Counts downloaded report files, leaving out the batch staging folder."""
+    files = 0
+    for root, dirs, names in os.walk(download_path):
+        dirs[:] = [name for name in dirs if name != "_batch"]
+        files += sum(1 for name in names if not name.endswith((".crdownload", ".tmp")))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=20)
+    parser.add_argument("--reports", type=int, default=2, help="Reports per order.")
+    parser.add_argument("--pages", default="INBOUND,AUDIT", help=f"Comma-separated, from {', '.join(PAGE_REPORTS)}.")
+    parser.add_argument("--latency", type=float, default=100, help="Mock server delay in milliseconds.")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--headed", action="store_true", help="Show the browser.")
+    parser.add_argument("--trace", help="Also copy the Chrome trace to this path.")
+    parser.add_argument("--output", help="Write the results as JSON to this path.")
+    args = parser.parse_args()
+
+    pages = [page.strip().upper() for page in args.pages.split(",") if page.strip()]
+    unknown = [page for page in pages if page not in PAGE_REPORTS]
+    if unknown:
+        parser.error(f"Unknown pages: {unknown}")
+
+    orders = [f"SO{i:07d}" for i in range(1, args.orders + 1)]
+    server = MockErpServer(orders, latency=args.latency / 1000, password=PASSWORD).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        workbook = tmp / "navigation.xlsx"
+        reports = write_workbook(workbook, orders, args.reports, pages)
+        configure(tmp, server.url, workbook, args)
+
+        # Settings are read when automation is first imported, so it is imported after configure()
+        from automation.main import main as run_automation
+        from automation.utilities.tracer import tracer
+
+        started_at = time.perf_counter()
+        try:
+            run_automation()
+        finally:
+            elapsed = time.perf_counter() - started_at
+            server.stop()
+
+        summary = tracer.summary(cats=None)
+        if ("report", "download_report") not in summary:
+            log_tail = (tmp / "run.log").read_text().splitlines()[-20:] if (tmp / "run.log").exists() else []
+            raise SystemExit("No report was processed; the run log ended with:\n" + "\n".join(log_tail))
+        if args.trace:
+            tracer.export(args.trace)
+        files = count_files(tmp / "downloads")
+
+    report_spans = summary[("report", "download_report")]
+    commands = {name: entry["count"] for (cat, name), entry in summary.items() if cat == "webdriver"}
+    total_commands = sum(commands.values())
+    results = {
+        "orders": args.orders,
+        "reports": reports,
+        "pages": pages,
+        "workers": args.workers,
+        "batch_size": args.batch_size,
+        "latency_ms": args.latency,
+        "seconds": round(elapsed, 2),
+        "orders_per_minute": round(args.orders / (elapsed / 60), 2) if elapsed else 0.0,
+        "files_downloaded": files,
+        "downloads_served": server.downloads,
+        "report_p50": round(report_spans["p50"], 3),
+        "report_p95": round(report_spans["p95"], 3),
+        "webdriver_commands": total_commands,
+        "webdriver_commands_per_report": round(total_commands / reports, 1) if reports else 0.0,
+        "webdriver_command_counts": dict(sorted(commands.items(), key=lambda item: -item[1])),
+    }
+
+    print(f"{args.orders} orders / {reports} reports in {elapsed:.1f}s: {results['orders_per_minute']:.1f} orders/min, "
+          f"{files} files downloaded ({server.downloads} downloads served)")
+    print(f"report latency: p50 {results['report_p50']:.2f}s, p95 {results['report_p95']:.2f}s")
+    print(f"webdriver: {total_commands} commands ({results['webdriver_commands_per_report']} per report); top: "
+          + ", ".join(f"{name}={count}" for name, count in list(results["webdriver_command_counts"].items())[:5]))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,100 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import openpyxl
 import pandas as pd
 
+
+class PeekCancelled(Exception):
+    """Raised inside a header peek that was cancelled while it was running."""
+
+
+class PeekRequest:
+    """A header peek running off the UI thread; cancel() stops it even after it started."""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.future = Future()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        return self.future.result(timeout=0)
+
+
 class ExcelHandler:
+    SAMPLE_ROWS = 5
+
+    _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="excel-peek")
+
     @staticmethod
     def read_headers(filepath: str):
-        df = pd.read_excel(filepath, nrows=1)
-        return list(df.columns)
+        return ExcelHandler.peek(filepath)[0]
+
+    @staticmethod
+    def peek(filepath: str, sample_rows: int = SAMPLE_ROWS, cancel_event=None):
+        """
+        Returns (headers, sample) where sample is a list of up to sample_rows row dicts.
+
+        .xlsx files are streamed in read-only mode and only the first rows are touched,
+        so the cost does not grow with the file. Peeks skip the workbook cache, whose
+        key hashes the whole file.
+        """
+        if filepath.lower().endswith(".xls"):
+            df = pd.read_excel(filepath, nrows=sample_rows)
+        else:
+            df = ExcelHandler._peek_xlsx(filepath, sample_rows, cancel_event)
+
+        headers = [str(column) for column in df.columns]
+        sample = [
+            {header: ("" if pd.isna(value) else value) for header, value in zip(headers, row)}
+            for row in df.head(sample_rows).itertuples(index=False, name=None)
+        ]
+        return headers, sample
+
+    @staticmethod
+    def _peek_xlsx(filepath: str, sample_rows: int, cancel_event=None):
+        workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            if cancel_event is not None and cancel_event.is_set():
+                raise PeekCancelled(filepath)
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = list(next(rows, ()))
+            # Formatted but empty cells at the end of the row are not columns
+            while header and header[-1] is None:
+                header.pop()
+            # Same names pandas gives to blank header cells
+            headers = [str(value) if value is not None else f"Unnamed: {i}" for i, value in enumerate(header)]
+
+            sample = []
+            for values in rows:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise PeekCancelled(filepath)
+                if len(sample) >= sample_rows:
+                    break
+                sample.append((list(values) + [None] * len(headers))[:len(headers)])
+            return pd.DataFrame(sample, columns=headers)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def peek_async(filepath: str, sample_rows: int = SAMPLE_ROWS) -> PeekRequest:
+        """Runs peek() on a background thread; poll the returned request from the UI thread."""
+        request = PeekRequest(filepath)
+
+        def run():
+            if not request.future.set_running_or_notify_cancel():
+                return
+            try:
+                request.future.set_result(ExcelHandler.peek(filepath, sample_rows, request.cancel_event))
+            except Exception as e:
+                request.future.set_exception(e)
+
+        ExcelHandler._executor.submit(run)
+        return request
@@ -23,6 +23,7 @@ class MainFrame(ctk.CTkFrame):
         self.status_text = ctk.StringVar(value="🟡 Waiting for input...")
         self.excel_file = None
         self.mapped_headers = {}
+        self.peek_request = None
         self.create_widgets()
 
     def create_widgets(self):
@@ -114,11 +115,33 @@ class MainFrame(ctk.CTkFrame):
         if not file:
             return
         self.excel_file = file
+        self.open_mapping(file, "Could not read Excel file")
+
+    def open_mapping(self, filepath, error_message):
+        """Reads the headers off the UI thread and opens the mapping popup once they are in."""
+        if self.peek_request:
+            # A newer file replaces the one still being read
+            self.peek_request.cancel()
+        self.peek_request = ExcelHandler.peek_async(filepath)
+        self.update_status(f"🟡 Reading headers: {os.path.basename(filepath)}")
+        self.after(20, self.poll_peek, self.peek_request, error_message)
+
+    def poll_peek(self, request, error_message):
+        if request is not self.peek_request:
+            return
+        if not request.done():
+            self.after(20, self.poll_peek, request, error_message)
+            return
+
+        self.peek_request = None
         try:
-            headers = ExcelHandler.read_headers(file)
-            MappingPopup(self, headers, self.mapping_done)
+            headers, sample = request.result()
         except Exception as e:
-            messagebox.showerror("Error", f"Could not read Excel file:\n{e}")
+            self.update_status("🟡 Waiting for input...")
+            messagebox.showerror("Error", f"{error_message}:\n{e}")
+            return
+        self.update_status(f"🟡 Map headers: {os.path.basename(request.filepath)}")
+        MappingPopup(self, headers, self.mapping_done, sample=sample)
 
     def on_drop(self, event):
         """Handle files dropped onto the UI (expects DND_FILES format)."""
@@ -155,11 +178,7 @@ class MainFrame(ctk.CTkFrame):
 
         # Set and process the file (same flow as browse)
         self.excel_file = excel_path
-        try:
-            headers = ExcelHandler.read_headers(excel_path)
-            MappingPopup(self, headers, self.mapping_done)
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not read dropped Excel file:\n{e}")
+        self.open_mapping(excel_path, "Could not read dropped Excel file")
 
     def mapping_done(self, mapping):
         self.mapped_headers = mapping
@@ -2,12 +2,16 @@ import customtkinter as ctk
 from tkinter import messagebox
 
 class MappingPopup(ctk.CTkToplevel):
-    def __init__(self, master, headers, on_confirm):
+    PREVIEW_VALUES = 3
+
+    def __init__(self, master, headers, on_confirm, sample=None):
         super().__init__(master)
         self.headers = headers
         self.on_confirm = on_confirm
+        self.sample = sample or []
         self.mapping_vars = {}
         self.option_menus = {}
+        self.preview_labels = {}
         self.selected_headers = set()
 
         self.configure_window()
@@ -68,8 +72,14 @@ class MappingPopup(ctk.CTkToplevel):
             )
             menu.pack(side="right", padx=10)
 
+            # Sample values of the chosen column, so the mapping can be checked at a glance
+            preview = ctk.CTkLabel(self.dropdown_frame, text="", text_color="#A0A0A0",
+                                   font=("Helvetica", 11), anchor="e")
+            preview.pack(fill="x", padx=20)
+
             self.mapping_vars[key] = var
             self.option_menus[key] = menu
+            self.preview_labels[key] = preview
 
         # Confirm button
         ctk.CTkButton(
@@ -89,6 +99,7 @@ class MappingPopup(ctk.CTkToplevel):
         if choice:
             self.selected_headers.add(choice)
         setattr(self, f"_prev_{field}", choice)
+        self.update_preview(field, choice)
 
         # Update dropdowns to remove selected items
         for f, menu in self.option_menus.items():
@@ -96,6 +107,11 @@ class MappingPopup(ctk.CTkToplevel):
             available = [h for h in self.headers if h not in self.selected_headers or h == current_val]
             menu.configure(values=available)
 
+    def update_preview(self, field, header):
+        values = [str(row.get(header, "")) for row in self.sample[:self.PREVIEW_VALUES] if row.get(header, "") != ""]
+        text = f"e.g. {', '.join(values)}" if values else ""
+        self.preview_labels[field].configure(text=text)
+
     def confirm(self):
         mapping = {}
         for field, var in self.mapping_vars.items():
@@ -22,17 +22,28 @@ class LoginPage(PageBase):
         self.RETRIES = 3
         self.ATTEMPT = 0
 
+    def is_logged_in(self):
+        """
+        Cheap validity probe for the current (possibly restored) session.
+
+        Returns:
+            bool: True if the dashboard is loaded, i.e. the session is authenticated.
+        """
+        return "Qualify" in self.get_page_title()
+
     def login(self):
         """Performs the login action by entering credentials and pressing ENTER."""
-        hard_reload(self.driver)
-        time.sleep(2)
         self.ATTEMPT += 1
-        
-        # Check if already logged in by checking page title
-        if "Qualify" in self.get_page_title():
+
+        # Check if already logged in (e.g. a restored session) by checking page title
+        if self.is_logged_in():
             logger.info("Already logged in. Skipping login process.")
             return
 
+        # The session has expired, so start from a clean slate
+        hard_reload(self.driver)
+        time.sleep(2)
+
         logger.info("Attempting to log in.")
         self.send_keys(LoginPageLocators.USERNAME_FIELD, settings.USER_EMAIL)
         
@@ -63,3 +74,27 @@ def hard_reload(driver):
     driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
     driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
     driver.execute_cdp_cmd("Page.reload", {"ignoreCache": True})
+
+def authenticate(session_manager, driver):
+    """
+    Logs in on the given session, restarting the browser whenever the login retries run out.
+
+    Args:
+        session_manager: The SessionManager that owns the driver.
+        driver: The Selenium WebDriver instance to log in with.
+
+    Returns:
+        The logged in WebDriver instance (which may differ from the one passed in
+        if the session had to be restarted), or None if the browser could not be started.
+    """
+    while driver:
+        login_page = LoginPage(driver)
+        login_page.login()
+        if login_page.ATTEMPT < login_page.RETRIES:
+            session_manager.save_session()
+            return driver
+
+        logger.error("Maximum login attempts reached. Restarting session.")
+        driver = session_manager.restart_session()
+
+    return None
@@ -1,10 +1,16 @@
 import json
 import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from webdriver_manager.chrome import ChromeDriverManager
 from automation.config.settings import settings
 from automation.utilities.logger import logger
+from automation.utilities.tracer import tracer
+from automation.utilities.file_manager import create_directory_if_not_exists
 
 class SessionManager:
     """
@@ -12,57 +18,326 @@ class SessionManager:
     and persisting session data.
     """
 
+    # The chromedriver binary is resolved once per process and shared by every session
+    _driver_path = None
+    _driver_path_lock = threading.Lock()
+
+    # Sessions started in parallel share the same session file
+    _session_file_lock = threading.Lock()
+
+    # Fields accepted by the CDP Network.setCookies command
+    COOKIE_PARAM_KEYS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority")
+
+    STORAGE_SNAPSHOT_SCRIPT = """
+        const dump = (storage) => {
+            const items = {};
+            for (let i = 0; i < storage.length; i++) {
+                const key = storage.key(i);
+                items[key] = storage.getItem(key);
+            }
+            return items;
+        };
+        return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+    """
+
+    STORAGE_RESTORE_SCRIPT = """
+        const [local, session] = arguments;
+        Object.entries(local || {}).forEach(([k, v]) => window.localStorage.setItem(k, v));
+        Object.entries(session || {}).forEach(([k, v]) => window.sessionStorage.setItem(k, v));
+    """
+
     def __init__(self):
         """
         Initializes the SessionManager.
         """
         self.driver = None
+        self.startup_timings = {}
+
+    @classmethod
+    def resolve_driver_path(cls):
+        """
+        Resolves the chromedriver binary without touching the network when possible.
+
+        Resolution order:
+        - settings.CHROMEDRIVER_PATH, if configured
+        - the path already resolved by this process
+        - the path cached on disk at settings.DRIVER_CACHE_PATH
+        - ChromeDriverManager().install(), whose result is then cached on disk
+
+        Returns:
+            str | None: The chromedriver path, or None to let Selenium Manager locate it.
+        """
+        with cls._driver_path_lock:
+            if settings.CHROMEDRIVER_PATH:
+                return settings.CHROMEDRIVER_PATH
+
+            if cls._driver_path and os.path.exists(cls._driver_path):
+                return cls._driver_path
+
+            cached_path = cls._read_driver_cache()
+            if cached_path:
+                cls._driver_path = cached_path
+                return cached_path
+
+            try:
+                driver_path = ChromeDriverManager().install()
+            except Exception as e:
+                logger.warning(f"Could not resolve chromedriver through webdriver-manager ({e}); falling back to Selenium Manager.")
+                return None
+
+            cls._driver_path = driver_path
+            cls._write_driver_cache(driver_path)
+            return driver_path
+
+    @classmethod
+    def invalidate_driver_path(cls, driver_path):
+        """
+        Forgets a chromedriver path that failed to launch, in this process and on disk,
+        so the next resolve_driver_path() looks it up again.
+        """
+        with cls._driver_path_lock:
+            if cls._driver_path == driver_path:
+                cls._driver_path = None
+            try:
+                with open(settings.DRIVER_CACHE_PATH, "r", encoding="utf-8") as fh:
+                    cached_path = json.load(fh).get("path")
+            except (FileNotFoundError, ValueError, AttributeError):
+                return
+            if cached_path == driver_path:
+                try:
+                    os.remove(settings.DRIVER_CACHE_PATH)
+                except OSError as e:
+                    logger.warning(f"Could not remove the chromedriver cache: {e}")
+
+    @staticmethod
+    def _read_driver_cache():
+        """Returns the cached chromedriver path if the cache file points at an existing binary."""
+        try:
+            with open(settings.DRIVER_CACHE_PATH, "r", encoding="utf-8") as fh:
+                driver_path = json.load(fh).get("path")
+        except (FileNotFoundError, ValueError, AttributeError):
+            return None
+
+        if driver_path and os.path.exists(driver_path):
+            return driver_path
+
+        logger.info(f"Cached chromedriver path is no longer valid: {driver_path}")
+        return None
+
+    @staticmethod
+    def _write_driver_cache(driver_path):
+        """Persists the resolved chromedriver path so later runs skip the lookup."""
+        try:
+            create_directory_if_not_exists(os.path.dirname(settings.DRIVER_CACHE_PATH))
+            with open(settings.DRIVER_CACHE_PATH, "w", encoding="utf-8") as fh:
+                json.dump({"path": driver_path, "resolved_at": time.time()}, fh)
+        except OSError as e:
+            logger.warning(f"Could not cache chromedriver path: {e}")
+
+    def build_options(self):
+        """
+        Builds the Chrome options used for every session.
+        """
+        chrome_options = webdriver.ChromeOptions()
+        prefs = {
+            # "download.default_directory": settings.DOWNLOAD_PATH,
+            "download.prompt_for_download": False,
+            "download.directory_upgrade": True,
+            "safebrowsing.enabled": True,
+            "profile.default_content_setting_values.automatic_downloads": 1,
+            "plugins.always_open_pdf_externally": True,
+            "profile.default_content_settings.popups": 0,
+        }
+        if settings.HEADLESS:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument(f"--window-size={settings.WINDOW_SIZE}")
+        if settings.DIRECT_DOWNLOAD:
+            # Network events are needed to capture report requests for direct downloads
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        chrome_options.add_experimental_option("prefs", prefs)
+        chrome_options.add_argument("--force-device-scale-factor=0.75")
+        return chrome_options
 
     def start_session(self):
         """
         Starts a new WebDriver session with custom Chrome options.
+
+        The time spent in each startup phase is recorded in self.startup_timings.
         """
         try:
             logger.info("Starting a new WebDriver session.")
-            chrome_options = webdriver.ChromeOptions()
-            prefs = {
-                # "download.default_directory": settings.DOWNLOAD_PATH,
-                "download.prompt_for_download": False,
-                "download.directory_upgrade": True,
-                "safebrowsing.enabled": True,
-                "profile.default_content_setting_values.automatic_downloads": 1,
-                "plugins.always_open_pdf_externally": True,
-                "profile.default_content_settings.popups": 0,
-            }
-            # chrome_options.add_argument("--headless=new")  #only if want to run as headless
-            chrome_options.add_experimental_option("prefs", prefs)
-            chrome_options.add_argument("--force-device-scale-factor=0.75")
-            self.driver = webdriver.Chrome(
-                service=ChromeService(ChromeDriverManager().install()),
-                options=chrome_options
-            )
-            self.driver.maximize_window()
-            self.load_session()
+            self.startup_timings = {}
+
+            with self._timed("resolve_driver"):
+                driver_path = self.resolve_driver_path()
+
+            with self._timed("build_options"):
+                chrome_options = self.build_options()
+                service = ChromeService(driver_path) if driver_path else ChromeService()
+
+            with self._timed("launch_browser"):
+                try:
+                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                except Exception as e:
+                    if not driver_path or settings.CHROMEDRIVER_PATH:
+                        raise
+                    # A resolved driver stops matching the browser after a Chrome upgrade
+                    logger.warning(f"Chromedriver {driver_path} failed to launch ({e}); resolving it again.")
+                    self.invalidate_driver_path(driver_path)
+                    driver_path = self.resolve_driver_path()
+                    service = ChromeService(driver_path) if driver_path else ChromeService()
+                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            tracer.instrument(self.driver)
+
+            if not settings.HEADLESS:
+                with self._timed("configure_window"):
+                    self.driver.maximize_window()
+
+            with self._timed("load_session"):
+                self.load_session()
+
+            logger.info("WebDriver session started (%s).", ", ".join(
+                f"{phase}={seconds:.3f}s" for phase, seconds in self.startup_timings.items()
+            ))
             return self.driver
         except Exception as e:
             logger.error(f"An error occurred while starting the WebDriver session: {e}")
             return None
 
+    @contextmanager
+    def _timed(self, phase):
+        """Records how long a startup phase took in self.startup_timings."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_timings[phase] = time.perf_counter() - started_at
+            tracer.record(phase, "startup", started_at, self.startup_timings[phase])
+
     def load_session(self):
         """
         Loads session data from the JSON file for the current base URL.
+
+        Saved cookies are installed before the first navigation so the very first page
+        load is already authenticated; local and session storage are restored once the
+        application origin is open. Whether the restored session is still valid is
+        decided by LoginPage.is_logged_in, which only falls back to a full login when needed.
+
+        Returns:
+            bool: True if a saved session was restored.
         """
+        state = self._read_session_state()
+
+        cookies = self._restorable_cookies(state.get("cookies", [])) if state else []
+        if cookies:
+            try:
+                self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            except Exception as e:
+                logger.warning(f"Could not restore saved cookies: {e}")
+                cookies = []
+
         self.driver.get(str(settings.BASE_URL))
-        self.driver.refresh()
+
+        local_storage = state.get("local_storage") if state else None
+        session_storage = state.get("session_storage") if state else None
+        if local_storage or session_storage:
+            self.driver.execute_script(self.STORAGE_RESTORE_SCRIPT, local_storage, session_storage)
+            # Reload so the application picks up the restored storage
+            self.driver.refresh()
+
+        restored = bool(cookies or local_storage or session_storage)
+        if restored:
+            logger.info(f"Restored saved session ({len(cookies)} cookies) from: {settings.SESSION_STORAGE_PATH}")
+        return restored
+
+    def save_session(self):
+        """
+        Saves the cookies and local/session storage of the current session to the JSON
+        file, keyed by the base URL.
+
+        Storage is only captured while the browser is on the application origin; otherwise
+        the previously saved storage is kept.
+        """
+        if not self.driver:
+            return
+
+        base_url = str(settings.BASE_URL)
+        try:
+            cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+            entry = {"saved_at": time.time(), "cookies": cookies}
+            if urlparse(self.driver.current_url).netloc == urlparse(base_url).netloc:
+                storage = self.driver.execute_script(self.STORAGE_SNAPSHOT_SCRIPT) or {}
+                entry["local_storage"] = storage.get("local", {})
+                entry["session_storage"] = storage.get("session", {})
+        except Exception as e:
+            logger.warning(f"Could not capture session state: {e}")
+            return
+
+        with self._session_file_lock:
+            data = self._read_session_file()
+            previous = data.get(base_url, {})
+            entry.setdefault("local_storage", previous.get("local_storage", {}))
+            entry.setdefault("session_storage", previous.get("session_storage", {}))
+            data[base_url] = entry
+
+            try:
+                create_directory_if_not_exists(os.path.dirname(settings.SESSION_STORAGE_PATH))
+                tmp_path = f"{settings.SESSION_STORAGE_PATH}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    json.dump(data, fh)
+                os.replace(tmp_path, settings.SESSION_STORAGE_PATH)
+                logger.info(f"Saved session ({len(cookies)} cookies) to: {settings.SESSION_STORAGE_PATH}")
+            except OSError as e:
+                logger.warning(f"Could not save session state: {e}")
+
+    def _read_session_file(self):
+        """Returns the whole session file as a dict keyed by base URL."""
+        try:
+            with open(settings.SESSION_STORAGE_PATH, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _read_session_state(self):
+        """Returns the saved session for the current base URL, or None if missing or too old."""
+        with self._session_file_lock:
+            state = self._read_session_file().get(str(settings.BASE_URL))
+
+        if not state:
+            return None
+
+        age_hours = (time.time() - state.get("saved_at", 0)) / 3600
+        if age_hours > settings.SESSION_MAX_AGE_HOURS:
+            logger.info(f"Saved session is {age_hours:.1f}h old; not restoring it.")
+            return None
+        return state
+
+    def _restorable_cookies(self, cookies):
+        """Drops expired cookies and keeps only the fields Network.setCookies accepts."""
+        now = time.time()
+        restorable = []
+        for cookie in cookies:
+            expires = cookie.get("expires", -1)
+            if expires and 0 < expires < now:
+                continue
+            params = {k: cookie[k] for k in self.COOKIE_PARAM_KEYS if k in cookie}
+            if cookie.get("session") or not expires or expires < 0:
+                # Session cookies must be set without an expiry
+                params.pop("expires", None)
+            restorable.append(params)
+        return restorable
 
     def end_session(self):
         """Saves session data and ends the current WebDriver session."""
         if self.driver:
             logger.info("Ending the WebDriver session.")
+            self.save_session()
             self.driver.quit()
             self.driver = None
 
     def restart_session(self):
         """Restarts the WebDriver session."""
         self.end_session()
-        return self.start_session()
\ No newline at end of file
+        return self.start_session()
+
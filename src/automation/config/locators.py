@@ -22,6 +22,7 @@ class InboundPageLocators:
     SEARCH_FIELD = (By.ID, "tb_RecyclingOrderListSearch")
     SEARCH_FIELD_SETTLEMENTS = (By.ID, "div_PrintDialog")
 
+    ORDER_GRID_ID = "g_RecyclingOrderList"
     ORDER_CHECKBOX = (By.XPATH, "//table[@id='g_RecyclingOrderList']//tr[2]/td[1]//input[@type='checkbox']")
 
     STANDARD_DOWNLOAD_BUTTON = (By.XPATH, "//button[normalize-space(text())='Print/Download']")
@@ -32,6 +33,18 @@ class InboundPageLocators:
     FILTER_DROPDOWN = (By.XPATH, "//select[@id='filter']")
     
     
+class UploadPageLocators:
+    """
+    A class for the locators of the order change page used to upload reports.
+    """
+    CHANGE_BUTTON = (By.ID, "bt_Change")
+    FILES_TAB = (By.XPATH, "//a[@href='#tab_RecyclingFiles']")
+    FILES_TAB_PANE = (By.ID, "tab_RecyclingFiles")
+    UPLOAD_MODAL = (By.CSS_SELECTOR, "div.modal-dialog")
+    FILE_INPUT = (By.CSS_SELECTOR, "input[type='file'][name='files[]']")
+    SAVE_BUTTON = (By.XPATH, "//button[contains(text(),'Save') or contains(text(),'Upload')]")
+
+    
 class TransactionalPageLoaders:
     """
         A class for Inbound Page locators. All locators for this page should be defined here.
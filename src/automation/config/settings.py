@@ -18,10 +18,104 @@ class Settings(BaseSettings):
     # File paths
     DOWNLOAD_PATH: str = os.path.join(PROJECT_ROOT, "downloads")
     LOG_FILE_PATH: str = os.path.join(PROJECT_ROOT, "logs/run.log")
+    LOG_JSON_PATH: str = os.path.join(PROJECT_ROOT, "logs/run.jsonl")
     EXCEL_FILE_PATH: str = os.path.join(PROJECT_ROOT, "data/navigation.xlsx")
     SESSION_STORAGE_PATH: str = os.path.join(PROJECT_ROOT, "browser/state.json")
+    DRIVER_CACHE_PATH: str = os.path.join(PROJECT_ROOT, "browser/chromedriver.json")
+    STATE_DB_PATH: str = os.path.join(PROJECT_ROOT, "application_state/downloads.db")
+    EXCEL_CACHE_DIR: str = os.path.join(PROJECT_ROOT, "cache/excel")
+    TRACE_PATH: str = os.path.join(PROJECT_ROOT, "logs/trace.json")
+    INVOICE_CACHE_PATH: str = os.path.join(PROJECT_ROOT, "cache/sales_orders.json")
+    MEMORY_LOG_PATH: str = os.path.join(PROJECT_ROOT, "logs/memory.csv")
 
-    @field_validator("DOWNLOAD_PATH", "LOG_FILE_PATH", "EXCEL_FILE_PATH", "SESSION_STORAGE_PATH", mode="before")
+    # Logging
+    LOG_LEVEL: str = "DEBUG"
+    LOG_LEVELS: dict[str, str] = {}  # Per-module levels, e.g. {"automation.utilities.save_download_state": "WARNING"}
+    LOG_ASYNC: bool = True  # Hand records to a background thread that does the file I/O
+    LOG_JSON: bool = False  # Also write structured JSON lines to LOG_JSON_PATH
+
+    # Tracing
+    TRACE_ENABLED: bool = False  # Record report, step, wait and WebDriver spans and write them to TRACE_PATH
+    TRACE_MAX_EVENTS: int = 500_000  # Spans kept in memory; later ones are dropped
+
+    # Excel ingestion
+    EXCEL_STREAMING: bool = False  # Stream the sheet with openpyxl read-only mode instead of loading it with pandas; the sheet must be grouped by Order ID
+    EXCEL_CHUNK_SIZE: int = 500  # Rows handed from the parser thread to the workflow at a time
+    EXCEL_CACHE: bool = True  # Reuse parsed sheets from EXCEL_CACHE_DIR while the workbook is unchanged
+    EXCEL_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # Least recently used entries are evicted above this size
+
+    # Download state store
+    STATE_BACKEND: str = "sqlite"  # "sqlite" or "csv"
+    STATE_BATCH_SIZE: int = 50  # SQLite writes committed together
+    STATE_FLUSH_INTERVAL: float = 2.0  # Seconds after which pending SQLite writes are committed anyway
+    RESUME_POLICY: str = "resume"  # "resume" skips downloaded reports, "force" redoes everything, "retry_failed" only redoes failed ones
+
+    # Browser startup
+    CHROMEDRIVER_PATH: str | None = None  # Pre-installed chromedriver binary; skips any lookup when set
+    HEADLESS: bool = False
+    WINDOW_SIZE: str = "1920,1080"  # Used instead of maximizing when running headless
+
+    # Session persistence
+    FRESH_SESSION: bool = False  # Discard the saved browser session and log in from scratch
+    SESSION_MAX_AGE_HOURS: float = 12  # Saved sessions older than this are not restored
+
+    # Page settling (WaitUtils.settle)
+    SETTLE_MAX_WAIT: float = 10  # Default upper bound, in seconds, for a settle step
+    SETTLE_STEP_MAX_WAIT: dict[str, float] = {}  # Per-step overrides, e.g. {"page_load": 30}
+    SETTLE_QUIET_MS: int = 300  # How long the DOM must be free of mutations to count as quiet
+    SETTLE_POLL_INTERVAL: float = 0.1
+
+    # Batched DOM operations (PageBase.run_batch)
+    BATCHED_INPUT: bool = True  # Run wait/clear/click sequences as one in-page script instead of separate WebDriver calls
+
+    # Direct HTTP report downloads
+    DIRECT_DOWNLOAD: bool = False  # Replay captured report requests over HTTP instead of clicking through the modal
+    DIRECT_DOWNLOAD_POOL_SIZE: int = 8
+    DIRECT_DOWNLOAD_TIMEOUT: float = 120
+    DIRECT_CAPTURE_TIMEOUT: float = 15  # How long to wait for the report response when capturing a request
+
+    # Download tracking (CDP download events)
+    TRACK_DOWNLOADS: bool = True
+    DOWNLOAD_BEGIN_TIMEOUT: float = 15  # How long a triggered download may take to start
+    DOWNLOAD_TIMEOUT: float = 120  # How long a started download may take to finish
+
+    # Invoice resolution (transaction reports)
+    INVOICE_CACHE: bool = True  # Remember each order's linked sales order page in INVOICE_CACHE_PATH
+    INVOICE_CACHE_TTL_HOURS: float = 168  # Cached sales order pages older than this are resolved again
+    ORDER_DETAIL_URL_TEMPLATE: str | None = None  # Order page of a settlement grid row, e.g. "/Admin/RecyclingOrder.aspx?id={row_id}"; {order_id} also works
+
+    # Scheduling
+    PRIORITY_SCHEDULING: bool = True  # Run orders by their most urgent PRIORITY (lower first) instead of sheet order
+    DEFAULT_PRIORITY: float = 99  # Priority of reports with an empty or unknown PRIORITY
+    PRIORITY_DEADLINES: dict[str, float] = {}  # Seconds from the start of the run per priority, e.g. {"1": 1800}
+    PRIORITY_AGING_SECONDS: float = 600  # Waiting this long counts as one priority level; 0 disables aging
+    SCHEDULER_LOOKAHEAD: int = 1000  # Orders of a streamed plan read ahead for scheduling
+
+    # Batched inbound downloads
+    INBOUND_BATCH_SIZE: int = 1  # Orders selected together in the inbound grid per Print/Download modal; 1 disables batching
+    INBOUND_BATCH_FILE_GRACE: float = 3  # How long further files of a batch (one per order) may take to start after the first
+
+    # Report uploads
+    PIPELINE_UPLOADS: bool = False  # Upload each order on a separate session as soon as its downloads are confirmed
+    UPLOAD_BULK: bool = True  # Send all files of an order to the file input at once instead of one by one
+    UPLOAD_TIMEOUT: float = 120  # How long the uploads of one order may take to complete
+    UPLOAD_RETRIES: int = 1  # Further attempts for a pipelined order upload that failed
+
+    # Memory watchdog
+    MEMORY_WATCHDOG: bool = True  # Sample each browser session between orders and restart it when a limit below is exceeded
+    MEMORY_SAMPLE_INTERVAL: float = 30  # Minimum seconds between samples of a session
+    MEMORY_MAX_RSS_MB: float = 4096  # Resident memory of chromedriver, Chrome and its renderers
+    MEMORY_MAX_WINDOWS: int = 3  # Open windows; leftovers from the transaction flow count here
+    MEMORY_MAX_JS_HEAP_MB: float = 1024  # JS heap of the current page
+
+    # Parallel execution
+    WORKERS: int = 1  # Number of browser sessions used by the download worker pool
+
+    @field_validator(
+        "DOWNLOAD_PATH", "LOG_FILE_PATH", "LOG_JSON_PATH", "EXCEL_FILE_PATH", "SESSION_STORAGE_PATH",
+        "DRIVER_CACHE_PATH", "CHROMEDRIVER_PATH", "STATE_DB_PATH", "EXCEL_CACHE_DIR", "TRACE_PATH",
+        "INVOICE_CACHE_PATH", "MEMORY_LOG_PATH", mode="before"
+    )
     @classmethod
     def _make_absolute(cls, value: str) -> str:
         """Ensure file system paths from env are absolute."""
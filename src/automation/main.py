@@ -1,20 +1,40 @@
 import os
 from automation.authentication.session_manager import SessionManager
-from automation.authentication.login import LoginPage
+from automation.authentication.login import authenticate
 from automation.workflows.download_reports import DownloadReportsWorkflow
+from automation.utilities.excel_reader import excel_reader
+from automation.workflows.worker_pool import DownloadWorkerPool
 from automation.config.settings import settings
 from automation.utilities.logger import logger
+from automation.utilities.tracer import tracer
 
 """ FOR DEBUGGING PURPOSES ONLY """
 from automation.utilities.file_manager import create_directory_if_not_exists
 
 def main():
     """Main function to run the automation."""
-    # Remove old state file to ensure a fresh start
-    if os.path.exists(settings.SESSION_STORAGE_PATH):
+    # Remove old state file only when a fresh start is requested; otherwise the saved session is restored
+    if settings.FRESH_SESSION and os.path.exists(settings.SESSION_STORAGE_PATH):
         os.remove(settings.SESSION_STORAGE_PATH)
         logger.info(f"Removed old session file: {settings.SESSION_STORAGE_PATH}")
 
+    # Plan the run before any browser starts, so a resumed run skips finished work for free
+    if settings.EXCEL_STREAMING:
+        # Orders are planned while the sheet is parsed, alongside the downloads
+        plan = DownloadReportsWorkflow.stream_plan()
+    else:
+        excel_reader.read_excel_file(sheet_name="Sheet1", custom_fields=DownloadReportsWorkflow.CUSTOM_FIELDS)
+        plan = DownloadReportsWorkflow.build_plan()
+        if not plan:
+            logger.info("Nothing to download; every report in the Excel file is already done.")
+            return
+
+    if settings.WORKERS > 1:
+        DownloadWorkerPool(workers=settings.WORKERS).run(plan)
+        finish_trace()
+        logger.info("Automation script finished.")
+        return
+
     session_manager = SessionManager()
     driver = session_manager.start_session()
 
@@ -23,36 +43,40 @@ def main():
         return
 
     try:
-        LOGGED_IN = False
         # Perform login
-        while not LOGGED_IN:
-            login_page = LoginPage(driver)
-            login_page.login()
-            if login_page.ATTEMPT >= login_page.RETRIES:
-                logger.error("Maximum login attempts reached. Exiting.")
-                session_manager.restart_session()
-                driver = session_manager.start_session()
-            else:
-                LOGGED_IN = True
+        driver = authenticate(session_manager, driver)
+        if not driver:
+            logger.error("Failed to log in. Exiting.")
+            return
 
         # Run the download workflow
-        download_workflow = DownloadReportsWorkflow(driver)
-        download_workflow.run()
+        download_workflow = DownloadReportsWorkflow(driver, load_excel=False, session_manager=session_manager)
+        download_workflow.run(plan)
 
     except Exception as e:
         logger.error(f"An unexpected error occurred during the automation: {e}")
 
     except KeyboardInterrupt:
-        create_directory_if_not_exists("screenshots")
-        driver.save_screenshot("screenshots/final_state.png")
+        if session_manager.driver:
+            create_directory_if_not_exists("screenshots")
+            session_manager.driver.save_screenshot("screenshots/final_state.png")
         session_manager.end_session()
         logger.info("Automation interrupted by user.")
     finally:
         # End the session
-        create_directory_if_not_exists("screenshots")
-        driver.save_screenshot("screenshots/final_state.png")
+        if session_manager.driver:
+            create_directory_if_not_exists("screenshots")
+            session_manager.driver.save_screenshot("screenshots/final_state.png")
         session_manager.end_session()
+        finish_trace()
         logger.info("Automation script finished.")
 
+
+def finish_trace():
+    """Logs the per-step latencies and writes the trace file, when tracing is on."""
+    if tracer.enabled:
+        tracer.report()
+        tracer.export()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,12 +1,93 @@
+import re
+import time
+from collections import namedtuple
+
 from selenium.webdriver.common.by import By
 from automation.ui.page_base import PageBase
+from automation.config.settings import settings
 from automation.utilities.logger import logger
+from automation.utilities.tracer import tracer
+
+
+class NavigationPlanError(ValueError):
+    """Raised when navigation steps cannot be compiled (or a plan is run without its parameters)."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__("Invalid navigation plan:\n" + "\n".join(f"  - {error}" for error in self.errors))
+
+
+# A compiled step. `locator` is a ready (By, value) tuple or None, `value` the raw value,
+# `fields` the {placeholders} in the value (empty when it needs no substitution) and
+# `timeout` the parsed wait time in seconds, where the action takes one.
+NavigationStep = namedtuple("NavigationStep", ["index", "action", "locator", "value", "fields", "timeout"])
+
+
+class NavigationPlan(tuple):
+    """
+    A validated, immutable sequence of navigation steps, compiled once by Navigation.compile()
+    and executable any number of times (e.g. once per order) by Navigation.execute_plan().
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, steps):
+        return super().__new__(cls, steps)
+
+    @property
+    def steps(self):
+        return tuple(self)
+
+    @property
+    def fields(self):
+        """The {placeholders} the step values use; execute_plan() must be given all of them."""
+        return frozenset(field for step in self for field in step.fields)
+
+    def __repr__(self):
+        return f"NavigationPlan({len(self)} steps, fields={sorted(self.fields)})"
+
 
 class Navigation(PageBase):
     """
     This class handles the dynamic navigation based on the instructions from the Excel file.
+
+    Step rows (dicts with Action, LocatorType, LocatorValue and Value) are compiled into a
+    NavigationPlan before the browser starts, so unknown actions, locator types and missing
+    values are reported all at once up front, and executing a step is a single dispatch.
+    Values may contain {placeholders} (e.g. "{order_id}") filled in per execution; only
+    braces around an identifier are placeholders, any other braces are typed as they are.
+
+    Actions:
+        navigate   Opens the URL in Value.
+        click      Clicks the located element.
+        send_keys  Types Value into the located element.
+        wait       With a locator, waits up to Value seconds (default settings.SETTLE_MAX_WAIT)
+                   for the element to be visible; without one, waits up to Value seconds for
+                   the page to settle.
     """
 
+    LOCATOR_TYPES = {
+        "id": By.ID,
+        "name": By.NAME,
+        "xpath": By.XPATH,
+        "css": By.CSS_SELECTOR,
+        "link_text": By.LINK_TEXT,
+        "partial_link_text": By.PARTIAL_LINK_TEXT,
+        "class_name": By.CLASS_NAME,
+        "tag_name": By.TAG_NAME,
+    }
+
+    # A {placeholder}: braces around an identifier
+    PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+    # Action -> (needs a locator, needs a value)
+    ACTIONS = {
+        "navigate": (False, True),
+        "click": (True, False),
+        "send_keys": (True, True),
+        "wait": (False, False),
+    }
+
     def __init__(self, driver):
         """
         Initializes the Navigation class.
@@ -15,74 +96,163 @@ class Navigation(PageBase):
             driver: The Selenium WebDriver instance.
         """
         super().__init__(driver)
+        self._handlers = {
+            "navigate": self._navigate,
+            "click": self._click,
+            "send_keys": self._send_keys,
+            "wait": self._wait,
+        }
 
-    def execute_step(self, step):
-        """Executes a single navigation step."""
-        action = step.get("Action")
-        locator_type = step.get("LocatorType")
-        locator_value = step.get("LocatorValue")
-        value = step.get("Value")
-
-        if not action:
-            logger.warning("Skipping step due to missing action.")
-            return
-
-        logger.info(f"Executing action: {action}")
-
-        by_locator = None
-        if locator_type and locator_value:
-            by_locator = self._get_locator(locator_type, locator_value)
-
-        if action.lower() == "navigate":
-            self.driver.get(value)
-        elif action.lower() == "click":
-            if by_locator:
-                self.click(by_locator)
-            else:
-                logger.error("Cannot perform click action without a locator.")
-        elif action.lower() == "send_keys":
-            if by_locator and value is not None:
-                self.send_keys(by_locator, value)
-            else:
-                logger.error("Cannot perform send_keys action without a locator and a value.")
-        elif action.lower() == "wait":
-            # Implement a generic wait if needed, or use implicit/explicit waits.
-            pass
-        else:
-            logger.warning(f"Unsupported action: {action}")
-
-    def execute_navigation(self, steps):
-        """Executes a series of navigation steps."""
-        for step in steps:
-            self.execute_step(step)
-
-    def _get_locator(self, locator_type, locator_value):
+    # --- Compilation ---
+
+    @classmethod
+    def compile(cls, steps):
         """
-        Constructs a locator tuple from the locator type and value.
+        Validates step rows and compiles them into a NavigationPlan.
 
         Args:
-            locator_type (str): The type of the locator (e.g., 'id', 'name', 'xpath').
-            locator_value (str): The value of the locator.
+            steps (iterable): Step rows (dicts with Action, LocatorType, LocatorValue, Value),
+                              e.g. the records of the navigation sheet.
 
         Returns:
-            tuple: A locator tuple (e.g., (By.ID, 'username')).
+            NavigationPlan: The compiled plan.
+
+        Raises:
+            NavigationPlanError: Listing every invalid row.
         """
-        if locator_type.lower() == 'id':
-            return (By.ID, locator_value)
-        elif locator_type.lower() == 'name':
-            return (By.NAME, locator_value)
-        elif locator_type.lower() == 'xpath':
-            return (By.XPATH, locator_value)
-        elif locator_type.lower() == 'css':
-            return (By.CSS_SELECTOR, locator_value)
-        elif locator_type.lower() == 'link_text':
-            return (By.LINK_TEXT, locator_value)
-        elif locator_type.lower() == 'partial_link_text':
-            return (By.PARTIAL_LINK_TEXT, locator_value)
-        elif locator_type.lower() == 'class_name':
-            return (By.CLASS_NAME, locator_value)
-        elif locator_type.lower() == 'tag_name':
-            return (By.TAG_NAME, locator_value)
-        else:
-            logger.error(f"Unsupported locator type: {locator_type}")
+        compiled = []
+        errors = []
+        for index, step in enumerate(steps, start=1):
+            try:
+                compiled.append(cls._compile_step(index, step))
+            except NavigationPlanError as e:
+                errors.extend(e.errors)
+        if errors:
+            raise NavigationPlanError(errors)
+        return NavigationPlan(compiled)
+
+    @classmethod
+    def _compile_step(cls, index, step):
+        action = cls._cell(step.get("Action"))
+        locator_type = cls._cell(step.get("LocatorType"))
+        locator_value = cls._cell(step.get("LocatorValue"))
+        value = cls._cell(step.get("Value"))
+
+        errors = []
+        action = action.lower() if action else None
+        if action not in cls.ACTIONS:
+            raise NavigationPlanError([f"step {index}: unsupported action {action!r}"])
+        needs_locator, needs_value = cls.ACTIONS[action]
+
+        locator = None
+        if locator_type or locator_value:
+            by = cls.LOCATOR_TYPES.get(locator_type.lower()) if locator_type else None
+            if by is None:
+                errors.append(f"step {index}: unsupported locator type {locator_type!r}")
+            elif not locator_value:
+                errors.append(f"step {index}: locator type {locator_type!r} has no locator value")
+            else:
+                locator = (by, locator_value)
+        elif needs_locator:
+            errors.append(f"step {index}: '{action}' needs a locator")
+
+        if needs_value and value is None:
+            errors.append(f"step {index}: '{action}' needs a value")
+
+        timeout = None
+        if action == "wait" and value is not None:
+            try:
+                timeout = float(value)
+            except ValueError:
+                errors.append(f"step {index}: wait time {value!r} is not a number")
+
+        fields = ()
+        if value is not None and action != "wait":
+            fields = tuple(dict.fromkeys(cls.PLACEHOLDER.findall(value)))
+
+        if errors:
+            raise NavigationPlanError(errors)
+        return NavigationStep(index, action, locator, value, fields, timeout)
+
+    @staticmethod
+    def _cell(value):
+        """Normalizes an Excel cell: empty strings and NaN become None, everything else a stripped string."""
+        if value is None or value != value:
             return None
+        text = str(value).strip()
+        return text or None
+
+    # --- Execution ---
+
+    def execute_plan(self, plan, **params):
+        """
+        Executes a compiled plan, stopping at the first step that fails.
+
+        Args:
+            plan (NavigationPlan): From compile().
+            **params: Values for the {placeholders} of the plan.
+
+        Returns:
+            dict: ok (bool), failed_step (index or None) and timings, a list of
+                  (index, action, seconds) per executed step.
+
+        Raises:
+            NavigationPlanError: If a placeholder of the plan has no parameter.
+        """
+        missing = plan.fields - params.keys()
+        if missing:
+            raise NavigationPlanError([f"no value for placeholder {{{field}}}" for field in sorted(missing)])
+
+        timings = []
+        for step in plan:
+            value = self.PLACEHOLDER.sub(lambda m: str(params[m.group(1)]), step.value) if step.fields else step.value
+            started_at = time.perf_counter()
+            try:
+                ok = self._handlers[step.action](step, value)
+            except Exception as e:
+                logger.error(f"Navigation step {step.index} ({step.action}) failed: {e}")
+                ok = False
+            seconds = time.perf_counter() - started_at
+            timings.append((step.index, step.action, seconds))
+            tracer.record(f"nav:{step.action}", "step", started_at, seconds)
+            logger.debug("Navigation step %d (%s) took %.3fs.", step.index, step.action, seconds)
+            if ok is False:
+                return {"ok": False, "failed_step": step.index, "timings": timings}
+
+        return {"ok": True, "failed_step": None, "timings": timings}
+
+    def execute_step(self, step):
+        """Compiles and executes a single navigation step row."""
+        try:
+            plan = self.compile([step])
+        except NavigationPlanError as e:
+            logger.error(str(e))
+            return False
+        return self.execute_plan(plan)["ok"]
+
+    def execute_navigation(self, steps, **params):
+        """Compiles and executes a series of navigation step rows."""
+        plan = steps if isinstance(steps, NavigationPlan) else self.compile(steps)
+        return self.execute_plan(plan, **params)
+
+    def _navigate(self, step, value):
+        self.driver.get(value)
+        self.wait.settle("page_load")
+
+    def _click(self, step, value):
+        element = self.wait.wait_for_element_to_be_clickable(step.locator)
+        if not element:
+            return False
+        element.click()
+
+    def _send_keys(self, step, value):
+        element = self.wait.wait_for_element_to_be_visible(step.locator)
+        if not element:
+            return False
+        element.send_keys(value)
+
+    def _wait(self, step, value):
+        timeout = step.timeout if step.timeout is not None else settings.SETTLE_MAX_WAIT
+        if step.locator:
+            return self.wait.wait_for_element_to_be_visible(step.locator, timeout=timeout) is not None
+        self.wait.settle("navigation_wait", max_wait=timeout)
@@ -1,8 +1,9 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import ElementClickInterceptedException, TimeoutException
-from selenium.webdriver.common.by import By
+from selenium.common.exceptions import ElementClickInterceptedException, TimeoutException, WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+from automation.config.settings import settings
 from automation.utilities.logger import logger
 import time
 from automation.utilities.wait_utils import WaitUtils
@@ -13,8 +14,147 @@ class PageBase:
     """
     This class serves as the base for all page objects.
     It contains common methods that can be used across all pages.
+
+    Interactions that would take several WebDriver calls (wait, scroll, clear, click, read
+    back) are expressed as a list of operations and run by run_batch() in a single
+    in-page script call; clear_input, safe_click, send_keys and search are built on it.
     """
 
+    # Blocking overlays/popups used by the app, hidden before retrying an intercepted click
+    KNOWN_OVERLAYS = [
+        '.recycling-orders-popup-inner',
+        '#gritter-notice-wrapper',
+        '.ui-widget-overlay',
+        '.modal-backdrop',
+    ]
+
+    # Runs a list of DOM operations against one element and reports a result per operation.
+    # A "find" polls (up to its timeout) until the element is present / visible / clickable.
+    # A cleared value is set through the native value setter and announced with input/change
+    # events, so framework-bound inputs see it.
+    BATCH_SCRIPT = """
+        const [operations, pollMs] = arguments;
+        const done = arguments[arguments.length - 1];
+        const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+        const xpath = (path) => document.evaluate(path, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        const locate = (op) => {
+            switch (op.by) {
+                case 'element': return op.element;
+                case 'id': return document.getElementById(op.value);
+                case 'xpath': return xpath(op.value);
+                case 'name': return document.getElementsByName(op.value)[0];
+                case 'class name': return document.getElementsByClassName(op.value)[0];
+                case 'tag name': return document.getElementsByTagName(op.value)[0];
+                case 'css selector': return document.querySelector(op.value);
+                case 'link text': return xpath(`//a[normalize-space(.)=${JSON.stringify(op.value)}]`);
+                case 'partial link text': return xpath(`//a[contains(., ${JSON.stringify(op.value)})]`);
+                default: throw new Error('unsupported locator strategy: ' + op.by);
+            }
+        };
+        const visible = (el) => {
+            if (!el || !el.isConnected || !(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+            const style = window.getComputedStyle(el);
+            return style.display !== 'none' && style.visibility !== 'hidden';
+        };
+        const ready = (el, wait) => !!el && (wait === 'present' || (visible(el) && (wait !== 'clickable' || !el.disabled)));
+        const valueOf = (el) => el.value !== undefined ? el.value : (el.innerText || '');
+        const setValue = (el, value) => {
+            if (el.value !== undefined) {
+                const proto = Object.getPrototypeOf(el);
+                const setter = Object.getOwnPropertyDescriptor(proto, 'value');
+                if (setter && setter.set) setter.set.call(el, value); else el.value = value;
+            } else {
+                el.innerText = value;
+            }
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+        };
+        const hitTarget = (el) => {
+            const rect = el.getBoundingClientRect();
+            const top = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+            return (!top || top === el || el.contains(top)) ? null : top;
+        };
+        const describe = (el) => el.tagName.toLowerCase() + (el.id ? '#' + el.id : '') +
+            (typeof el.className === 'string' && el.className ? '.' + el.className.trim().split(/\s+/).join('.') : '');
+        const state = (el) => ({
+            visible: visible(el), enabled: !el.disabled, selected: !!(el.checked || el.selected),
+            value: valueOf(el), text: (el.innerText || '').trim(),
+        });
+
+        (async () => {
+            const results = [];
+            let el = null;
+            for (let i = 0; i < operations.length; i++) {
+                const op = operations[i];
+                const fail = (error) => done({ok: false, failed: i, error: error, results: results, element: el});
+                if (op.op === 'find') {
+                    const deadline = Date.now() + op.timeout;
+                    el = locate(op);
+                    while (!ready(el, op.wait) && Date.now() < deadline) {
+                        await sleep(pollMs);
+                        el = locate(op);
+                    }
+                    if (!ready(el, op.wait)) return fail(`element ${op.by}=${op.value || ''} not ${op.wait} within ${op.timeout}ms`);
+                    results.push({found: true});
+                    continue;
+                }
+                if (!el) return fail('no element; start the batch with a find operation');
+                switch (op.op) {
+                    case 'scroll':
+                        el.scrollIntoView({block: 'center'});
+                        results.push({});
+                        break;
+                    case 'clear':
+                        el.focus();
+                        setValue(el, '');
+                        results.push({value: valueOf(el)});
+                        break;
+                    case 'click': {
+                        let blocker = hitTarget(el);
+                        if (blocker && op.hide_overlays && op.hide_overlays.length) {
+                            document.querySelectorAll(op.hide_overlays.join(',')).forEach(overlay => {
+                                overlay.style.display = 'none';
+                                overlay.style.visibility = 'hidden';
+                            });
+                            blocker = hitTarget(el);
+                        }
+                        if (blocker) return fail('click intercepted by ' + describe(blocker));
+                        el.click();
+                        results.push({clicked: true});
+                        break;
+                    }
+                    case 'check_group': {
+                        // Clicking fires the handlers a user's click would (including ones that
+                        // check or uncheck related boxes); boxes still off target are set directly
+                        const root = op.group ? el.closest(op.group) : el;
+                        if (!root) return fail('no ancestor matching ' + op.group);
+                        const boxes = root.matches("input[type='checkbox']") ? [root] : Array.from(root.querySelectorAll("input[type='checkbox']"));
+                        const pending = () => boxes.filter(box => box.checked !== op.checked && !box.disabled);
+                        pending().forEach(box => { if (box.checked !== op.checked) box.click(); });
+                        pending().forEach(box => {
+                            box.checked = op.checked;
+                            box.dispatchEvent(new Event('change', {bubbles: true}));
+                        });
+                        results.push({states: boxes.map(box => ({id: box.id, checked: box.checked, disabled: box.disabled}))});
+                        break;
+                    }
+                    case 'value':
+                        results.push({value: valueOf(el)});
+                        break;
+                    case 'state':
+                        results.push(state(el));
+                        break;
+                    default:
+                        return fail('unsupported operation: ' + op.op);
+                }
+            }
+            done({ok: true, failed: null, error: null, results: results, element: el});
+        })().catch(error => done({ok: false, failed: null, error: String(error), results: [], element: null}));
+    """
+
+    # Seconds a single batch call may poll in-page, below the session's default 30s script timeout
+    MAX_SCRIPT_WAIT = 20
+
     def __init__(self, driver):
         """
         Initializes the PageBase.
@@ -26,6 +166,59 @@ class PageBase:
         self.wait = WaitUtils(driver)
         self.actions = Actions(driver)
 
+    # --- Batched DOM operations ---
+
+    @staticmethod
+    def op_find(element_or_locator, wait="visible", timeout=10):
+        """
+        Builds the "find" operation that starts a batch.
+
+        Args:
+            element_or_locator: A WebElement or a locator tuple (By.*, value).
+            wait (str): "present", "visible" or "clickable".
+            timeout (float): Seconds to poll for the element.
+        """
+        op = {"op": "find", "wait": wait, "timeout": int(timeout * 1000)}
+        if isinstance(element_or_locator, WebElement):
+            op.update(by="element", element=element_or_locator)
+        else:
+            op.update(by=element_or_locator[0], value=element_or_locator[1])
+        return op
+
+    def run_batch(self, operations):
+        """
+        Runs DOM operations in a single WebDriver round-trip.
+
+        The first operation must be a find (see op_find); the others act on the element it
+        found, in order: {"op": "scroll"}, {"op": "clear"}, {"op": "click", "hide_overlays":
+        [selectors]}, {"op": "value"}, {"op": "state"} and {"op": "check_group", "checked": bool,
+        "group": ancestor selector}. The batch stops at the first operation that fails.
+
+        A single call polls for the element for at most MAX_SCRIPT_WAIT seconds; longer find
+        timeouts are covered by repeating the call, so the session's script timeout is left alone.
+
+        Args:
+            operations (list): The operations.
+
+        Returns:
+            dict: ok (bool), failed (index of the failed operation or None), error (str or None),
+                  results (one dict per executed operation) and element (the WebElement found).
+        """
+        operations = list(operations)
+        find = operations[0] if operations and operations[0].get("op") == "find" else None
+        deadline = time.monotonic() + (find["timeout"] / 1000 if find else 0)
+        poll_ms = int(settings.SETTLE_POLL_INTERVAL * 1000)
+        while True:
+            if find:
+                remaining = max(0.0, deadline - time.monotonic())
+                operations[0] = {**find, "timeout": int(min(remaining, self.MAX_SCRIPT_WAIT) * 1000)}
+            try:
+                result = self.driver.execute_async_script(self.BATCH_SCRIPT, operations, poll_ms)
+            except WebDriverException as e:
+                return {"ok": False, "failed": None, "error": str(e), "results": [], "element": None}
+            if result["ok"] or result["failed"] != 0 or time.monotonic() >= deadline:
+                return result
+
     def click(self, by_locator):
         """
         Clicks on an element after waiting for it to be clickable.
@@ -45,7 +238,11 @@ class PageBase:
             by_locator: The locator of the element.
             text: The text to be sent.
         """
-        element = self.wait.wait_for_element_to_be_visible(by_locator)
+        if settings.BATCHED_INPUT:
+            result = self.run_batch([self.op_find(by_locator)])
+            element = result["element"] if result["ok"] else None
+        else:
+            element = self.wait.wait_for_element_to_be_visible(by_locator)
         if element:
             element.send_keys(text)
 
@@ -77,7 +274,25 @@ class PageBase:
         """
         Wait until clickable, try click; on intercept hide overlays and retry once.
         locator: tuple (By.*, value)
+
+        With settings.BATCHED_INPUT the wait, scroll, intercept check, overlay hiding and
+        click happen in one script call; a click still intercepted after that falls back
+        to the native click.
         """
+        if settings.BATCHED_INPUT:
+            operations = [self.op_find(locator, wait="clickable", timeout=timeout)]
+            if scroll:
+                operations.append({"op": "scroll"})
+            operations.append({"op": "click", "hide_overlays": self.KNOWN_OVERLAYS})
+            result = self.run_batch(operations)
+            if result["ok"]:
+                return result["element"]
+            if result["failed"] == 0:
+                logger.error(f"Element not clickable: {locator}")
+                return None
+            logger.warning(f"Batched click failed ({result['error']}), retrying natively.")
+            timeout = 0 if result["element"] is not None else timeout
+
         try:
             el = WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable(locator))
             if scroll:
@@ -99,88 +314,43 @@ class PageBase:
     def close_known_overlays(self):
         """Hide known blocking overlays/popups used by the app."""
         self.driver.execute_script("""
-            const selectors = [
-                '.recycling-orders-popup-inner',
-                '#gritter-notice-wrapper',
-                '.ui-widget-overlay',
-                '.modal-backdrop'   // add any other overlay selectors here
-            ];
-            selectors.forEach(s => {
-                document.querySelectorAll(s).forEach(el => {
-                    el.style.display = 'none';
-                    el.style.visibility = 'hidden';
-                });
+            document.querySelectorAll(arguments[0].join(',')).forEach(el => {
+                el.style.display = 'none';
+                el.style.visibility = 'hidden';
             });
-        """)
+        """, self.KNOWN_OVERLAYS)
 
     def clear_input(self, element_or_locator, timeout=5):
         """Robustly clear an input or contenteditable element.
 
         Accepts either a Selenium WebElement or a locator tuple (By, value).
         Strategy:
-        - If locator provided, wait for visibility.
-        - Try element.clear()
-        - If value remains, use JS to set value/innerText to '' and dispatch input/change
+        - Wait for visibility, clear the value in-page (dispatching input/change so
+          frameworks pick it up) and read it back, all in one batched call.
+        - Without settings.BATCHED_INPUT, try element.clear() and the same JS clear.
         - Fallback to sending CTRL+A + BACKSPACE
         Returns True if element is empty after attempts, False otherwise.
         """
-        from selenium.webdriver.remote.webelement import WebElement
-        el = None
+        if not isinstance(element_or_locator, (tuple, WebElement)):
+            logger.warning("clear_input received unsupported type: %s", type(element_or_locator))
+            return False
+
         try:
-            if isinstance(element_or_locator, tuple):
-                el = self.wait.wait_for_element_to_be_visible(element_or_locator, timeout=timeout)
-            elif isinstance(element_or_locator, WebElement):
-                el = element_or_locator
+            if settings.BATCHED_INPUT:
+                result = self.run_batch([self.op_find(element_or_locator, timeout=timeout), {"op": "clear"}])
+                if result["ok"] and not result["results"][-1]["value"]:
+                    return True
+                el = result["element"]
+                # A failed find may still return an element that is hidden or not interactable
+                if el is None or result["failed"] == 0:
+                    logger.debug("Batched clear failed: %s", result["error"])
+                    return False
             else:
-                logger.warning("clear_input received unsupported type: %s", type(element_or_locator))
-                return False
-
-            if not el:
-                return False
-
-            # Try native clear first
-            try:
-                el.clear()
-            except Exception:
-                # ignore and continue to JS fallback
-                pass
-
-            time.sleep(0.05)
-
-            # Check current content (value or innerText)
-            remaining = self.driver.execute_script(
-                "return arguments[0].value !== undefined ? arguments[0].value : (arguments[0].innerText || '');",
-                el,
-            )
-
-            if remaining:
-                # JS: clear and dispatch events so frameworks (React/Vue) pick it up
-                try:
-                    self.driver.execute_script(
-                        """
-                        const el = arguments[0];
-                        if (el.value !== undefined) {
-                            el.value = '';
-                            el.dispatchEvent(new Event('input', { bubbles: true }));
-                            el.dispatchEvent(new Event('change', { bubbles: true }));
-                        } else {
-                            el.innerText = '';
-                            el.dispatchEvent(new Event('input', { bubbles: true }));
-                        }
-                        """,
-                        el,
-                    )
-                except Exception:
-                    logger.debug("JS clear failed, will try keyboard fallback.")
-
-            # verify again
-            time.sleep(0.05)
-            remaining = self.driver.execute_script(
-                "return arguments[0].value !== undefined ? arguments[0].value : (arguments[0].innerText || '');",
-                el,
-            )
+                el = self._clear_input_native(element_or_locator, timeout)
+                if el is None:
+                    return False
 
-            if remaining:
+            if self._input_value(el):
                 # keyboard fallback: Ctrl+A + Backspace
                 try:
                     el.send_keys(Keys.CONTROL, 'a')
@@ -190,12 +360,176 @@ class PageBase:
                     pass
 
             # final check
-            remaining = self.driver.execute_script(
-                "return arguments[0].value !== undefined ? arguments[0].value : (arguments[0].innerText || '');",
-                el,
-            )
-
-            return not bool(remaining)
+            return not bool(self._input_value(el))
         except Exception as e:
             logger.warning(f"clear_input failed: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def search(self, element_or_locator, text, timeout=10, submit=True):
+        """
+        Replaces the text of a search field and submits it with Enter.
+
+        The field is found and cleared in one batched call (see clear_input) and the text is
+        typed natively, so the page sees real key events. The field's value is then read back
+        and Enter is only pressed once it matches the text; a mismatch is retyped once.
+
+        Args:
+            element_or_locator: A WebElement or a locator tuple (By, value).
+            text (str): The search text.
+            timeout (float): Seconds to wait for the field.
+            submit (bool): Whether to press Enter after typing.
+
+        Returns:
+            bool: True if the text was entered (and submitted), False if the field was not
+                  found or did not take the text.
+        """
+        element = element_or_locator
+        if settings.BATCHED_INPUT:
+            result = self.run_batch([self.op_find(element_or_locator, timeout=timeout), {"op": "clear"}])
+            element = result["element"]
+            # A failed find may still return an element that is hidden or not interactable
+            if element is None or result["failed"] == 0:
+                logger.debug("Search field not found: %s", result["error"])
+                return False
+            if not result["ok"] or result["results"][-1]["value"]:
+                self.clear_input(element)
+        else:
+            if isinstance(element, tuple):
+                element = self.wait.wait_for_element_to_be_visible(element, timeout=timeout)
+                if not element:
+                    return False
+            if not self.clear_input(element):
+                try:
+                    element.clear()
+                except Exception:
+                    pass
+
+        text = str(text)
+        element.send_keys(text)
+        value = self._field_value(element)
+        if value != text:
+            logger.warning(f"Search field holds {value!r} instead of {text!r}; typing it again.")
+            self.clear_input(element)
+            element.send_keys(text)
+            value = self._field_value(element)
+            if value != text:
+                logger.error(f"Search field did not take {text!r} (it holds {value!r}).")
+                return False
+
+        if submit:
+            element.send_keys(Keys.ENTER)
+        return True
+
+    def set_checkbox_group(self, element_or_locator, checked=True, group=None, timeout=10):
+        """
+        Checks or unchecks every checkbox of a group in one call.
+
+        The group is the closest ancestor of the element matching the `group` CSS selector
+        (or the element itself). Boxes not yet in the target state are clicked, so the page's
+        handlers run as for a user's click, and the final states are read back.
+
+        Args:
+            element_or_locator: A WebElement or a locator tuple (By, value) inside the group.
+            checked (bool): The target state.
+            group (str, optional): CSS selector of the group container.
+            timeout (float): Seconds to wait for the element to be visible.
+
+        Returns:
+            list | None: The final {"id", "checked", "disabled"} of every checkbox in the group,
+                         or None if the element or the group was not found.
+        """
+        if settings.BATCHED_INPUT:
+            result = self.run_batch(
+                [self.op_find(element_or_locator, timeout=timeout), {"op": "check_group", "checked": checked, "group": group}]
+            )
+            if not result["ok"]:
+                logger.debug("Could not set checkbox group: %s", result["error"])
+                return None
+            states = result["results"][-1]["states"]
+        else:
+            states = self._set_checkbox_group_native(element_or_locator, checked, group, timeout)
+            if states is None:
+                return None
+
+        mismatched = [state["id"] for state in states if state["checked"] != checked and not state["disabled"]]
+        if mismatched:
+            logger.warning(f"Checkboxes not {'checked' if checked else 'unchecked'}: {mismatched}")
+        return states
+
+    # --- Internals ---
+
+    def _set_checkbox_group_native(self, element_or_locator, checked, group, timeout):
+        """set_checkbox_group with one is_selected()/click() pair per checkbox."""
+        element = element_or_locator
+        if isinstance(element, tuple):
+            element = self.wait.wait_for_element_to_be_visible(element, timeout=timeout)
+        if not element:
+            logger.debug("Checkbox group element not found: %s", element_or_locator)
+            return None
+        root = self.driver.execute_script("return arguments[1] ? arguments[0].closest(arguments[1]) : arguments[0];", element, group)
+        if root is None:
+            logger.debug("No checkbox group matching %r.", group)
+            return None
+
+        boxes = [root] if root.get_attribute("type") == "checkbox" else root.find_elements(By.XPATH, ".//input[@type='checkbox']")
+        for box in boxes:
+            try:
+                if box.is_selected() != checked:
+                    box.click()
+            except Exception as e:
+                logger.warning(f"Could not {'select' if checked else 'deselect'} checkbox {box.get_attribute('id')}: {e}")
+        return [
+            {"id": box.get_attribute("id"), "checked": box.is_selected(), "disabled": not box.is_enabled()}
+            for box in boxes
+        ]
+
+
+    def _clear_input_native(self, element_or_locator, timeout):
+        """Clears with element.clear() and, if a value remains, in-page; returns the element (or None)."""
+        if isinstance(element_or_locator, tuple):
+            el = self.wait.wait_for_element_to_be_visible(element_or_locator, timeout=timeout)
+        else:
+            el = element_or_locator
+        if not el:
+            return None
+
+        # Try native clear first
+        try:
+            el.clear()
+        except Exception:
+            # ignore and continue to JS fallback
+            pass
+
+        if self._input_value(el):
+            # JS: clear and dispatch events so frameworks (React/Vue) pick it up
+            try:
+                self.driver.execute_script(
+                    """
+                    const el = arguments[0];
+                    if (el.value !== undefined) {
+                        el.value = '';
+                        el.dispatchEvent(new Event('input', { bubbles: true }));
+                        el.dispatchEvent(new Event('change', { bubbles: true }));
+                    } else {
+                        el.innerText = '';
+                        el.dispatchEvent(new Event('input', { bubbles: true }));
+                    }
+                    """,
+                    el,
+                )
+            except Exception:
+                logger.debug("JS clear failed, will try keyboard fallback.")
+        return el
+
+    def _field_value(self, el):
+        """Reads a field's current value, through a batch when settings.BATCHED_INPUT is on."""
+        if settings.BATCHED_INPUT:
+            result = self.run_batch([self.op_find(el, wait="present", timeout=0), {"op": "value"}])
+            return result["results"][-1]["value"] if result["ok"] else None
+        return self._input_value(el)
+
+    def _input_value(self, el):
+        return self.driver.execute_script(
+            "return arguments[0].value !== undefined ? arguments[0].value : (arguments[0].innerText || '');",
+            el,
+        )
@@ -0,0 +1,136 @@
+from automation.utilities.logger import logger
+
+
+class PageContext:
+    """
+    Tracks what the browser is currently showing: page, active tab, grid search filters
+    and open dialogs.
+
+    Page objects ask the context to ensure a state instead of re-establishing it for
+    every report; a navigation, tab click or search only runs when the tracked state
+    differs. Anything that changes the page outside of the context (a refresh, a window
+    switch, a failed step) must call invalidate() so the next step starts from scratch.
+    A page with an open dialog is never reused: the dialog may cover its grids, so the
+    page is loaded again, which also closes the dialog.
+    Skipped and performed steps are counted per kind for the run summary.
+    """
+
+    KINDS = ("navigation", "tab", "search")
+
+    def __init__(self, driver):
+        """
+        Initializes the PageContext.
+
+        Args:
+            driver: The Selenium WebDriver instance.
+        """
+        self.driver = driver
+        self.page = None
+        self.tab = None
+        self.filters = {}
+        self.dialogs = set()
+        self.performed = dict.fromkeys(self.KINDS, 0)
+        self.skipped = dict.fromkeys(self.KINDS, 0)
+
+    def ensure_page(self, url, load):
+        """
+        Opens a page unless it is already the current one and no dialog is open on it.
+
+        Args:
+            url (str): The page URL.
+            load (callable): Navigates to the page and prepares it (settle, overlays).
+
+        Returns:
+            bool: True if the page was loaded, False if the step was skipped.
+        """
+        if self.page == url and not self.has_dialog() and self.driver.current_url == url:
+            self.skipped["navigation"] += 1
+            return False
+
+        load()
+        self.navigated(url)
+        self.performed["navigation"] += 1
+        return True
+
+    def ensure_tab(self, tab, activate):
+        """
+        Activates a tab of the current page unless it is already active.
+
+        Args:
+            tab (str): A name for the tab.
+            activate (callable): Clicks the tab; exceptions propagate and leave the tab unknown.
+
+        Returns:
+            bool: True if the tab was activated, False if the step was skipped.
+        """
+        if self.page is not None and self.tab == tab:
+            self.skipped["tab"] += 1
+            return False
+
+        self.tab = None
+        activate()
+        self.tab = tab
+        # Switching tabs reloads its grids
+        self.filters.clear()
+        self.performed["tab"] += 1
+        return True
+
+    def filter_matches(self, grid, value):
+        """
+        Returns True (and counts a skipped search) if the grid is already filtered by value
+        and no dialog covers it.
+        """
+        if self.page is not None and not self.has_dialog() and grid in self.filters and self.filters[grid] == str(value):
+            self.skipped["search"] += 1
+            return True
+        return False
+
+    def set_filter(self, grid, value):
+        """Records the search a grid is now filtered by."""
+        self.filters[grid] = str(value)
+        self.performed["search"] += 1
+
+    def dialog_opened(self, name):
+        """Records that a dialog (e.g. "print") is open on the current page."""
+        self.dialogs.add(name)
+
+    def dialog_closed(self, name):
+        """Records that a dialog was closed."""
+        self.dialogs.discard(name)
+
+    def has_dialog(self, name=None):
+        """Returns True if the dialog (any dialog when name is None) is tracked as open on the current page."""
+        return name in self.dialogs if name is not None else bool(self.dialogs)
+
+    def navigated(self, url):
+        """Records a navigation done outside of ensure_page; tab, filters and dialogs are reset."""
+        self.page = url
+        self.tab = None
+        self.filters.clear()
+        self.dialogs.clear()
+
+    def invalidate(self):
+        """Forgets everything, so the next step re-establishes the page from scratch."""
+        self.navigated(None)
+
+    def summary(self):
+        """
+        Returns the performed and skipped counts per kind of step.
+
+        Returns:
+            dict: {"navigation": {"performed": n, "skipped": n}, ...}
+        """
+        return {
+            kind: {"performed": self.performed[kind], "skipped": self.skipped[kind]}
+            for kind in self.KINDS
+        }
+
+    def report(self):
+        """Logs the summary, if any step was tracked."""
+        summary = self.summary()
+        if not any(counts["performed"] or counts["skipped"] for counts in summary.values()):
+            return
+        logger.info("Page context: %s.", ", ".join(
+            f"{kind} {counts['performed']} performed / {counts['skipped']} skipped"
+            for kind, counts in summary.items()
+        ))
@@ -0,0 +1,295 @@
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import quote_plus, unquote, unquote_plus, urlsplit, urlunsplit
+
+import urllib3
+
+from automation.config.settings import settings
+from automation.utilities.logger import logger
+from automation.utilities.file_manager import create_directory_if_not_exists
+
+
+class DirectReportDownloader:
+    """
+    Downloads reports over HTTP by replaying the request the Print/Download modal sends.
+
+    The first time a report type is downloaded through the browser, the report-generation
+    request is captured from the Chrome performance log (CDP Network events). Later orders
+    replay that request through a pooled HTTP connection that carries the browser's cookies
+    and stream the PDF straight into the order folder. When no usable template exists, or a
+    replay fails, callers fall back to the Selenium click path.
+    """
+
+    # Headers that are recomputed for every replayed request
+    SKIPPED_HEADERS = {"cookie", "content-length", "host", "connection", "accept-encoding"}
+
+    REPORT_MIME_TYPES = ("application/pdf", "application/octet-stream", "application/zip")
+
+    # Give up capturing a report type after this many attempts without a usable request
+    MAX_CAPTURE_ATTEMPTS = 2
+
+    def __init__(self):
+        self.templates = {}
+        self._capture_attempts = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    @property
+    def enabled(self):
+        """Whether direct downloads are switched on in the settings."""
+        return settings.DIRECT_DOWNLOAD
+
+    @property
+    def pool(self):
+        """The shared HTTP connection pool, created on first use."""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = urllib3.PoolManager(maxsize=settings.DIRECT_DOWNLOAD_POOL_SIZE, block=True)
+        return self._pool
+
+    @staticmethod
+    def template_key(page_key, report_name, report_type):
+        """Returns the key a captured request is stored under."""
+        return (page_key, str(report_name).strip().lower(), str(report_type).strip().lower())
+
+    def has_template(self, key):
+        """Returns True if a replayable request has been captured for the key."""
+        with self._lock:
+            return key in self.templates
+
+    def should_capture(self, key):
+        """Returns True if the key has no template yet and capturing has not been given up on."""
+        with self._lock:
+            return key not in self.templates and self._capture_attempts.get(key, 0) < self.MAX_CAPTURE_ATTEMPTS
+
+    def begin_capture(self, driver):
+        """
+        Drains the performance log so a following capture only sees the events of one report.
+        """
+        try:
+            driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"Performance log not available: {e}")
+
+    def capture(self, driver, key, order_id):
+        """
+        Captures the report request triggered by the Selenium click path.
+
+        Reads Network events from the performance log until a response that looks like a
+        report file shows up (or settings.DIRECT_CAPTURE_TIMEOUT elapses) and stores its
+        request as a template. A request is only replayable if the order ID is the value of
+        exactly one query or form field and appears nowhere else, so only that field is
+        substituted for later orders.
+
+        Returns:
+            bool: True if a template was stored.
+        """
+        with self._lock:
+            self._capture_attempts[key] = self._capture_attempts.get(key, 0) + 1
+
+        requests = {}
+        deadline = time.perf_counter() + settings.DIRECT_CAPTURE_TIMEOUT
+        while time.perf_counter() < deadline:
+            try:
+                entries = driver.get_log("performance")
+            except Exception as e:
+                logger.warning(f"Cannot capture report request without the performance log: {e}")
+                return False
+
+            for entry in entries:
+                try:
+                    message = json.loads(entry["message"])["message"]
+                except (KeyError, ValueError):
+                    continue
+
+                params = message.get("params", {})
+                if message.get("method") == "Network.requestWillBeSent":
+                    requests[params.get("requestId")] = params.get("request", {})
+                elif message.get("method") == "Network.responseReceived":
+                    request = requests.get(params.get("requestId"))
+                    if request is not None and self._is_report_response(params.get("response", {})):
+                        return self._store_template(driver, key, order_id, params.get("requestId"), request)
+
+            time.sleep(0.25)
+
+        logger.info(f"No report request captured for {key}; it will keep using the Selenium path.")
+        return False
+
+    def _is_report_response(self, response):
+        """Returns True if a CDP response describes a downloadable report file."""
+        headers = {k.lower(): v for k, v in response.get("headers", {}).items()}
+        mime_type = (response.get("mimeType") or headers.get("content-type", "")).lower()
+        return response.get("status") == 200 and (
+            mime_type.startswith(self.REPORT_MIME_TYPES) or "attachment" in headers.get("content-disposition", "").lower()
+        )
+
+    def _store_template(self, driver, key, order_id, request_id, request):
+        """Turns a captured CDP request into a replayable template."""
+        body = request.get("postData")
+        if body is None and request.get("hasPostData"):
+            try:
+                body = driver.execute_cdp_cmd("Network.getRequestPostData", {"requestId": request_id}).get("postData")
+            except Exception as e:
+                logger.warning(f"Could not read the captured request body: {e}")
+                return False
+
+        template = {
+            "method": request.get("method", "GET"),
+            "url": request.get("url"),
+            "headers": {
+                name: value for name, value in request.get("headers", {}).items()
+                if name.lower() not in self.SKIPPED_HEADERS
+            },
+            "body": body,
+        }
+
+        template["order_field"] = self._locate_order_field(template, str(order_id))
+        if template["order_field"] is None:
+            logger.info(
+                f"Captured request for {key} does not carry the order ID in exactly one query or form field; not replayable."
+            )
+            return False
+
+        with self._lock:
+            self.templates[key] = template
+        logger.info(f"Captured {template['method']} report request for {key}: {template['url']}")
+        return True
+
+    def _locate_order_field(self, template, order_id):
+        """
+        Finds the one query or form field holding the order ID.
+
+        Returns:
+            tuple | None: ("query" or "body", field index), or None if the ID is not the value of
+                          exactly one field or also appears anywhere else in the request.
+        """
+        url = urlsplit(template["url"] or "")
+        body = template["body"]
+        is_form = any(
+            name.lower() == "content-type" and value.lower().startswith("application/x-www-form-urlencoded")
+            for name, value in template["headers"].items()
+        )
+        parts = {"query": url.query, "body": body if is_form else None}
+
+        fields = [(part, index) for part, text in parts.items() for index in self._order_id_fields(text, order_id)]
+        # Any other mention (path, another field, a non-form body) would still point at the captured order
+        mentions = [unquote(url.path)] + [
+            unquote_plus(field) for text in parts.values() if text for field in text.split("&")
+        ]
+        if body and not is_form:
+            mentions.append(body)
+        if len(fields) != 1 or sum(self._mentions(text, order_id) for text in mentions) != 1:
+            return None
+        return fields[0]
+
+    @staticmethod
+    def _order_id_fields(text, order_id):
+        """Indexes of the form-encoded fields of text whose decoded value is the order ID."""
+        if not text:
+            return []
+        return [
+            index for index, field in enumerate(text.split("&"))
+            if unquote_plus(field.partition("=")[2]) == order_id
+        ]
+
+    @staticmethod
+    def _mentions(text, order_id):
+        """Whether the order ID appears in the text as a whole token, not inside a longer number or word."""
+        return re.search(rf"(?<![0-9A-Za-z]){re.escape(order_id)}(?![0-9A-Za-z])", text or "") is not None
+
+    @staticmethod
+    def _replace_field(text, index, order_id):
+        """Sets the value of one form-encoded field, leaving the other fields byte for byte."""
+        fields = text.split("&")
+        name = fields[index].partition("=")[0]
+        fields[index] = f"{name}={quote_plus(order_id)}"
+        return "&".join(fields)
+
+    def download(self, driver, key, order_id, report_name, download_path):
+        """
+        Replays the captured request for an order and streams the report into download_path.
+
+        Args:
+            driver: The WebDriver whose cookies authenticate the request.
+            key (tuple): The template key returned by template_key.
+            order_id (str): The order to download the report for.
+            report_name (str): Used to name the file when the server does not.
+            download_path (str): The order folder.
+
+        Returns:
+            str | None: The saved file path, or None if the caller should fall back to Selenium.
+        """
+        with self._lock:
+            template = self.templates.get(key)
+        if not template:
+            return None
+
+        url, body = template["url"], template["body"]
+        part, index = template["order_field"]
+        if part == "query":
+            parts = urlsplit(url)
+            url = urlunsplit(parts._replace(query=self._replace_field(parts.query, index, str(order_id))))
+        else:
+            body = self._replace_field(body, index, str(order_id))
+        headers = dict(template["headers"])
+        headers["Cookie"] = "; ".join(f"{c['name']}={c['value']}" for c in driver.get_cookies())
+        headers["User-Agent"] = headers.get("User-Agent") or driver.execute_script("return navigator.userAgent")
+
+        try:
+            response = self.pool.request(
+                template["method"], url,
+                body=body.encode("utf-8") if body is not None else None,
+                headers=headers,
+                preload_content=False,
+                timeout=urllib3.Timeout(connect=10, read=settings.DIRECT_DOWNLOAD_TIMEOUT),
+            )
+        except Exception as e:
+            logger.warning(f"Direct download request failed for order {order_id}: {e}")
+            return None
+
+        try:
+            if response.status != 200:
+                logger.warning(f"Direct download for order {order_id} returned HTTP {response.status}.")
+                return None
+
+            create_directory_if_not_exists(download_path)
+            file_path = os.path.join(download_path, self._file_name(response, order_id, report_name))
+            tmp_path = f"{file_path}.part"
+            size = 0
+            with open(tmp_path, "wb") as fh:
+                for chunk in response.stream(64 * 1024):
+                    if size == 0 and not self._looks_like_report(response, chunk):
+                        logger.warning(f"Direct download for order {order_id} did not return a report file.")
+                        break
+                    fh.write(chunk)
+                    size += len(chunk)
+
+            if size == 0:
+                os.remove(tmp_path)
+                return None
+
+            os.replace(tmp_path, file_path)
+            logger.info(f"Downloaded '{report_name}' for order {order_id} over HTTP ({size} bytes): {file_path}")
+            return file_path
+        finally:
+            response.release_conn()
+
+    def _looks_like_report(self, response, first_chunk):
+        """Rejects HTML error/login pages served with HTTP 200."""
+        content_type = response.headers.get("Content-Type", "").lower()
+        return first_chunk.startswith(b"%PDF") or content_type.startswith(self.REPORT_MIME_TYPES)
+
+    @staticmethod
+    def _file_name(response, order_id, report_name):
+        """Uses the server's Content-Disposition file name, or '<order> - <report>.pdf'."""
+        disposition = response.headers.get("Content-Disposition", "")
+        match = re.search(r"filename\*=UTF-8''([^;]+)", disposition) or re.search(r'filename="?([^";]+)"?', disposition)
+        name = unquote(match.group(1)) if match else f"{order_id} - {report_name}.pdf"
+        return re.sub(r'[<>:"/\\|?*]', "_", name).strip()
+
+
+direct_downloader = DirectReportDownloader()
@@ -0,0 +1,325 @@
+import json
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+import urllib3
+
+from automation.config.settings import settings
+from automation.utilities.logger import logger
+
+# CDP event streaming needs trio, which selenium installs for its devtools support
+try:
+    import trio
+    from selenium.webdriver.common.bidi import cdp
+    CDP_AVAILABLE = True
+except Exception:
+    CDP_AVAILABLE = False
+
+
+class TrackedDownload:
+    """A download the workflow is waiting for, resolved through its future."""
+
+    def __init__(self, order_id, report_name):
+        self.order_id = order_id
+        self.report_name = report_name
+        self.guid = None
+        self.file_name = None
+        self.created_at = time.perf_counter()
+        self.started_at = None
+        self.begun = threading.Event()
+        self.future = Future()
+
+    def to_record(self, state, received_bytes, total_bytes):
+        """Builds the record the future resolves with."""
+        finished_at = time.perf_counter()
+        return {
+            "order_id": self.order_id,
+            "report_name": self.report_name,
+            "guid": self.guid,
+            "file_name": self.file_name,
+            "state": state,
+            "received_bytes": int(received_bytes),
+            "total_bytes": int(total_bytes),
+            "duration": finished_at - (self.started_at or self.created_at),
+            "latency": finished_at - self.created_at,
+        }
+
+
+class DownloadTracker:
+    """
+    Tracks browser downloads through the CDP Browser.downloadWillBegin and
+    Browser.downloadProgress events instead of polling the download folder.
+
+    The tracker keeps its own DevTools connection (on a background trio thread) and owns
+    the browser's download behavior, so the download folder is set through it. Every
+    download the workflow expects is registered with expect(); a download that begins is
+    bound to the expected download whose order ID its file name or URL contains, or else
+    to the oldest one, and its future resolves when Chrome reports it as completed or
+    canceled, together with the byte counts and durations.
+
+    An expected download that never began in time leaves a tombstone: the next download
+    that matches no expected one by order ID is taken to be that late download and is
+    ignored instead of being credited to another order. Tombstones expire after
+    settings.DOWNLOAD_TIMEOUT seconds.
+    """
+
+    def __init__(self, driver):
+        """
+        Initializes the DownloadTracker.
+
+        Args:
+            driver: The Selenium WebDriver instance whose downloads are tracked.
+        """
+        self.driver = driver
+        self.available = False
+        self.records = []
+        self._pending = deque()
+        self._tombstones = deque()
+        self._by_guid = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+        self._token = None
+        self._conn = None
+        self._devtools = None
+        self._stop_event = None
+        self._download_path = None
+
+    def start(self, download_path=None, timeout=10):
+        """
+        Opens the DevTools connection and starts listening for download events.
+
+        Returns:
+            bool: True if event tracking is active; False means callers should fall back.
+        """
+        if not CDP_AVAILABLE:
+            logger.warning("trio/CDP support is not installed; download events are not tracked.")
+            return False
+
+        self._download_path = download_path or settings.DOWNLOAD_PATH
+        self._thread = threading.Thread(target=self._run, name="download-tracker", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        if self.available:
+            logger.info("Download tracker listening for CDP download events.")
+        return self.available
+
+    def stop(self):
+        """Closes the DevTools connection and fails any download still pending."""
+        if self.available and self._token:
+            try:
+                trio.from_thread.run_sync(self._stop_event.set, trio_token=self._token)
+            except Exception:
+                pass
+            self._thread.join(timeout=5)
+        self.available = False
+
+        with self._lock:
+            leftovers = list(self._pending) + list(self._by_guid.values())
+            self._pending.clear()
+            self._by_guid.clear()
+            self._tombstones.clear()
+        for download in leftovers:
+            if not download.future.done():
+                download.future.set_result(download.to_record("canceled", 0, 0))
+
+    def set_download_path(self, download_path):
+        """
+        Points browser downloads at a folder, keeping download events enabled.
+
+        Returns:
+            bool: True if applied through the tracker.
+        """
+        if not self.available:
+            return False
+        try:
+            trio.from_thread.run(self._apply_download_path, download_path, trio_token=self._token)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not set download path through the tracker: {e}")
+            return False
+
+    def expect(self, order_id, report_name):
+        """
+        Registers the next download as belonging to (order_id, report_name).
+
+        Returns:
+            TrackedDownload | None: The tracked download, or None when tracking is unavailable.
+        """
+        if not self.available:
+            return None
+        download = TrackedDownload(order_id, report_name)
+        with self._lock:
+            self._pending.append(download)
+        return download
+
+    def discard(self, download):
+        """Drops an expected download that was never triggered, so it cannot claim a later one."""
+        with self._lock:
+            try:
+                self._pending.remove(download)
+            except ValueError:
+                pass
+
+    def wait(self, download, begin_timeout=None, timeout=None):
+        """
+        Waits for an expected download to begin and then to finish.
+
+        Args:
+            download (TrackedDownload): Returned by expect().
+            begin_timeout (float, optional): How long to wait for Chrome to start the download.
+            timeout (float, optional): How long to wait for it to finish once started.
+
+        Returns:
+            dict | None: The download record, or None if it never started or did not finish in time.
+        """
+        begin_timeout = settings.DOWNLOAD_BEGIN_TIMEOUT if begin_timeout is None else begin_timeout
+        timeout = settings.DOWNLOAD_TIMEOUT if timeout is None else timeout
+
+        if not download.begun.wait(begin_timeout):
+            self._expire(download)
+            logger.warning(f"No download started for order {download.order_id}, report '{download.report_name}'.")
+            return None
+
+        try:
+            return download.future.result(timeout)
+        except FutureTimeoutError:
+            logger.warning(f"Download {download.guid} for order {download.order_id} did not finish within {timeout}s.")
+            return None
+
+    def _expire(self, download):
+        """Drops an expected download that did not begin in time and leaves a tombstone for it."""
+        with self._lock:
+            try:
+                self._pending.remove(download)
+            except ValueError:
+                return
+            self._tombstones.append((download.order_id, time.perf_counter() + settings.DOWNLOAD_TIMEOUT))
+
+    def summary(self):
+        """
+        Returns totals over all finished downloads.
+
+        Returns:
+            dict: count, completed, canceled, bytes and total download seconds.
+        """
+        with self._lock:
+            records = list(self.records)
+        completed = [r for r in records if r["state"] == "completed"]
+        return {
+            "count": len(records),
+            "completed": len(completed),
+            "canceled": len(records) - len(completed),
+            "bytes": sum(r["received_bytes"] for r in completed),
+            "seconds": sum(r["duration"] for r in completed),
+        }
+
+    # --- DevTools side (runs on the tracker thread) ---
+
+    def _cdp_endpoint(self):
+        """Returns the browser-level DevTools websocket URL and the Chrome major version."""
+        debugger_address = self.driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        response = urllib3.PoolManager().request("GET", f"http://{debugger_address}/json/version")
+        data = json.loads(response.data)
+        version = re.search(r"/(\d+)\.", data["Browser"]).group(1)
+        return data["webSocketDebuggerUrl"], version
+
+    def _run(self):
+        try:
+            trio.run(self._serve)
+        except Exception as e:
+            logger.warning(f"Download tracker stopped: {e}")
+        finally:
+            self.available = False
+            self._ready.set()
+
+    async def _serve(self):
+        ws_url, version = self._cdp_endpoint()
+        self._devtools = cdp.import_devtools(version)
+        async with cdp.open_cdp(ws_url) as conn:
+            self._conn = conn
+            self._token = trio.lowlevel.current_trio_token()
+            self._stop_event = trio.Event()
+            await self._apply_download_path(self._download_path)
+            self.available = True
+            self._ready.set()
+
+            async with trio.open_nursery() as nursery:
+                nursery.start_soon(self._consume)
+                await self._stop_event.wait()
+                nursery.cancel_scope.cancel()
+
+    async def _apply_download_path(self, download_path):
+        # Browser-level download behavior; events are delivered to this connection only
+        await self._conn.execute(self._devtools.browser.set_download_behavior(
+            behavior="allow", download_path=download_path, events_enabled=True
+        ))
+        self._download_path = download_path
+
+    async def _consume(self):
+        browser = self._devtools.browser
+        events = self._conn.listen(browser.DownloadWillBegin, browser.DownloadProgress, buffer_size=100)
+        async for event in events:
+            if isinstance(event, browser.DownloadWillBegin):
+                self._on_begin(event)
+            else:
+                self._on_progress(event)
+
+    @staticmethod
+    def _names_order(text, order_id):
+        """Whether the order ID appears in the text as a whole token, not inside a longer number or word."""
+        return re.search(rf"(?<![0-9A-Za-z]){re.escape(str(order_id))}(?![0-9A-Za-z])", text) is not None
+
+    def _claim(self, event):
+        """Picks the expected download a starting download belongs to, or None (lock held)."""
+        names = f"{event.suggested_filename} {event.url}"
+        for download in self._pending:
+            if self._names_order(names, download.order_id):
+                self._pending.remove(download)
+                return download
+
+        now = time.perf_counter()
+        self._tombstones = deque(tombstone for tombstone in self._tombstones if tombstone[1] > now)
+        if self._tombstones:
+            late = next((t for t in self._tombstones if self._names_order(names, t[0])), self._tombstones[0])
+            self._tombstones.remove(late)
+            logger.warning(
+                f"Download {event.guid} ({event.suggested_filename}) started after the wait for order "
+                f"{late[0]} timed out; it is not tracked."
+            )
+            return None
+
+        if not self._pending:
+            logger.warning(f"Untracked download started: {event.suggested_filename}")
+            return None
+        return self._pending.popleft()
+
+    def _on_begin(self, event):
+        with self._lock:
+            download = self._claim(event)
+            if download is None:
+                return
+            download.guid = event.guid
+            download.file_name = event.suggested_filename
+            download.started_at = time.perf_counter()
+            self._by_guid[event.guid] = download
+        download.begun.set()
+        logger.info(f"Download {event.guid} started for order {download.order_id}: {event.suggested_filename}")
+
+    def _on_progress(self, event):
+        if event.state not in ("completed", "canceled"):
+            return
+        with self._lock:
+            download = self._by_guid.pop(event.guid, None)
+            if download is None:
+                return
+            record = download.to_record(event.state, event.received_bytes, event.total_bytes)
+            self.records.append(record)
+        download.future.set_result(record)
+        logger.info(
+            f"Download {event.guid} {event.state} for order {download.order_id} "
+            f"({record['received_bytes']} bytes in {record['duration']:.2f}s)."
+        )
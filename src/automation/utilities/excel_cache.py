@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+from automation.config.settings import settings
+from automation.utilities.logger import logger
+from automation.utilities.file_manager import create_directory_if_not_exists
+
+# Feather (Arrow IPC) is the fastest format to load; pickle is used when pyarrow is not installed
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+class WorkbookCache:
+    """
+    Caches parsed, column-mapped sheets on disk so warm starts skip XLSX parsing.
+
+    An entry is keyed by the workbook's absolute path, mtime, size and content hash,
+    the sheet name and the active column mapping, so editing the workbook or changing
+    the mapping misses the cache automatically. Entries are stored as Feather files when
+    pyarrow is installed (pickle otherwise); entries cached from an earlier version of
+    the same sheet are dropped when a new one is written, and the least recently used entries are evicted
+    once the cache grows past settings.EXCEL_CACHE_MAX_BYTES.
+    """
+
+    CACHE_VERSION = 1
+
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        """
+        Initializes the WorkbookCache.
+
+        Args:
+            cache_dir (str, optional): Where entries are stored. Defaults to settings.EXCEL_CACHE_DIR.
+            max_bytes (int, optional): Size bound of the cache. Defaults to settings.EXCEL_CACHE_MAX_BYTES.
+        """
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Content hashes by (path, mtime, size), so a workbook is hashed once per process
+        self._hashes = {}
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir or settings.EXCEL_CACHE_DIR
+
+    @property
+    def max_bytes(self):
+        return settings.EXCEL_CACHE_MAX_BYTES if self._max_bytes is None else self._max_bytes
+
+    @property
+    def enabled(self):
+        """Whether the cache is switched on in the settings."""
+        return settings.EXCEL_CACHE
+
+    def load(self, file_path, sheet_name, columns):
+        """
+        Returns the cached sheet for the workbook, sheet and column mapping, or None on a miss.
+
+        Args:
+            file_path (str): The workbook path.
+            sheet_name (str | None): The sheet the frame was read from.
+            columns (list | None): The mapped columns; None for an unmapped sheet.
+
+        Returns:
+            pd.DataFrame | None: The cached frame.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            path = self._entry_path(file_path, sheet_name, columns)
+        except OSError:
+            return None
+
+        for entry_path in (path, self._fallback_path(path)):
+            if not os.path.exists(entry_path):
+                continue
+            try:
+                df = self._read(entry_path)
+            except Exception as e:
+                logger.warning(f"Dropping unreadable workbook cache entry {entry_path}: {e}")
+                self._remove(entry_path)
+                continue
+
+            # Touch the entry so eviction treats it as recently used
+            os.utime(entry_path)
+            logger.info(f"Loaded {len(df)} rows for {file_path}, Sheet: {sheet_name} from the workbook cache.")
+            return df
+        return None
+
+    def store(self, file_path, sheet_name, columns, df):
+        """
+        Writes a parsed sheet to the cache, replacing entries from earlier versions of the workbook.
+
+        Returns:
+            bool: True if the entry was written.
+        """
+        if not self.enabled or df is None:
+            return False
+
+        try:
+            path = self._entry_path(file_path, sheet_name, columns)
+        except OSError:
+            return False
+
+        create_directory_if_not_exists(self.cache_dir)
+        with self._lock:
+            self._remove_stale(path)
+            try:
+                path = self._write(path, df)
+            except Exception as e:
+                logger.warning(f"Could not write the workbook cache for {file_path}: {e}")
+                return False
+            self._evict()
+
+        logger.info(f"Cached {len(df)} rows for {file_path}, Sheet: {sheet_name}: {path}")
+        return True
+
+    def clear(self):
+        """Removes every cache entry."""
+        with self._lock:
+            for entry_path, _, _ in self._entries():
+                self._remove(entry_path)
+
+    # --- Keys and files ---
+
+    def fingerprint(self, file_path, sheet_name, columns):
+        """
+        Returns (entry id, version key) for a workbook, sheet and column mapping.
+
+        The entry id covers the path, sheet and mapping, so every version of one sheet shares
+        it; the version key covers the workbook's mtime, size and content hash.
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+
+        entry_id = json.dumps({
+            "version": self.CACHE_VERSION,
+            "path": file_path,
+            "sheet": sheet_name,
+            "columns": list(columns) if columns is not None else None,
+        }, sort_keys=True)
+        version_key = json.dumps({
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": self._content_hash(file_path, stat),
+        }, sort_keys=True)
+
+        return (
+            hashlib.sha256(entry_id.encode("utf-8")).hexdigest()[:16],
+            hashlib.sha256(version_key.encode("utf-8")).hexdigest()[:32],
+        )
+
+    def _content_hash(self, file_path, stat):
+        memo_key = (file_path, stat.st_mtime_ns, stat.st_size)
+        if memo_key in self._hashes:
+            return self._hashes[memo_key]
+
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as fh:
+            for block in iter(lambda: fh.read(self.HASH_CHUNK_SIZE), b""):
+                digest.update(block)
+        self._hashes[memo_key] = digest.hexdigest()
+        return self._hashes[memo_key]
+
+    def _entry_path(self, file_path, sheet_name, columns):
+        entry_id, version_key = self.fingerprint(file_path, sheet_name, columns)
+        extension = "feather" if PYARROW_AVAILABLE else "pkl"
+        return os.path.join(self.cache_dir, f"{entry_id}-{version_key}.{extension}")
+
+    @staticmethod
+    def _fallback_path(path):
+        """Feather entries that could not be written as Feather are stored as pickle."""
+        return f"{os.path.splitext(path)[0]}.pkl"
+
+    def _read(self, entry_path):
+        if entry_path.endswith(".feather"):
+            return pd.read_feather(entry_path)
+        return pd.read_pickle(entry_path)
+
+    def _write(self, path, df):
+        """Writes atomically; falls back to pickle for frames Arrow cannot represent (e.g. mixed-type columns)."""
+        df = df.reset_index(drop=True)
+        if path.endswith(".feather"):
+            try:
+                self._write_atomic(path, lambda tmp: df.to_feather(tmp))
+                return path
+            except Exception as e:
+                logger.debug(f"Feather cache write failed ({e}); using pickle.")
+                path = self._fallback_path(path)
+        self._write_atomic(path, lambda tmp: df.to_pickle(tmp, compression=None))
+        return path
+
+    @staticmethod
+    def _write_atomic(path, write):
+        tmp_path = f"{path}.tmp"
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _entries(self):
+        """Returns (path, size, last used) for every entry, least recently used first."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith((".feather", ".pkl")):
+                continue
+            entry_path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((entry_path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def _remove_stale(self, path):
+        """Removes entries cached from earlier versions of the same workbook, sheet and mapping."""
+        entry_id = os.path.basename(path).split("-", 1)[0]
+        for entry_path, _, _ in self._entries():
+            if os.path.basename(entry_path).startswith(f"{entry_id}-") and \
+                    os.path.splitext(entry_path)[0] != os.path.splitext(path)[0]:
+                self._remove(entry_path)
+
+    def _evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for entry_path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(entry_path)
+            total -= size
+            logger.info(f"Evicted workbook cache entry: {entry_path}")
+
+    @staticmethod
+    def _remove(entry_path):
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+
+workbook_cache = WorkbookCache()
@@ -1,15 +1,19 @@
+import queue
+import threading
+
 import openpyxl
 import pandas as pd
-from collections import defaultdict
 from automation.config.settings import settings
 from automation.utilities.logger import logger
 from automation.utilities.excel_mapper import ExcelMapper
+from automation.utilities.excel_cache import workbook_cache
 
 
 class ExcelReader:
     """A utility class to read data from Excel files."""
 
     EXCEL_FILE_DATA = None
+    ORDER_INDEX = None
     SHEET_NAME = "Sheet1"
     COLUMNS_MAPPER = ExcelMapper()
 
@@ -19,6 +23,9 @@ class ExcelReader:
         """
         Reads the Excel file and loads the specified sheet into a pandas DataFrame.
 
+        The parsed, column-mapped sheet is served from the workbook cache while the
+        workbook and the column mapping are unchanged.
+
         Args:
             sheet_name (str): The name of the sheet to read from. Defaults to "Sheet1".
 
@@ -33,11 +40,15 @@ class ExcelReader:
             cls.COLUMNS_MAPPER.set_multiple_custom_fields(custom_fields)
 
         try:
-            df = pd.read_excel(settings.EXCEL_FILE_PATH, sheet_name=sheet_name)
             columns = cls.COLUMNS_MAPPER.get_all_fields()
-            df = df[columns]
+            df = workbook_cache.load(settings.EXCEL_FILE_PATH, sheet_name, columns)
+            if df is None:
+                df = pd.read_excel(settings.EXCEL_FILE_PATH, sheet_name=sheet_name)
+                df = df[columns]
+                workbook_cache.store(settings.EXCEL_FILE_PATH, sheet_name, columns, df)
 
             setattr(cls, "EXCEL_FILE_DATA", df)
+            setattr(cls, "ORDER_INDEX", cls.build_order_index(df))
             logger.info(f"Successfully read Excel file: {settings.EXCEL_FILE_PATH}, Sheet: {sheet_name}")
             return df
         except FileNotFoundError:
@@ -50,14 +61,43 @@ class ExcelReader:
             logger.error(f"An error occurred while reading the Excel file: {e}")
             return None
 
+    @classmethod
+    def build_order_index(cls, df):
+        """
+        Groups the sheet rows by Order ID in a single pass.
+
+        Args:
+            df (pd.DataFrame): The column-mapped sheet data.
+
+        Returns:
+            dict: Order IDs mapped to their rows (as dictionaries), both in sheet order.
+                  Rows without an Order ID are left out.
+        """
+        index = {}
+        if cls.COLUMNS_MAPPER.ORDER_ID not in df.columns:
+            return index
+
+        order_ids = df[cls.COLUMNS_MAPPER.ORDER_ID].tolist()
+        for order_id, row in zip(order_ids, df.to_dict(orient="records")):
+            if pd.isna(order_id):
+                continue
+            index.setdefault(order_id, []).append(row)
+        return index
+
+    @classmethod
+    def get_order_index(cls):
+        """Returns the Order ID index, building it if the sheet data was set without one."""
+        if cls.ORDER_INDEX is None and cls.EXCEL_FILE_DATA is not None:
+            cls.ORDER_INDEX = cls.build_order_index(cls.EXCEL_FILE_DATA)
+        return cls.ORDER_INDEX
+
     @classmethod
     def get_orders_from_excel(cls):
         """
         Reads orders and their associated reports from the specified Excel sheet.
 
-        This function reads the Excel file and groups the reports by the 'Order ID' column.
-        It returns a dictionary where the keys are the Order IDs and the values are a list
-        of reports to be downloaded for that order.
+        The orders come from the Order ID index built by read_excel_file(), in the order
+        they first appear in the sheet.
 
         Args:
             sheet_name (str): The name of the sheet to read from. Defaults to "Sheet1".
@@ -71,32 +111,22 @@ class ExcelReader:
             PAGE = "PAGE"
 
         Returns:
-            defaultdict: A dictionary with Order IDs as keys and a list of report dictionaries as values.
+            list: The unique, non-null Order IDs in sheet order.
         """
 
         try:
             if cls.EXCEL_FILE_DATA is None:
                 logger.warning("Excel file data is not loaded. Please call read_excel_file() first.")
-                return defaultdict(list)
+                return []
 
-            # Extract unique, non-null order IDs
-            if cls.COLUMNS_MAPPER.ORDER_ID in cls.EXCEL_FILE_DATA.columns:
-                orders = set(cls.EXCEL_FILE_DATA[cls.COLUMNS_MAPPER.ORDER_ID].dropna().unique())
-            else:
-                orders = set()
+            orders = list(cls.get_order_index())
 
             logger.info(f"Successfully read {len(orders)} orders from sheet: {cls.SHEET_NAME}")
             return orders
 
-        except FileNotFoundError:
-            logger.error(f"Excel file not found at path: {settings.EXCEL_FILE_PATH}")
-            return set()
-        except KeyError:
-            logger.error(f"Sheet '{cls.SHEET_NAME}' not found in the Excel file.")
-            return set()
         except Exception as e:
             logger.error(f"An error occurred while reading the Excel file: {e}")
-            return set()
+            return []
 
     @classmethod
     def get_order_data_from_excel(cls, sheet_name="Sheet1", order_id=None, custom_fields=None):
@@ -122,15 +152,10 @@ class ExcelReader:
             return {}
         
         try:
-            # Filter rows by Order ID
-            filtered_data = cls.EXCEL_FILE_DATA[
-                cls.EXCEL_FILE_DATA[cls.COLUMNS_MAPPER.ORDER_ID] == order_id
-            ]
-
-            # Convert filtered DataFrame to list of dictionaries
-            order_data = filtered_data.to_dict(orient='records')
+            # O(1) lookup in the index built when the sheet was read
+            order_data = list(cls.get_order_index().get(order_id, []))
 
-            logger.info(f"Successfully fetched data for Order ID: {order_id} from sheet: {sheet_name}")
+            logger.debug("Successfully fetched data for Order ID: %s from sheet: %s", order_id, sheet_name)
             return order_data
 
         except Exception as e:
@@ -138,4 +163,172 @@ class ExcelReader:
             return {}
 
 
-excel_reader = ExcelReader()
\ No newline at end of file
+excel_reader = ExcelReader()
+
+class ExcelStreamReader:
+    """
+    Streams report rows from a large workbook without loading the whole sheet.
+
+    The sheet is parsed with openpyxl in read-only mode on a background thread that fills
+    a bounded queue of row chunks, so consumers can start on the first orders while the
+    rest of the file is still being parsed, and memory stays flat whatever the file size.
+    The sheet must be grouped by Order ID (every order's rows next to each other), so an
+    order is complete as soon as the next one starts; iter_orders() checks this.
+    Columns are located through the ExcelMapper header names, so custom field mappings
+    apply exactly as they do for ExcelReader.
+    """
+
+    # Chunks parsed ahead of the consumer before the parser thread blocks
+    MAX_PENDING_CHUNKS = 4
+
+    _DONE = object()
+
+    def __init__(self, file_path=None, sheet_name="Sheet1", chunk_size=None, columns_mapper=None):
+        """
+        Initializes the ExcelStreamReader.
+
+        Args:
+            file_path (str, optional): The workbook to read. Defaults to settings.EXCEL_FILE_PATH.
+            sheet_name (str): The sheet to read. Defaults to "Sheet1".
+            chunk_size (int, optional): Rows per chunk. Defaults to settings.EXCEL_CHUNK_SIZE.
+            columns_mapper (ExcelMapper, optional): Defaults to ExcelReader.COLUMNS_MAPPER.
+        """
+        self.file_path = file_path or settings.EXCEL_FILE_PATH
+        self.sheet_name = sheet_name
+        self.chunk_size = max(1, int(chunk_size or settings.EXCEL_CHUNK_SIZE))
+        self.columns_mapper = columns_mapper or ExcelReader.COLUMNS_MAPPER
+        self.rows_read = 0
+        self.rows_skipped = 0
+
+    def iter_chunks(self):
+        """
+        Yields lists of validated row dictionaries, keyed by the mapped column names.
+
+        Rows without an Order ID are skipped. Parsing errors are logged and end the stream.
+        """
+        chunks = queue.Queue(maxsize=self.MAX_PENDING_CHUNKS)
+        stop = threading.Event()
+        thread = threading.Thread(target=self._produce, args=(chunks, stop), name="excel-stream", daemon=True)
+        thread.start()
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is self._DONE:
+                    break
+                yield chunk
+        finally:
+            # Unblock the parser if the consumer stopped early
+            stop.set()
+            while thread.is_alive():
+                try:
+                    chunks.get_nowait()
+                except queue.Empty:
+                    thread.join(0.05)
+
+    def iter_rows(self):
+        """Yields validated row dictionaries one at a time."""
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def iter_orders(self):
+        """
+        Yields (order_id, rows) for every order, as soon as the next order's first row is read.
+
+        The sheet must be grouped by Order ID. An order whose rows appear again after another
+        order would be yielded as two partial orders, so the stream is ended with an error
+        there instead; sort the sheet by Order ID or turn settings.EXCEL_STREAMING off.
+        """
+        seen = set()
+        order_id, rows = None, []
+        for row in self.iter_rows():
+            row_order_id = row[self.columns_mapper.ORDER_ID]
+            if rows and row_order_id != order_id:
+                yield order_id, rows
+                seen.add(order_id)
+                rows = []
+            if row_order_id in seen:
+                logger.error(
+                    f"Order ID '{row_order_id}' appears again after other orders in sheet '{self.sheet_name}'; "
+                    f"streaming needs the sheet grouped by Order ID. The stream stops here."
+                )
+                return
+            order_id = row_order_id
+            rows.append(row)
+        if rows:
+            yield order_id, rows
+
+    def _produce(self, chunks, stop):
+        """Parses the sheet and puts row chunks on the queue (runs on the parser thread)."""
+        workbook = None
+        try:
+            workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+            if self.sheet_name not in workbook.sheetnames:
+                logger.error(f"Sheet '{self.sheet_name}' not found in the Excel file.")
+                return
+
+            rows = workbook[self.sheet_name].iter_rows(values_only=True)
+            positions = self._column_positions(next(rows, ()))
+            if positions is None:
+                return
+
+            order_position = positions[self.columns_mapper.ORDER_ID]
+            chunk = []
+            for values in rows:
+                if stop.is_set():
+                    return
+                self.rows_read += 1
+                if order_position >= len(values) or self._is_blank(values[order_position]):
+                    self.rows_skipped += 1
+                    continue
+                chunk.append({
+                    column: values[position] if position < len(values) else None
+                    for column, position in positions.items()
+                })
+                if len(chunk) >= self.chunk_size:
+                    self._put(chunks, chunk, stop)
+                    chunk = []
+            if chunk:
+                self._put(chunks, chunk, stop)
+
+            logger.info(
+                f"Streamed {self.rows_read} rows from {self.file_path}, Sheet: {self.sheet_name} "
+                f"({self.rows_skipped} without an Order ID skipped)."
+            )
+        except FileNotFoundError:
+            logger.error(f"Excel file not found at path: {self.file_path}")
+        except Exception as e:
+            logger.error(f"An error occurred while streaming the Excel file: {e}")
+        finally:
+            if workbook is not None:
+                workbook.close()
+            self._put(chunks, self._DONE, stop)
+
+    def _column_positions(self, header):
+        """Maps every ExcelMapper column to its position in the header row, or None if one is missing."""
+        header = [str(value).strip() if value is not None else None for value in header]
+        positions = {}
+        missing = []
+        for column in self.columns_mapper.get_all_fields():
+            if column in header:
+                positions[column] = header.index(column)
+            else:
+                missing.append(column)
+
+        if missing:
+            logger.error(f"Columns {missing} not found in sheet '{self.sheet_name}' of {self.file_path}.")
+            return None
+        return positions
+
+    @staticmethod
+    def _put(chunks, item, stop):
+        """Blocks until the consumer takes the item, unless the stream was stopped."""
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    @staticmethod
+    def _is_blank(value):
+        return value is None or (isinstance(value, str) and not value.strip())
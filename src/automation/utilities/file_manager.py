@@ -18,10 +18,24 @@ def move_file(source_path, destination_path):
     except Exception as e:
         logger.error(f"An error occurred while moving the file: {e}")
 
+def get_files_in_directory(directory_path):
+    """
+    Returns the paths of the regular files in a directory, sorted by name.
+
+    Partial downloads (.crdownload / .tmp) are left out.
+    """
+    if not os.path.isdir(directory_path):
+        logger.error(f"Directory not found at path: {directory_path}")
+        return []
+    return sorted(
+        os.path.join(directory_path, name) for name in os.listdir(directory_path)
+        if os.path.isfile(os.path.join(directory_path, name)) and not name.endswith((".crdownload", ".tmp"))
+    )
+
 def check_if_folder_exists(folder_path):
     """Checks if a folder exists at the given path."""
     exists = os.path.exists(folder_path) and os.path.isdir(folder_path)
-    logger.info(f"Folder exists at {folder_path}: {exists}")
+    logger.debug("Folder exists at %s: %s", folder_path, exists)
     return exists
 
 def remove_directory(directory_path):
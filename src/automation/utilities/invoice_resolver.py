@@ -0,0 +1,203 @@
+import html
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urljoin
+
+import urllib3
+
+from automation.config.settings import settings
+from automation.config.locators import TransactionalPageLoaders
+from automation.utilities.logger import logger
+from automation.utilities.file_manager import create_directory_if_not_exists
+
+
+class InvoiceResolver:
+    """
+    Finds the sales order page an order's invoices live on without opening windows.
+
+    The sales order page of an order is resolved, in order, from:
+    - the on-disk cache (settings.INVOICE_CACHE_PATH), for orders resolved within
+      settings.INVOICE_CACHE_TTL_HOURS;
+    - the links of the order's row in the settlement grid: a sales order link is used as
+      is, an order page link (or settings.ORDER_DETAIL_URL_TEMPLATE filled with the row's id)
+      is fetched over HTTP with the browser's cookies and its linked sales order read from
+      the HTML.
+    When neither works, callers fall back to opening the order from the grid and record the
+    result with put(), so repeat runs go straight to the sales order page.
+    """
+
+    SALES_ORDER_PAGE = "SalesOrder.aspx"
+    ORDER_DETAIL_PAGE = "RecyclingOrder.aspx"
+
+    # Returns the jqGrid row id and the link targets of the grid row showing the order
+    ROW_LINKS_SCRIPT = """
+        const cell = document.querySelector(`td[title="${CSS.escape(arguments[0])}"]`);
+        const row = cell && cell.closest('tr');
+        if (!row) return null;
+        const links = Array.from(row.querySelectorAll('a[href]'))
+            .map(a => a.href)
+            .filter(href => href && !href.startsWith('javascript:') && !href.endsWith('#'));
+        return {row_id: row.id, links: links};
+    """
+
+    LINKED_SALES_ORDER_TAG = re.compile(
+        r"<a\b[^>]*\bid=[\"']" + re.escape(TransactionalPageLoaders.SALES_ORDER_HISTORY[1]) + r"[\"'][^>]*>",
+        re.IGNORECASE,
+    )
+    HREF_ATTRIBUTE = re.compile(r"\bhref=[\"']([^\"']+)[\"']", re.IGNORECASE)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = None
+        self._pool = None
+
+    @property
+    def enabled(self):
+        return settings.INVOICE_CACHE
+
+    # --- Cache ---
+
+    def get(self, order_id):
+        """
+        Returns the cached sales order page of an order.
+
+        Returns:
+            str | None: The URL, or None if it is not cached or older than the TTL.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._load().get(str(order_id))
+        if not entry:
+            return None
+
+        age_hours = (time.time() - entry.get("resolved_at", 0)) / 3600
+        if age_hours > settings.INVOICE_CACHE_TTL_HOURS:
+            return None
+        return entry.get("url")
+
+    def put(self, order_id, url):
+        """Caches the sales order page of an order."""
+        if not self.enabled or not url:
+            return
+        with self._lock:
+            self._load()[str(order_id)] = {"url": url, "resolved_at": time.time()}
+            self._save()
+
+    def discard(self, order_id):
+        """Drops an order from the cache, e.g. when its cached page no longer loads."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._load().pop(str(order_id), None) is not None:
+                self._save()
+
+    # --- Resolution ---
+
+    def resolve_from_grid(self, driver, order_id):
+        """
+        Derives the sales order page of an order from its row in the current grid.
+
+        Args:
+            driver: The WebDriver showing the grid, whose cookies authenticate the HTTP fetch.
+            order_id (str): The order.
+
+        Returns:
+            str | None: The URL, or None if the row does not lead to it.
+        """
+        row = driver.execute_script(self.ROW_LINKS_SCRIPT, str(order_id))
+        if not row:
+            return None
+
+        links = row.get("links") or []
+        for link in links:
+            if self.SALES_ORDER_PAGE.lower() in link.lower():
+                return link
+
+        detail_url = next((link for link in links if self.ORDER_DETAIL_PAGE.lower() in link.lower()), None)
+        if detail_url is None and settings.ORDER_DETAIL_URL_TEMPLATE and row.get("row_id"):
+            detail_url = settings.make_url(
+                settings.ORDER_DETAIL_URL_TEMPLATE.format(row_id=row["row_id"], order_id=order_id)
+            )
+        if detail_url is None:
+            return None
+        return self.fetch_sales_order_url(driver, detail_url)
+
+    def fetch_sales_order_url(self, driver, detail_url):
+        """
+        Reads the linked sales order of an order page over HTTP.
+
+        Args:
+            driver: The WebDriver whose cookies authenticate the request.
+            detail_url (str): The order page.
+
+        Returns:
+            str | None: The absolute sales order URL, or None if the page has no such link.
+        """
+        headers = {
+            "Cookie": "; ".join(f"{c['name']}={c['value']}" for c in driver.get_cookies()),
+            "User-Agent": driver.execute_script("return navigator.userAgent"),
+        }
+        try:
+            response = self.pool.request("GET", detail_url, headers=headers, timeout=urllib3.Timeout(connect=10, read=30))
+        except Exception as e:
+            logger.warning(f"Could not fetch order page {detail_url}: {e}")
+            return None
+        if response.status != 200:
+            logger.warning(f"Order page {detail_url} returned HTTP {response.status}.")
+            return None
+
+        tag = self.LINKED_SALES_ORDER_TAG.search(response.data.decode("utf-8", errors="replace"))
+        href = self.HREF_ATTRIBUTE.search(tag.group(0)) if tag else None
+        if not href:
+            logger.debug("Order page %s has no linked sales order.", detail_url)
+            return None
+        return urljoin(detail_url, html.unescape(href.group(1)))
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = urllib3.PoolManager(maxsize=4)
+        return self._pool
+
+    # --- Internals ---
+
+    def _load(self):
+        """Returns the cache entries of the current base URL, reading the file once."""
+        if self._entries is None:
+            try:
+                with open(settings.INVOICE_CACHE_PATH, "r", encoding="utf-8") as fh:
+                    data = json.load(fh)
+            except (FileNotFoundError, ValueError):
+                data = {}
+            entries = data.get(str(settings.BASE_URL)) if isinstance(data, dict) else None
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def _save(self):
+        """Writes the cache, keeping the entries of other base URLs."""
+        try:
+            try:
+                with open(settings.INVOICE_CACHE_PATH, "r", encoding="utf-8") as fh:
+                    data = json.load(fh)
+            except (FileNotFoundError, ValueError):
+                data = {}
+            if not isinstance(data, dict):
+                data = {}
+            data[str(settings.BASE_URL)] = self._entries
+
+            create_directory_if_not_exists(os.path.dirname(settings.INVOICE_CACHE_PATH))
+            tmp_path = f"{settings.INVOICE_CACHE_PATH}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(tmp_path, settings.INVOICE_CACHE_PATH)
+        except OSError as e:
+            logger.warning(f"Could not save the invoice cache: {e}")
+
+
+invoice_resolver = InvoiceResolver()
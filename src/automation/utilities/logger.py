@@ -1,9 +1,98 @@
+import atexit
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from automation.config.settings import settings
 
+LOG_FORMAT = "%(asctime)s - %(threadName)s - %(funcName)s:%(lineno)d - %(name)s - %(levelname)s - %(message)s"
+
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "module": getattr(record, "module_path", record.module),
+            "func": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class ModuleLevelFilter(logging.Filter):
+    """
+    Applies per-module levels to the shared automation logger.
+
+    Levels are matched against the dotted module path of the call site (for example
+    "automation.utilities.save_download_state"), the most specific prefix wins, and
+    modules without an entry use the default level.
+    """
+
+    def __init__(self, default_level, module_levels):
+        super().__init__()
+        self.default_level = default_level
+        self.module_levels = sorted(module_levels.items(), key=lambda item: -len(item[0]))
+        self._cache = {}
+
+    def filter(self, record):
+        module_path = self._cache.get(record.pathname)
+        if module_path is None:
+            module_path = self._cache[record.pathname] = self.module_path(record.pathname)
+        record.module_path = module_path
+        return record.levelno >= self.level_for(module_path)
+
+    def level_for(self, module_path):
+        for prefix, level in self.module_levels:
+            if module_path == prefix or module_path.startswith(f"{prefix}.") or module_path.endswith(f".{prefix}"):
+                return level
+        return self.default_level
+
+    @staticmethod
+    def module_path(pathname):
+        """Turns a source file path into a dotted module path relative to src/."""
+        path = os.path.splitext(os.path.abspath(pathname))[0]
+        if path.startswith(SOURCE_ROOT + os.sep):
+            path = path[len(SOURCE_ROOT) + 1:]
+        else:
+            path = os.path.basename(path)
+        return path.replace(os.sep, ".")
+
+
+def _level(name):
+    level = logging.getLevelName(str(name).upper())
+    return level if isinstance(level, int) else logging.DEBUG
+
+
+def _build_handlers():
+    """Creates the file handlers that do the actual I/O."""
+    handler = RotatingFileHandler(
+        settings.LOG_FILE_PATH, maxBytes=20 * 1024 * 1024, backupCount=5  # 20 MB per file, 5 backup files
+    )
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handlers = [handler]
+
+    if settings.LOG_JSON:
+        json_dir = os.path.dirname(settings.LOG_JSON_PATH)
+        if not os.path.exists(json_dir):
+            os.makedirs(json_dir)
+        json_handler = RotatingFileHandler(settings.LOG_JSON_PATH, maxBytes=20 * 1024 * 1024, backupCount=5)
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+
+    return handlers
+
 
 def setup_logger():
     # Ensure the directory for the log file exists
@@ -13,22 +102,28 @@ def setup_logger():
 
     # Create a logger
     logger = logging.getLogger("automation_logger")
-    logger.setLevel(logging.DEBUG)
-
-    # Create a rotating file handler
-    handler = RotatingFileHandler(
-        settings.LOG_FILE_PATH, maxBytes=20 * 1024 * 1024, backupCount=5  # 20 MB per file, 5 backup files
-    )
+    if logger.handlers:
+        return logger
 
-    # Create a formatter and set it for the handler
-    formatter = logging.Formatter(
-        "%(asctime)s - %(funcName)s:%(lineno)d - %(name)s - %(levelname)s - %(message)s"
-    )
-    handler.setFormatter(formatter)
+    default_level = _level(settings.LOG_LEVEL)
+    module_levels = {module: _level(level) for module, level in settings.LOG_LEVELS.items()}
+    # The logger level is the lowest level anything asks for, so disabled calls return before building a record
+    logger.setLevel(min([default_level, *module_levels.values()]))
+    if module_levels:
+        logger.addFilter(ModuleLevelFilter(default_level, module_levels))
 
-    # Add the handler to the logger
-    if not logger.handlers:
-        logger.addHandler(handler)
+    handlers = _build_handlers()
+    if settings.LOG_ASYNC:
+        # Call sites only enqueue the record; a background listener thread does the file I/O
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(QueueHandler(log_queue))
+        logger.listener = listener
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
     return logger
 
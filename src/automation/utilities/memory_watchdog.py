@@ -0,0 +1,209 @@
+import csv
+import os
+import threading
+import time
+
+from automation.config.settings import settings
+from automation.utilities.logger import logger
+from automation.utilities.file_manager import create_directory_if_not_exists
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+class MemoryWatchdog:
+    """
+    Watches the memory of one browser session and decides when it should be recycled.
+
+    A sample records the resident memory of the chromedriver process and everything it
+    started (Chrome and its renderers), the number of open windows and the JS heap of the
+    current page. Samples are taken at most every settings.MEMORY_SAMPLE_INTERVAL seconds,
+    at the order boundaries where the workflow calls check(); when a sample exceeds one of
+    the MEMORY_MAX_* thresholds, check() returns the reason and the workflow restarts the
+    session. Samples and recycle events are appended to settings.MEMORY_LOG_PATH as CSV.
+
+    The process tree is read with psutil when it is installed and from /proc otherwise;
+    on other systems without psutil only the window count and JS heap are watched.
+    """
+
+    FIELDS = ["time", "session", "event", "orders", "rss_mb", "processes", "windows", "js_heap_mb", "reason", "seconds"]
+
+    JS_HEAP_SCRIPT = "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+
+    # The CSV file is shared by every session and kept across runs, so resumed runs add to it
+    _log_lock = threading.Lock()
+
+    def __init__(self, name="main"):
+        """
+        Initializes the MemoryWatchdog.
+
+        Args:
+            name (str): The session's name in the exported samples (e.g. the worker thread).
+        """
+        self.name = name
+        self.orders = 0
+        self.recycles = 0
+        self.peak_rss_mb = 0.0
+        self.last_sample = None
+        self._last_sampled_at = 0.0
+
+    # --- Checks ---
+
+    def check(self, driver):
+        """
+        Counts a finished order and samples the session if the interval has passed.
+
+        Args:
+            driver: The session's WebDriver.
+
+        Returns:
+            str | None: Why the session should be recycled, or None.
+        """
+        self.orders += 1
+        if time.monotonic() - self._last_sampled_at < settings.MEMORY_SAMPLE_INTERVAL:
+            return None
+
+        sample = self.sample(driver)
+        reasons = []
+        if sample["rss_mb"] is not None and sample["rss_mb"] > settings.MEMORY_MAX_RSS_MB:
+            reasons.append(f"RSS {sample['rss_mb']:.0f} MB > {settings.MEMORY_MAX_RSS_MB:.0f} MB")
+        if sample["windows"] is not None and sample["windows"] > settings.MEMORY_MAX_WINDOWS:
+            reasons.append(f"{sample['windows']} windows open > {settings.MEMORY_MAX_WINDOWS}")
+        if sample["js_heap_mb"] is not None and sample["js_heap_mb"] > settings.MEMORY_MAX_JS_HEAP_MB:
+            reasons.append(f"JS heap {sample['js_heap_mb']:.0f} MB > {settings.MEMORY_MAX_JS_HEAP_MB:.0f} MB")
+        return ", ".join(reasons) or None
+
+    def sample(self, driver):
+        """
+        Samples the session and appends the sample to the memory log.
+
+        Returns:
+            dict: rss_mb, processes, windows and js_heap_mb; a value is None when it could not be read.
+        """
+        self._last_sampled_at = time.monotonic()
+        rss, processes = self._tree_rss(self._driver_pid(driver))
+
+        try:
+            windows = len(driver.window_handles)
+        except Exception:
+            windows = None
+        try:
+            js_heap = driver.execute_script(self.JS_HEAP_SCRIPT)
+        except Exception:
+            js_heap = None
+
+        sample = {
+            "rss_mb": rss / 2**20 if rss is not None else None,
+            "processes": processes,
+            "windows": windows,
+            "js_heap_mb": js_heap / 2**20 if js_heap is not None else None,
+        }
+        if sample["rss_mb"] is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb, sample["rss_mb"])
+        self.last_sample = sample
+        logger.debug(
+            "Memory of session %s after %d orders: rss=%s MB, %s processes, %s windows, js_heap=%s MB",
+            self.name, self.orders, self._round(sample["rss_mb"]), processes, windows, self._round(sample["js_heap_mb"]),
+        )
+        self._log({"event": "sample", **sample})
+        return sample
+
+    def recycled(self, reason, seconds):
+        """Records a session recycle that took `seconds`."""
+        self.recycles += 1
+        self._last_sampled_at = 0.0
+        self._log({"event": "recycle", "reason": reason, "seconds": round(seconds, 3)})
+
+    def summary(self):
+        return {"orders": self.orders, "recycles": self.recycles, "peak_rss_mb": round(self.peak_rss_mb, 1)}
+
+    # --- Process tree ---
+
+    @staticmethod
+    def _driver_pid(driver):
+        """The chromedriver process id; Chrome and its renderers are its descendants."""
+        process = getattr(getattr(driver, "service", None), "process", None)
+        return getattr(process, "pid", None)
+
+    @classmethod
+    def _tree_rss(cls, pid):
+        """
+        Sums the resident memory of a process and its descendants.
+
+        Returns:
+            tuple: (bytes, process count), or (None, None) when it cannot be read.
+        """
+        if pid is None:
+            return None, None
+
+        if PSUTIL_AVAILABLE:
+            try:
+                root = psutil.Process(pid)
+                processes = [root, *root.children(recursive=True)]
+            except psutil.Error:
+                return None, None
+            rss = 0
+            for process in processes:
+                try:
+                    rss += process.memory_info().rss
+                except psutil.Error:
+                    pass
+            return rss, len(processes)
+
+        if os.path.isdir("/proc"):
+            return cls._proc_tree_rss(pid)
+        return None, None
+
+    @staticmethod
+    def _proc_tree_rss(pid):
+        """_tree_rss from /proc, for Linux without psutil."""
+        children = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "r") as fh:
+                    # The command name may contain spaces; the fields after it are fixed
+                    parent = int(fh.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(parent, []).append(int(entry))
+
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        rss = 0
+        count = 0
+        pending = [pid]
+        while pending:
+            current = pending.pop()
+            try:
+                with open(f"/proc/{current}/statm", "r") as fh:
+                    rss += int(fh.read().split()[1]) * page_size
+            except (OSError, IndexError, ValueError):
+                continue
+            count += 1
+            pending.extend(children.get(current, []))
+        return (rss, count) if count else (None, None)
+
+    # --- Export ---
+
+    def _log(self, row):
+        row = {"time": round(time.time(), 3), "session": self.name, "orders": self.orders, **row}
+        for key in ("rss_mb", "js_heap_mb"):
+            row[key] = self._round(row.get(key))
+        try:
+            with self._log_lock:
+                create_directory_if_not_exists(os.path.dirname(settings.MEMORY_LOG_PATH))
+                with open(settings.MEMORY_LOG_PATH, "a", newline="", encoding="utf-8") as fh:
+                    writer = csv.DictWriter(fh, fieldnames=self.FIELDS)
+                    if fh.tell() == 0:
+                        writer.writeheader()
+                    writer.writerow(row)
+        except OSError as e:
+            logger.warning(f"Could not write the memory log: {e}")
+
+    @staticmethod
+    def _round(value):
+        return round(value, 1) if value is not None else None
@@ -1,11 +1,9 @@
-import time
-
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 
 from automation.ui.page_base import PageBase
-from automation.utilities.save_download_state import save_state
-from selenium.common.exceptions import TimeoutException
+from automation.ui.page_context import PageContext
+from automation.utilities.invoice_resolver import invoice_resolver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from automation.utilities.excel_mapper import ReportPageMapperKeys, report_mapper
 from automation.config.locators import ( 
     InboundPageLocators, 
@@ -15,12 +13,39 @@ from automation.config.locators import (
     )
 
 from automation.utilities.logger import logger
+from automation.utilities.tracer import tracer
 
 class ReportDownloader(PageBase):
     """
     A class to handle downloading specific reports.
     """
 
+    # Selects the grid rows of the given order IDs and returns the order IDs jqGrid reports as selected
+    SELECT_GRID_ORDERS_SCRIPT = """
+        const [gridId, orderIds] = arguments;
+        const $grid = $('#' + gridId);
+        const wanted = new Set(orderIds.map(String));
+        $grid.jqGrid('resetSelection');
+        $grid.find('tr.jqgrow').each(function () {
+            const titles = $(this).find('td[title]').map(function () { return $(this).attr('title'); }).get();
+            if (titles.some(title => wanted.has(title))) {
+                $grid.jqGrid('setSelection', this.id, false);
+            }
+        });
+        const selected = $grid.jqGrid('getGridParam', 'selarrrow') || [];
+        return selected.map(rowId => {
+            const titles = $(document.getElementById(rowId)).find('td[title]').map(function () { return $(this).attr('title'); }).get();
+            return titles.find(title => wanted.has(title));
+        }).filter(Boolean);
+    """
+
+    CLEAR_GRID_SELECTION_SCRIPT = "$('#' + arguments[0]).jqGrid('resetSelection');"
+
+    HIDE_NOTIFICATIONS_SCRIPT = """
+        const el = document.getElementById('gritter-notice-wrapper');
+        if (el) { el.style.display = 'none'; el.style.visibility = 'hidden'; }
+    """
+
     def __init__(self, driver):
         """
         Initializes the LoginPage.
@@ -29,7 +54,23 @@ class ReportDownloader(PageBase):
             driver: The Selenium WebDriver instance.
         """
         super().__init__(driver)
+        self.context = PageContext(driver)
+
+    def _open_page(self, url, settle_replaces=2, message=None):
+        """
+        Opens a report page through the page context, which skips it when already open.
+
+        Returns:
+            bool: True if the page was loaded, False if it was already open.
+        """
+        def load():
+            self.driver.get(url)
+            self.wait.settle("page_load", replaces=settle_replaces, grid=True)
+            self.driver.execute_script(self.HIDE_NOTIFICATIONS_SCRIPT)
+            if message:
+                logger.info(message)
 
+        return self.context.ensure_page(url, load)
 
     def download_inbound_page(
         self, 
@@ -47,59 +88,31 @@ class ReportDownloader(PageBase):
         logger.info(f"Starting download process for Order ID: {order_id}, Report: {report_name}, Type: {report_type}")
 
         # --- Step 0: Validation ---
+        tracer.step("step_0_validate")
         if locator is None or locator != ReportPageMapperKeys.INBOUND:
             logger.error("Invalid locator provided.")
             return False
 
-        # --- Step 1: Ensure correct page ---
-        page_url = report_mapper.get_page_url(locator)
-        if self.driver.current_url != page_url:
-            self.driver.get(page_url)
-            time.sleep(2)
-            self.driver.execute_script("""
-                const el = document.getElementById('gritter-notice-wrapper');
-                if (el) { el.style.display = 'none'; el.style.visibility = 'hidden'; }
-            """)
-            logger.info("Navigated to inbound page and cleared notification overlays.")
-
-        # --- Step 2: Open Settlements tab ---
-        try:
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            self.wait.wait_for_overlay_to_disappear(timeout=5)
-            self.click(InboundPageLocators.SETTLEMENTS_TAB)
-            time.sleep(2)
-            logger.info("Clicked 'Settlements' tab successfully.")
-        except Exception as e:
-            logger.warning(f"Settlements tab click intercepted. Retrying via JS: {e}")
-            self.driver.execute_script("arguments[0].click();", self.driver.find_element(*InboundPageLocators.SETTLEMENTS_TAB))
-            return False
-
-        # --- Step 3: Search for order ---
-        orders_search_field = self.wait.wait_for_element_to_be_visible(InboundPageLocators.SEARCH_FIELD, timeout=20)
-        if not orders_search_field:
-            logger.error("Search field not found.")
+        # --- Steps 1-2: Inbound page, Settlements tab ---
+        if not self._open_inbound_settlements_tab(locator):
             return False
 
-        try:
+        # --- Step 3: Search for order (skipped when the grid already shows it) ---
+        tracer.step("step_3_search_order")
+        if not self.context.filter_matches(InboundPageLocators.ORDER_GRID_ID, order_id):
             try:
-                self.clear_input(orders_search_field)
-            except Exception:
-                try:
-                    orders_search_field.clear()
-                except Exception:
-                    pass
-
-            time.sleep(1)
-            orders_search_field.send_keys(order_id)
-            time.sleep(1)
-            orders_search_field.send_keys(Keys.ENTER)
-            logger.info(f"Searched for order ID: {order_id}")
-            time.sleep(2)
-        except Exception as e:
-            logger.error(f"Failed to search for order {order_id}: {e}")
-            return False
+                if not self.search(InboundPageLocators.SEARCH_FIELD, order_id, timeout=20):
+                    logger.error("Search field not found.")
+                    return False
+                logger.info(f"Searched for order ID: {order_id}")
+                self.wait.settle("search", replaces=2, grid=True)
+                self.context.set_filter(InboundPageLocators.ORDER_GRID_ID, order_id)
+            except Exception as e:
+                logger.error(f"Failed to search for order {order_id}: {e}")
+                return False
 
         # --- Step 4: Select checkbox ---
+        tracer.step("step_4_select_row")
         order_element = self.wait.wait_for_element_to_be_visible((By.CSS_SELECTOR, f"td[title='{order_id}']"), timeout=30)
         if not order_element:
             logger.error(f"Order ID '{order_id}' not found.")
@@ -110,13 +123,14 @@ class ReportDownloader(PageBase):
         self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", checkbox)
         if not checkbox.is_selected():
             checkbox.click()
-            time.sleep(1)
+            self.wait.settle("select_row", replaces=1)
         logger.info(f"Selected checkbox for Order ID: {order_id}")
 
         if not self.driver.execute_script("return $('#div_ReportsContainer').length"):
             logger.warning("Modal element missing. Reloading page to reset RazorERP context.")
             self.driver.refresh()
-            time.sleep(4)
+            self.context.invalidate()
+            self.wait.settle("page_load", replaces=4, grid=True)
             return self.download_inbound_page(
                 locator=locator,
                 report_name=report_name,
@@ -125,7 +139,146 @@ class ReportDownloader(PageBase):
                 report_type=report_type
             )
 
+        if not self._download_from_print_modal(report_name, report_type, label=order_id):
+            return False
+
+        return True
+
+    def download_inbound_batch(
+        self,
+        locator=None,
+        report_name=None,
+        order_ids=None,
+        report_type=None,
+    ):
+        """
+        Downloads one report for several inbound orders through a single Print/Download modal.
+
+        The orders are selected together in the multi-select order grid; the selection is
+        read back from jqGrid's selarrrow, so only orders that really are selected are
+        reported as downloaded. Orders that are not on the current grid page are left out
+        and should be downloaded one by one.
+
+        Args:
+            locator (str): Must be ReportPageMapperKeys.INBOUND.
+            report_name (str): The report to download for every order.
+            order_ids (list): The orders to select.
+            report_type (str): The report type, which picks the Print/Download button.
+
+        Returns:
+            list: The order IDs the download was triggered for (empty on failure).
+        """
+        order_ids = [str(order_id) for order_id in order_ids or []]
+        logger.info(f"Starting batch download of '{report_name}' ({report_type}) for {len(order_ids)} orders.")
+
+        if locator is None or locator != ReportPageMapperKeys.INBOUND or not order_ids:
+            logger.error("Invalid locator or no orders provided for a batch download.")
+            return []
+
+        if not self._open_inbound_settlements_tab(locator):
+            return []
+
+        # Show every order on the grid instead of one search result
+        tracer.step("step_3_search_order")
+        if not self.context.filter_matches(InboundPageLocators.ORDER_GRID_ID, ""):
+            try:
+                if not self.search(InboundPageLocators.SEARCH_FIELD, "", timeout=20):
+                    logger.error("Search field not found.")
+                    return []
+                self.wait.settle("search", replaces=2, grid=True)
+                self.context.set_filter(InboundPageLocators.ORDER_GRID_ID, "")
+            except Exception as e:
+                logger.error(f"Failed to reset the order search: {e}")
+                return []
+
+        tracer.step("step_4_select_row")
+        selected = self.driver.execute_script(self.SELECT_GRID_ORDERS_SCRIPT, InboundPageLocators.ORDER_GRID_ID, order_ids) or []
+        self.wait.settle("select_row", replaces=1)
+        missing = [order_id for order_id in order_ids if order_id not in selected]
+        if missing:
+            logger.info(f"{len(missing)} orders are not on the order grid and will be downloaded one by one: {missing}")
+        if not selected:
+            return []
+        logger.info(f"Selected {len(selected)} orders in the order grid.")
+
+        if not self.driver.execute_script("return $('#div_ReportsContainer').length"):
+            logger.warning("Modal element missing; the batch falls back to single downloads.")
+            self.driver.refresh()
+            self.context.invalidate()
+            self.wait.settle("page_load", replaces=4, grid=True)
+            return []
+
+        if not self._download_from_print_modal(report_name, report_type, label=f"batch_{selected[0]}"):
+            self.driver.execute_script(self.CLEAR_GRID_SELECTION_SCRIPT, InboundPageLocators.ORDER_GRID_ID)
+            return []
+
+        self.driver.execute_script(self.CLEAR_GRID_SELECTION_SCRIPT, InboundPageLocators.ORDER_GRID_ID)
+        return selected
+
+    def _open_inbound_settlements_tab(self, locator):
+        """
+        Opens the inbound page (if it is not open yet) and its Settlements tab.
+
+        Returns:
+            bool: True if the tab was opened.
+        """
+        # --- Step 1: Ensure correct page ---
+        tracer.step("step_1_open_page")
+        page_url = report_mapper.get_page_url(locator)
+        self._open_page(page_url, message="Navigated to inbound page and cleared notification overlays.")
+
+        # --- Step 2: Open Settlements tab ---
+        tracer.step("step_2_open_tab")
+        def activate():
+            self.driver.execute_script("window.scrollTo(0, 0);")
+            self.wait.wait_for_overlay_to_disappear(timeout=5)
+            self.click(InboundPageLocators.SETTLEMENTS_TAB)
+            self.wait.settle("open_tab", replaces=2, grid=True)
+            logger.info("Clicked 'Settlements' tab successfully.")
+
+        try:
+            self.context.ensure_tab("settlements", activate)
+        except Exception as e:
+            logger.warning(f"Settlements tab click intercepted. Retrying via JS: {e}")
+            self.driver.execute_script("arguments[0].click();", self.driver.find_element(*InboundPageLocators.SETTLEMENTS_TAB))
+            return False
+        return True
+
+    def _set_report_checkboxes(self, report_name, checked):
+        """
+        Checks (or unchecks) the checkbox of a report in the Print/Download modal together
+        with the nested checkboxes of its print-dialog-doctype group, in one call.
+
+        Returns:
+            bool: True if the report checkbox was found.
+        """
+        parts = ["cb", "Doc", report_name]
+        last_part = "_".join(word.capitalize() for word in parts[-1].split())
+        report_id = "_".join([*parts[:-1], last_part])
+
+        states = self.set_checkbox_group((By.ID, report_id), checked, group="div.print-dialog-doctype", timeout=15)
+        if states is None:
+            logger.error(f"Report checkbox {report_id} not found.")
+            return False
+        if checked:
+            logger.info(f"Selected {sum(state['checked'] for state in states)} related checkboxes for '{report_name}'.")
+        return True
+
+    def _download_from_print_modal(self, report_name, report_type, label=None):
+        """
+        Opens the Print/Download modal for the selected grid rows, downloads one report
+        type for all of them and closes the modal again.
+
+        Args:
+            report_name (str): The report to download.
+            report_type (str): "standard" uses the Print/Download button, anything else Print/Download New.
+            label (str, optional): Used to name screenshots taken on failure.
+
+        Returns:
+            bool: True if the download was triggered.
+        """
         # --- Step 5: Open modal ---
+        tracer.step("step_5_open_modal")
         download_button = self.wait.wait_for_element_to_be_visible(
             InboundPageLocators.STANDARD_DOWNLOAD_BUTTON if report_type.lower() == "standard"
             else InboundPageLocators.DOWNLOAD_BUTTON_NEW, timeout=15)
@@ -135,43 +288,30 @@ class ReportDownloader(PageBase):
 
         try:
             download_button.click()
-            time.sleep(1)
         except Exception:
             self.driver.execute_script("arguments[0].click();", download_button)
         logger.info("Clicked Print/Download button; waiting for modal.")
 
-        time.sleep(1)
+        self.wait.settle("open_modal", replaces=2)
 
         # --- Step 6: Wait for modal ---
+        tracer.step("step_6_wait_modal")
         reports_container = self.wait.wait_for_element_to_be_visible(InboundPageLocators.SEARCH_FIELD_SETTLEMENTS, timeout=10)
         if not reports_container:
             logger.error("Reporting Station modal didn't appear.")
-            self.driver.save_screenshot(f"screenshots/modal_missing_{order_id}.png")
+            self.driver.save_screenshot(f"screenshots/modal_missing_{label}.png")
             return False
 
-        time.sleep(1)
+        self.context.dialog_opened("print")
+        self.wait.settle("modal_ready", replaces=1)
 
         # --- Step 7: Select report checkboxes ---
-        parts = ["cb", "Doc", report_name]
-        last_part = "_".join(word.capitalize() for word in parts[-1].split())
-        report_id = "_".join([*parts[:-1], last_part])
-        report_checkbox = self.wait.wait_for_element_to_be_visible((By.ID, report_id), timeout=15)
-
-        if not report_checkbox:
-            logger.error(f"Report checkbox {report_id} not found.")
+        tracer.step("step_7_select_report")
+        if not self._set_report_checkboxes(report_name, True):
             return False
 
-        parent_div = report_checkbox.find_element(By.XPATH, "./ancestor::div[contains(@class,'print-dialog-doctype')]")
-        nested_checkboxes = parent_div.find_elements(By.XPATH, ".//input[@type='checkbox']")
-        for cb in nested_checkboxes:
-            try:
-                if not cb.is_selected():
-                    cb.click()
-            except Exception as e:
-                logger.warning(f"Could not select checkbox {cb.get_attribute('id')}: {e}")
-        logger.info(f"Selected all related checkboxes for '{report_name}'.")
-
         # --- Step 8: Trigger download ---
+        tracer.step("step_8_trigger_download")
         final_download_button = self.wait.wait_for_element_to_be_visible(
             (By.XPATH, "//*[@id='dlgPrint_ButtonPreview']/preceding-sibling::*[1]"), timeout=15
         )
@@ -182,17 +322,12 @@ class ReportDownloader(PageBase):
         final_download_button.click()
         logger.info(f"Download initiated for report '{report_name}' of type '{report_type}'.")
 
-        for cb in nested_checkboxes:
-            try:
-                if cb.is_selected():
-                    cb.click()
-            except Exception as e:
-                logger.warning(f"Could not deselect checkbox {cb.get_attribute('id')}: {e}")
+        self._set_report_checkboxes(report_name, False)
 
-        save_state.add(order_id, report_name, downloaded=True, uploaded=False)
-        time.sleep(1)
+        self.wait.settle("download_start", replaces=1)
 
         # --- Step 9: Close modal ---
+        tracer.step("step_9_close_modal")
         try:
             close_button = self.wait.wait_for_element_to_be_visible(
                 (By.XPATH, "//*[@id='dlgPrint_ButtonPreview']/following-sibling::*[1]")
@@ -208,7 +343,8 @@ class ReportDownloader(PageBase):
                 document.querySelectorAll('.ui-dialog-titlebar-close, button.ui-dialog-titlebar-close')
                     .forEach(btn => btn.click());
             """)
-        time.sleep(2)
+        self.context.dialog_closed("print")
+        self.wait.settle("close_modal", replaces=2)
         return True
 
     def download_transaction_report(
@@ -232,76 +368,115 @@ class ReportDownloader(PageBase):
             logger.error("Invalid report type provided for downloading inbound page report.")
             return False
 
+        tracer.step("resolve_sales_order")
+        invoices_tab = None
+        sales_order_url = invoice_resolver.get(order_id)
+        if sales_order_url:
+            invoices_tab = self._open_sales_order(sales_order_url)
+            if not invoices_tab:
+                logger.warning(f"Cached sales order page of Order ID: {order_id} did not load; resolving it again.")
+                invoice_resolver.discard(order_id)
+
+        if not invoices_tab:
+            sales_order_url = self._find_sales_order_url(locator, order_id)
+            if not sales_order_url:
+                logger.error("Unable to load page")
+                return False
+            invoices_tab = self._open_sales_order(sales_order_url)
+            if not invoices_tab:
+                logger.error(f"Invoices tab not found for Order ID: {order_id}")
+                return False
+            invoice_resolver.put(order_id, sales_order_url)
+
+        tracer.step("open_tab")
+        invoices_tab.click()
+        self.wait.settle("open_tab", replaces=1, grid=True)
+        checkbox = self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.INVOICE_TAB_TABLE_CHECKBOX)
+        checkbox.click()
+
+        if report_type.lower() == 'standard':
+            tracer.step("trigger_download")
+            download_button = self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.STANDARD_DOWNLOAD_BUTTON)
+            download_button.click()
+            self.wait.settle("open_modal", replaces=10)
+
+            dialog_checkbox = self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.AR_REPORT_CHECKBOX)
+            dialog_checkbox.click()
+            self.wait.settle("select_report", replaces=1)
+
+            final_download_button = self.wait.wait_for_element_to_be_visible((By.XPATH, "//*[@id='dlgPrint_ButtonPreview']/preceding-sibling::*[1]"), timeout=2)
+            final_download_button.click()
+            logger.info(f"Download Button Clicked for report {report_name}")
+            return True
+
+        logger.warning("This type of report download is not Implented. Skipping...")
+        return False
+
+    def _find_sales_order_url(self, locator, order_id):
+        """
+        Looks an order up in the settlement list and returns its linked sales order page.
+
+        The URL is taken from the grid row (see InvoiceResolver.resolve_from_grid); only when
+        the row does not lead to it is the order opened in a new window, as a user would.
+
+        Returns:
+            str | None: The sales order URL.
+        """
+        tracer.step("open_page")
         page_url = report_mapper.get_page_url(locator)
 
-        if self.driver.current_url != page_url:
-            self.driver.get(page_url)
-            time.sleep(2)
-            self.driver.execute_script("""
-                const el = document.getElementById('gritter-notice-wrapper');
-                if (el) {
-                    el.style.display = 'none';
-                    el.style.visibility = 'hidden';
-                }
-            """)
-            
-        time.sleep(2)
-        
-        orders_search_field = self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.SEARCH_FIELD)
-        if orders_search_field:
-            orders_search_field.send_keys(order_id)
-            time.sleep(2)
-            orders_search_field.send_keys(Keys.ENTER)
-            time.sleep(2)
-            order_element = self.wait.wait_for_element_to_be_visible((By.CSS_SELECTOR, f"td[title='{order_id}']"), timeout=30)
-            
-            if order_element:
-                self.actions.double_click(order_element)
-                time.sleep(2)
-                tabs = self.driver.window_handles
-                primary = tabs[0]
-                redirected = tabs[1]
-                
-                self.driver.switch_to.window(redirected)
-                redirect_url = self.driver.current_url
-                
-                self.driver.close()
-                self.driver.switch_to.window(primary)
-                self.driver.get(redirect_url)
-                time.sleep(2)
-                
-                sales_transaction_order = self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.SALES_ORDER_HISTORY, timeout=30)
-                
-                if sales_transaction_order:
-                    logger.info("Settle Table Found")
-                    link = sales_transaction_order.get_attribute("href")
-                    self.driver.get(link)
-                    time.sleep(3)
-                    invoices_tab = self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.INVOICE_TAB)
-                    
-                    if invoices_tab:
-                        invoices_tab.click()
-                        time.sleep(1)
-                        checkbox = self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.INVOICE_TAB_TABLE_CHECKBOX)
-                        checkbox.click()
-                        
-                        if report_type.lower() == 'standard':
-                            download_button = self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.STANDARD_DOWNLOAD_BUTTON)
-                            download_button.click()
-                            time.sleep(10)
-                            
-                            dialog_checkbox = self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.AR_REPORT_CHECKBOX)
-                            dialog_checkbox.click()
-                            time.sleep(1)
-                            
-                            final_download_button = self.wait.wait_for_element_to_be_visible((By.XPATH, "//*[@id='dlgPrint_ButtonPreview']/preceding-sibling::*[1]"), timeout=2)
-                            final_download_button.click()
-                            logger.info(f"Download Button Clicked for report {report_name}")
-                        else:
-                            logger.warning("This type of report download is not Implented. Skipping...")
-                else:
-                    logger.error("Unable to load page")
-                    
+        if not self._open_page(page_url):
+            self.wait.settle("page_ready", replaces=2, grid=True)
+
+        tracer.step("search_order")
+        if not self.search(TransactionalPageLoaders.SEARCH_FIELD, order_id):
+            logger.error("Search field not found.")
+            return None
+        self.wait.settle("search", replaces=2, grid=True)
+        order_element = self.wait.wait_for_element_to_be_visible((By.CSS_SELECTOR, f"td[title='{order_id}']"), timeout=30)
+        if not order_element:
+            logger.error(f"Order ID '{order_id}' not found.")
+            return None
+
+        sales_order_url = invoice_resolver.resolve_from_grid(self.driver, order_id)
+        if sales_order_url:
+            return sales_order_url
+
+        tracer.step("open_order")
+        primary = self.driver.current_window_handle
+        existing = set(self.driver.window_handles)
+        self.actions.double_click(order_element)
+        if not self.wait.wait_for_number_of_windows(len(existing) + 1, replaces=2):
+            logger.error(f"Order ID '{order_id}' did not open in a new window.")
+            return None
+        opened = [handle for handle in self.driver.window_handles if handle not in existing]
+        if not opened:
+            logger.error(f"Order ID '{order_id}' did not open in a new window.")
+            return None
+        try:
+            self.driver.switch_to.window(opened[0])
+        except WebDriverException as e:
+            logger.error(f"Could not switch to the window of Order ID '{order_id}': {e}")
+            return None
+        try:
+            sales_transaction_order = self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.SALES_ORDER_HISTORY, timeout=30)
+            if not sales_transaction_order:
+                return None
+            logger.info("Settle Table Found")
+            return sales_transaction_order.get_attribute("href")
+        finally:
+            self.driver.close()
+            self.driver.switch_to.window(primary)
+
+    def _open_sales_order(self, sales_order_url):
+        """Opens a sales order page and returns its invoices tab (None if it does not show up)."""
+        tracer.step("open_sales_order")
+        self.driver.get(sales_order_url)
+        # The sales order page leaves the settlement list behind
+        self.context.invalidate()
+        self.wait.settle("page_load", replaces=3, grid=True)
+        return self.wait.wait_for_element_to_be_visible(TransactionalPageLoaders.INVOICE_TAB)
+
     def download_audit_report(
         self, 
         locator=None,
@@ -323,63 +498,52 @@ class ReportDownloader(PageBase):
             logger.error("Invalid report type provided for downloading inbound page report.")
             return False
 
+        tracer.step("open_page")
         page_url = report_mapper.get_page_url(locator)
         
-        if self.driver.current_url != page_url:
-            self.driver.get(page_url)
-            time.sleep(2)
-            self.driver.execute_script("""
-                const el = document.getElementById('gritter-notice-wrapper');
-                if (el) {
-                    el.style.display = 'none';
-                    el.style.visibility = 'hidden';
-                }
-            """)
-            
-        time.sleep(2)
+        if not self._open_page(page_url):
+            self.wait.settle("page_ready", replaces=2, grid=True)
         
-        search_field = self.wait.wait_for_element_to_be_visible(AuditReportsMapper.SEARCH_FIELD)
-        if search_field:
-            try:
-                self.clear_input(search_field)
-            except Exception:
-                try:
-                    search_field.clear()
-                except Exception:
-                    pass
-
-            search_field.send_keys(order_id)
-            time.sleep(2)
-            search_field.send_keys(Keys.ENTER)
-            time.sleep(2)
+        tracer.step("search_order")
+        already_filtered = self.context.filter_matches("audit_orders", order_id)
+        searched = already_filtered or self.search(AuditReportsMapper.SEARCH_FIELD, order_id)
+        if searched:
+            if not already_filtered:
+                self.wait.settle("search", replaces=2, grid=True)
+                self.context.set_filter("audit_orders", order_id)
             
             table_cell = self.wait.wait_for_element_to_be_visible(AuditReportsMapper.CELL_LOCATION, timeout=10)
             if table_cell:
+                tracer.step("select_row")
                 table_cell.click()
-                time.sleep(2)
+                self.wait.settle("select_row", replaces=2)
 
+                tracer.step("open_modal")
                 download_button = self.wait.wait_for_element_to_be_visible(AuditReportsMapper.PRINT_BUTTON)
                 download_button.click()
-                time.sleep(2)
+                # The modal stays open; the next report reloads the page instead of reusing it
+                self.context.dialog_opened("print")
+                self.wait.settle("open_modal", replaces=2)
     
+                tracer.step("select_report")
                 checkbox_audit_report = self.wait.wait_for_element_to_be_visible(AuditReportsMapper.CHECKBOX_AUDIT_REPORT)
                 checkbox_include_drives = self.wait.wait_for_element_to_be_visible(AuditReportsMapper.CHECBOX_INCLUDE_DRIVES)
 
                 if checkbox_audit_report and not checkbox_audit_report.is_selected():
                     checkbox_audit_report.click()
-                    time.sleep(1)
+                    self.wait.settle("select_report", replaces=1)
                 
                 if checkbox_include_drives and not checkbox_include_drives.is_selected():
                     checkbox_include_drives.click()
-                    time.sleep(1)
+                    self.wait.settle("select_report", replaces=1)
 
+                tracer.step("trigger_download")
                 download_button = self.wait.wait_for_element_to_be_visible((
                     By.XPATH, "//*[@id='dlgPrint_ButtonPreview']/preceding-sibling::*[1]"), timeout=10)
                 if download_button:
                     download_button.click()
                     logger.info(f"Download initiated for Audit report '{report_name}' of type '{report_type}'.")
-                    time.sleep(2)
-                    save_state.add(order_id, report_name, downloaded=True, uploaded=False)
+                    self.wait.settle("download_start", replaces=2)
                     return True
             else:
                 logger.error(f"Order ID '{order_id}' not found in Audit Reports.")
@@ -404,48 +568,31 @@ class ReportDownloader(PageBase):
         logger.info(f"Starting download process for Order ID: {order_id}, Report: {report_name}, Type: {report_type}")
 
         # --- Step 0: Validation ---
+        tracer.step("step_0_validate")
         if locator is None or locator != ReportPageMapperKeys.SETTLEMENT:
             logger.error("Invalid locator provided.")
             return False
 
         # --- Step 1: Ensure correct page ---
+        tracer.step("step_1_open_page")
         page_url = report_mapper.get_page_url(locator)
 
-        if self.driver.current_url != page_url:
-            self.driver.get(page_url)
-            time.sleep(5)
-            self.driver.execute_script("""
-                const el = document.getElementById('gritter-notice-wrapper');
-                if (el) { el.style.display = 'none'; el.style.visibility = 'hidden'; }
-            """)
-            logger.info("Navigated to settlement report page and cleared notification overlays.")
+        self._open_page(page_url, settle_replaces=5, message="Navigated to settlement report page and cleared notification overlays.")
 
         # --- Step 3: Search for order ---
-        orders_search_field = self.wait.wait_for_element_to_be_visible(SettlementReportLocators.SEARCH_FIELD, timeout=20)
-        if not orders_search_field:
-            logger.error("Search field not found.")
-            return False
-
+        tracer.step("step_3_search_order")
         try:
-            try:
-                self.clear_input(orders_search_field)
-            except Exception:
-                try:
-                    orders_search_field.clear()
-                except Exception:
-                    pass
-
-            time.sleep(1)
-            orders_search_field.send_keys(order_id)
-            time.sleep(2)
-            orders_search_field.send_keys(Keys.ENTER)
+            if not self.search(SettlementReportLocators.SEARCH_FIELD, order_id, timeout=20):
+                logger.error("Search field not found.")
+                return False
             logger.info(f"Searched for order ID: {order_id}")
-            time.sleep(2)
+            self.wait.settle("search", replaces=2, grid=True)
         except Exception as e:
             logger.error(f"Failed to search for order {order_id}: {e}")
             return False
 
         # --- Step 4: Select checkbox ---
+        tracer.step("step_4_select_row")
         order_element = self.wait.wait_for_element_to_be_visible((By.CSS_SELECTOR, f"td[title='{order_id}']"), timeout=30)
         if not order_element:
             logger.error(f"Order ID '{order_id}' not found.")
@@ -456,13 +603,14 @@ class ReportDownloader(PageBase):
         self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", checkbox)
         if not checkbox.is_selected():
             checkbox.click()
-            time.sleep(1)
+            self.wait.settle("select_row", replaces=1)
         logger.info(f"Selected checkbox for Order ID: {order_id}")
 
         if not self.driver.execute_script("return $('#div_ReportsContainer').length"):
             logger.warning("Modal element missing. Reloading page to reset RazorERP context.")
             self.driver.refresh()
-            time.sleep(4)
+            self.context.invalidate()
+            self.wait.settle("page_load", replaces=4, grid=True)
             return self.download_inbound_page(
                 locator=locator,
                 report_name=report_name,
@@ -480,14 +628,14 @@ class ReportDownloader(PageBase):
 
         try:
             download_button.click()
-            time.sleep(2)
         except Exception:
             self.driver.execute_script("arguments[0].click();", download_button)
         logger.info("Clicked Print/Download button; waiting for modal.")
 
-        time.sleep(2)
+        self.wait.settle("open_modal", replaces=4)
 
         # --- Step 6: Wait for modal ---
+        tracer.step("step_6_wait_modal")
         if report_type.lower() == "standard":
             reports_container = self.wait.wait_for_element_to_be_visible(SettlementReportLocators.REPORTS_LIST_CONTAINER, timeout=10)
             if not reports_container:
@@ -495,29 +643,15 @@ class ReportDownloader(PageBase):
                 self.driver.save_screenshot(f"screenshots/modal_missing_{order_id}.png")
                 return False
 
-            time.sleep(1)
+            self.wait.settle("modal_ready", replaces=1)
 
             # --- Step 7: Select report checkboxes ---
-            parts = ["cb", "Doc", report_name]
-            last_part = "_".join(word.capitalize() for word in parts[-1].split())
-            report_id = "_".join([*parts[:-1], last_part])
-            report_checkbox = self.wait.wait_for_element_to_be_visible((By.ID, report_id), timeout=15)
-
-            if not report_checkbox:
-                logger.error(f"Report checkbox {report_id} not found.")
+            tracer.step("step_7_select_report")
+            if not self._set_report_checkboxes(report_name, True):
                 return False
 
-            parent_div = report_checkbox.find_element(By.XPATH, "./ancestor::div[contains(@class,'print-dialog-doctype')]")
-            nested_checkboxes = parent_div.find_elements(By.XPATH, ".//input[@type='checkbox']")
-            for cb in nested_checkboxes:
-                try:
-                    if not cb.is_selected():
-                        cb.click()
-                except Exception as e:
-                    logger.warning(f"Could not select checkbox {cb.get_attribute('id')}: {e}")
-            logger.info(f"Selected all related checkboxes for '{report_name}'.")
-
             # --- Step 8: Trigger download ---
+            tracer.step("step_8_trigger_download")
             final_download_button = self.wait.wait_for_element_to_be_visible(
                 (By.XPATH, "//*[@id='dlgPrint_ButtonPreview']/preceding-sibling::*[1]"), timeout=15
             )
@@ -528,17 +662,12 @@ class ReportDownloader(PageBase):
             final_download_button.click()
             logger.info(f"Download initiated for report '{report_name}' of type '{report_type}'.")
 
-            for cb in nested_checkboxes:
-                try:
-                    if cb.is_selected():
-                        cb.click()
-                except Exception as e:
-                    logger.warning(f"Could not deselect checkbox {cb.get_attribute('id')}: {e}")
+            self._set_report_checkboxes(report_name, False)
 
-            save_state.add(order_id, report_name, downloaded=True, uploaded=False)
-            time.sleep(1)
+            self.wait.settle("download_start", replaces=1)
 
             # --- Step 9: Close modal ---
+            tracer.step("step_9_close_modal")
             try:
                 close_button = self.wait.wait_for_element_to_be_visible(
                     (By.XPATH, "//*[@id='dlgPrint_ButtonPreview']/following-sibling::*[1]")
@@ -554,7 +683,7 @@ class ReportDownloader(PageBase):
                     document.querySelectorAll('.ui-dialog-titlebar-close, button.ui-dialog-titlebar-close')
                         .forEach(btn => btn.click());
                 """)
-            time.sleep(2)
+            self.wait.settle("close_modal", replaces=2)
             return True
         else:
             reports_container = self.wait.wait_for_element_to_be_visible((By.ID, SettlementReportLocators.MODAL_ID), timeout=10)
@@ -563,7 +692,7 @@ class ReportDownloader(PageBase):
                 self.driver.save_screenshot(f"screenshots/modal_missing_{order_id}.png")
                 return False
 
-            time.sleep(1)
+            self.wait.settle("modal_ready", replaces=1)
 
             logger.warning("This type of report download is not Implented. Skipping...")
             return False
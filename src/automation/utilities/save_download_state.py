@@ -1,15 +1,30 @@
+from contextlib import contextmanager
 from pathlib import Path
+import atexit
 import csv
+import sqlite3
+import threading
+import time
 
 from automation.utilities.logger import logger
-from automation.config.settings import PROJECT_ROOT
+from automation.config.settings import PROJECT_ROOT, settings
 from automation.utilities.file_manager import create_directory_if_not_exists
 
-class SaveDownloadState:
+STATE_FIELDNAMES = ["order_id", "doc_type", "download", "upload"]
+
+
+class CsvStateBackend:
     """
-      Utility class to save the state of downloads.
+      Download state stored in application_state/downloads.csv.
+
+      Every write rewrites the whole file, so this backend is kept for compatibility;
+      writes are serialized through a lock so parallel workers can share one state file.
     """
 
+    def __init__(self, csv_path=None):
+      self.csv_path = Path(csv_path) if csv_path else Path(PROJECT_ROOT) / "application_state" / "downloads.csv"
+      self._lock = threading.Lock()
+
     def add(self, order_id: str, doc_type: str, downloaded: bool = True, uploaded: bool = False) -> None:
       """
       Persist a single download/upload state row into application_state/downloads.csv.
@@ -20,13 +35,12 @@ class SaveDownloadState:
       Columns: order_id, doc_type, DOWNLOAD (true/false), upload (true/false)
       """
 
-      folder = Path(PROJECT_ROOT) / "application_state"
-      create_directory_if_not_exists(folder)
-      csv_path = folder / "downloads.csv"
+      csv_path = self.csv_path
+      create_directory_if_not_exists(csv_path.parent)
 
-      logger.info(f"Saving download state for Order ID: {order_id}, Doc Type: {doc_type}, Downloaded: {downloaded}, Uploaded: {uploaded}")
+      logger.debug("Saving download state for Order ID: %s, Doc Type: %s, Downloaded: %s, Uploaded: %s", order_id, doc_type, downloaded, uploaded)
 
-      fieldnames = ["order_id", "doc_type", "download", "upload"]
+      fieldnames = STATE_FIELDNAMES
       new_values = {
         "order_id": order_id,
         "doc_type": doc_type,
@@ -34,39 +48,59 @@ class SaveDownloadState:
         "upload": str(bool(uploaded)).lower(),
       }
 
+      with self._lock:
+        self._write_row(csv_path, fieldnames, new_values)
+
+    def mark_uploaded(self, order_id: str, doc_type: str, uploaded: bool = True) -> None:
+      """
+      Update only the upload value of a row, keeping its download value.
+      """
+      create_directory_if_not_exists(self.csv_path.parent)
+      new_values = {
+        "order_id": order_id,
+        "doc_type": doc_type,
+        "download": "false",
+        "upload": str(bool(uploaded)).lower(),
+      }
+      with self._lock:
+        self._write_row(self.csv_path, STATE_FIELDNAMES, new_values, columns=("upload",))
+
+    def _write_row(self, csv_path: Path, fieldnames: list[str], new_values: dict, columns=("download", "upload")) -> None:
+      """Read-modify-write the CSV file with a single updated or appended row; `columns` are the values updated."""
+      order_id = new_values["order_id"]
+      doc_type = new_values["doc_type"]
       rows = []
       updated = False
 
       if csv_path.exists():
-        logger.info(f"Found existing download state file: {csv_path}")
+        logger.debug("Found existing download state file: %s", csv_path)
         with csv_path.open("r", newline="", encoding="utf-8") as fh:
           reader = csv.DictReader(fh)
           for row in reader:
             if row.get("order_id") == order_id and row.get("doc_type") == doc_type:
-              row["download"] = new_values["download"]
-              row["upload"] = new_values["upload"]  
+              for column in columns:
+                row[column] = new_values[column]
               updated = True
             # ensure all expected keys exist for consistent output
             normalized = {k: row.get(k, "") for k in fieldnames}
             rows.append(normalized)
 
       if not updated:
-        logger.info(f"Adding new download state entry: {new_values}")
+        logger.debug("Adding new download state entry: %s", new_values)
         rows.append(new_values)
 
       with csv_path.open("w", newline="", encoding="utf-8") as fh:
-        logger.info(f"Writing download state to CSV file: {csv_path}")
+        logger.debug("Writing download state to CSV file: %s", csv_path)
         writer = csv.DictWriter(fh, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(rows)
-        logger.info(f"Finished writing download state to CSV file: {csv_path}")
+        logger.debug("Finished writing download state to CSV file: %s", csv_path)
     
     def clear(self) -> None:
       """
       Clear the download state CSV file.
       """
-      folder = Path(PROJECT_ROOT) / "application_state"
-      csv_path = folder / "downloads.csv"
+      csv_path = self.csv_path
 
       if csv_path.exists():
         logger.info(f"Clearing download state file: {csv_path}")
@@ -81,19 +115,19 @@ class SaveDownloadState:
       Returns:
           list[dict]: A list of dictionaries representing each row in the CSV.
       """
-      folder = Path(PROJECT_ROOT) / "application_state"
-      csv_path = folder / "downloads.csv"
+      csv_path = self.csv_path
       entries = []
 
-      if csv_path.exists():
-        logger.info(f"Loading download state from file: {csv_path}")
-        with csv_path.open("r", newline="", encoding="utf-8") as fh:
-          reader = csv.DictReader(fh)
-          for row in reader:
-            entries.append(row)
-        logger.info(f"Loaded {len(entries)} entries from download state file.")
-      else:
-        logger.info(f"No download state file found at: {csv_path}")
+      with self._lock:
+        if csv_path.exists():
+          logger.debug("Loading download state from file: %s", csv_path)
+          with csv_path.open("r", newline="", encoding="utf-8") as fh:
+            reader = csv.DictReader(fh)
+            for row in reader:
+              entries.append(row)
+          logger.debug("Loaded %d entries from download state file.", len(entries))
+        else:
+          logger.debug("No download state file found at: %s", csv_path)
 
       return entries
     
@@ -135,4 +169,347 @@ class SaveDownloadState:
         return entries[-1]
       return None
 
-save_state = SaveDownloadState()
\ No newline at end of file
+    def flush(self) -> None:
+      """Nothing to flush; every CSV write is immediately persisted."""
+
+    @contextmanager
+    def batch(self):
+      """The CSV backend has no batching; provided for API compatibility."""
+      yield self
+
+
+class SqliteStateBackend:
+    """
+      Download state stored in a SQLite database.
+
+      The table has a unique (order_id, doc_type) index, so writes are single-row upserts
+      and lookups are index seeks instead of full-file scans. The database runs in WAL mode
+      with a busy timeout, which lets separate processes read and write it concurrently;
+      threads in one process share a single connection guarded by a lock. Writes are
+      committed in batches of settings.STATE_BATCH_SIZE (or after settings.STATE_FLUSH_INTERVAL
+      seconds), and flush() commits whatever is pending.
+    """
+
+    SCHEMA = """
+      CREATE TABLE IF NOT EXISTS download_state (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_id TEXT NOT NULL,
+        doc_type TEXT NOT NULL,
+        download INTEGER NOT NULL DEFAULT 0,
+        upload INTEGER NOT NULL DEFAULT 0,
+        updated_at REAL NOT NULL
+      );
+      CREATE UNIQUE INDEX IF NOT EXISTS ux_download_state_order_doc ON download_state (order_id, doc_type);
+      CREATE INDEX IF NOT EXISTS ix_download_state_updated_at ON download_state (updated_at);
+    """
+
+    UPSERT = """
+      INSERT INTO download_state (order_id, doc_type, download, upload, updated_at)
+      VALUES (?, ?, ?, ?, ?)
+      ON CONFLICT (order_id, doc_type) DO UPDATE SET
+        download = excluded.download,
+        upload = excluded.upload,
+        updated_at = excluded.updated_at
+    """
+
+    UPSERT_UPLOAD = """
+      INSERT INTO download_state (order_id, doc_type, download, upload, updated_at)
+      VALUES (?, ?, 0, ?, ?)
+      ON CONFLICT (order_id, doc_type) DO UPDATE SET
+        upload = excluded.upload,
+        updated_at = excluded.updated_at
+    """
+
+    SELECT_COLUMNS = "SELECT order_id, doc_type, download, upload FROM download_state"
+
+    def __init__(self, db_path=None, batch_size=None, flush_interval=None):
+      self.db_path = Path(db_path) if db_path else Path(settings.STATE_DB_PATH)
+      self.batch_size = batch_size or settings.STATE_BATCH_SIZE
+      self.flush_interval = settings.STATE_FLUSH_INTERVAL if flush_interval is None else flush_interval
+      self._lock = threading.RLock()
+      self._pending = 0
+      self._last_commit = time.monotonic()
+      self._batch_depth = 0
+      self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+      """The shared connection, opened (and the schema created) on first use."""
+      if self._conn is None:
+        with self._lock:
+          if self._conn is None:
+            create_directory_if_not_exists(self.db_path.parent)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.executescript(self.SCHEMA)
+            conn.commit()
+            self._conn = conn
+            logger.info(f"Opened download state database: {self.db_path}")
+      return self._conn
+
+    @staticmethod
+    def _to_entry(row) -> dict:
+      """Converts a database row to the dict shape the CSV backend returns."""
+      return {
+        "order_id": row[0],
+        "doc_type": row[1],
+        "download": "true" if row[2] else "false",
+        "upload": "true" if row[3] else "false",
+      }
+
+    def add(self, order_id: str, doc_type: str, downloaded: bool = True, uploaded: bool = False) -> None:
+      """
+      Insert or update the state row for (order_id, doc_type).
+      """
+      logger.debug("Saving download state for Order ID: %s, Doc Type: %s, Downloaded: %s, Uploaded: %s", order_id, doc_type, downloaded, uploaded)
+      self.add_many([(order_id, doc_type, downloaded, uploaded)])
+
+    def add_many(self, rows) -> None:
+      """
+      Insert or update several (order_id, doc_type, downloaded, uploaded) rows in one statement.
+      """
+      now = time.time()
+      params = [
+        (str(order_id), "" if doc_type is None else str(doc_type), int(bool(downloaded)), int(bool(uploaded)), now)
+        for order_id, doc_type, downloaded, uploaded in rows
+      ]
+      with self._lock:
+        self.conn.executemany(self.UPSERT, params)
+        self._after_write(len(params))
+
+    def mark_uploaded(self, order_id: str, doc_type: str, uploaded: bool = True) -> None:
+      """
+      Update only the upload column of (order_id, doc_type) in one statement, keeping its download value.
+      """
+      params = (str(order_id), "" if doc_type is None else str(doc_type), int(bool(uploaded)), time.time())
+      with self._lock:
+        self.conn.execute(self.UPSERT_UPLOAD, params)
+        self._after_write(1)
+
+    def _after_write(self, count: int) -> None:
+      """Counts pending writes and commits them once the batch size or flush interval is reached."""
+      self._pending += count
+      if self._batch_depth == 0 and (
+        self._pending >= self.batch_size or time.monotonic() - self._last_commit >= self.flush_interval
+      ):
+        self._commit()
+
+    def _commit(self) -> None:
+      self.conn.commit()
+      self._pending = 0
+      self._last_commit = time.monotonic()
+
+    def flush(self) -> None:
+      """Commit all pending writes."""
+      with self._lock:
+        if self._conn is not None and self._pending:
+          self._commit()
+
+    @contextmanager
+    def batch(self):
+      """
+      Group writes into a single transaction that is committed when the block exits.
+      """
+      with self._lock:
+        self._batch_depth += 1
+      try:
+        yield self
+      finally:
+        with self._lock:
+          self._batch_depth -= 1
+          if self._batch_depth == 0:
+            self._commit()
+
+    def clear(self) -> None:
+      """
+      Delete all download state rows.
+      """
+      with self._lock:
+        self.conn.execute("DELETE FROM download_state")
+        self._commit()
+      logger.info(f"Cleared download state database: {self.db_path}")
+
+    def load(self) -> list[dict]:
+      """
+      Load and return all download state entries in insertion order.
+      """
+      with self._lock:
+        rows = self.conn.execute(f"{self.SELECT_COLUMNS} ORDER BY id").fetchall()
+      return [self._to_entry(row) for row in rows]
+
+    def exists(self, order_id: str, doc_type: str) -> bool:
+      """
+      Check if a download state entry exists for the given order_id and doc_type.
+      """
+      return self.get_state(order_id, doc_type) is not None
+
+    def get_state(self, order_id: str, doc_type: str) -> dict | None:
+      """
+      Retrieve the download state entry for the given order_id and doc_type.
+      """
+      with self._lock:
+        row = self.conn.execute(
+          f"{self.SELECT_COLUMNS} WHERE order_id = ? AND doc_type = ?", (str(order_id), str(doc_type))
+        ).fetchone()
+      return self._to_entry(row) if row else None
+
+    def get_last_entry(self) -> dict | None:
+      """
+      Retrieve the most recently written download state entry.
+
+      Upserts keep a row's original id, so rows are ordered by updated_at; rows written in
+      the same call fall back to the id.
+      """
+      with self._lock:
+        row = self.conn.execute(f"{self.SELECT_COLUMNS} ORDER BY updated_at DESC, id DESC LIMIT 1").fetchone()
+      return self._to_entry(row) if row else None
+
+    def count(self) -> int:
+      """Number of state rows."""
+      with self._lock:
+        return self.conn.execute("SELECT COUNT(*) FROM download_state").fetchone()[0]
+
+    def close(self) -> None:
+      """Commit pending writes and close the connection."""
+      with self._lock:
+        if self._conn is not None:
+          self._commit()
+          self._conn.close()
+          self._conn = None
+
+
+class SaveDownloadState:
+    """
+      Utility class to save the state of downloads.
+
+      Delegates to a pluggable backend chosen by settings.STATE_BACKEND: "sqlite" (default)
+      or "csv". When the SQLite database is first created, rows from an existing
+      application_state/downloads.csv are imported so earlier runs are not lost.
+    """
+
+    BACKENDS = {
+      "csv": CsvStateBackend,
+      "sqlite": SqliteStateBackend,
+    }
+
+    def __init__(self, backend=None):
+      self._backend = backend
+      self._backend_lock = threading.Lock()
+
+    @property
+    def backend(self):
+      """The active backend, created on first use."""
+      if self._backend is None:
+        with self._backend_lock:
+          if self._backend is None:
+            self._backend = self._create_backend(settings.STATE_BACKEND)
+      return self._backend
+
+    def _create_backend(self, name):
+      backend_class = self.BACKENDS.get(str(name).lower())
+      if backend_class is None:
+        raise ValueError(f"Unknown state backend '{name}'. Expected one of: {', '.join(self.BACKENDS)}")
+
+      backend = backend_class()
+      if isinstance(backend, SqliteStateBackend) and backend.count() == 0:
+        legacy_csv = CsvStateBackend().csv_path
+        if legacy_csv.exists():
+          imported = import_csv(backend, legacy_csv)
+          logger.info(f"Imported {imported} rows from {legacy_csv} into {backend.db_path}")
+      return backend
+
+    def add(self, order_id: str, doc_type: str, downloaded: bool = True, uploaded: bool = False) -> None:
+      """Persist a single download/upload state row."""
+      self.backend.add(order_id, doc_type, downloaded=downloaded, uploaded=uploaded)
+
+    def mark_uploaded(self, order_id: str, doc_type: str, uploaded: bool = True) -> None:
+      """Record the upload state of a report, keeping its download state."""
+      self.backend.mark_uploaded(order_id, doc_type, uploaded=uploaded)
+
+    def clear(self) -> None:
+      """Clear all download state."""
+      self.backend.clear()
+
+    def load(self) -> list[dict]:
+      """Load and return all download state entries."""
+      return self.backend.load()
+
+    def exists(self, order_id: str, doc_type: str) -> bool:
+      """Check if a download state entry exists for the given order_id and doc_type."""
+      return self.backend.exists(order_id, doc_type)
+
+    def get_state(self, order_id: str, doc_type: str) -> dict | None:
+      """Retrieve the download state entry for the given order_id and doc_type."""
+      return self.backend.get_state(order_id, doc_type)
+
+    def get_last_entry(self) -> dict | None:
+      """Retrieve the last download state entry."""
+      return self.backend.get_last_entry()
+
+    def load_index(self) -> dict:
+      """
+      Load every entry once and index it by (order_id, doc_type).
+
+      Returns:
+          dict: {(order_id, doc_type): entry} for fast membership checks while planning a run.
+      """
+      return {(entry.get("order_id"), entry.get("doc_type")): entry for entry in self.backend.load()}
+
+    def flush(self) -> None:
+      """Persist any batched writes."""
+      if self._backend is not None:
+        self._backend.flush()
+
+    def batch(self):
+      """Context manager grouping writes into one commit (where the backend supports it)."""
+      return self.backend.batch()
+
+
+def import_csv(backend, csv_path) -> int:
+    """
+    Import rows from a downloads.csv file into a state backend.
+
+    Args:
+        backend: The backend to write into.
+        csv_path (str | Path): The CSV file to read.
+
+    Returns:
+        int: The number of rows imported.
+    """
+    with Path(csv_path).open("r", newline="", encoding="utf-8") as fh:
+      rows = [
+        (row.get("order_id"), row.get("doc_type"),
+         str(row.get("download")).lower() == "true", str(row.get("upload")).lower() == "true")
+        for row in csv.DictReader(fh)
+      ]
+
+    if isinstance(backend, SqliteStateBackend):
+      with backend.batch():
+        backend.add_many(rows)
+    else:
+      for order_id, doc_type, downloaded, uploaded in rows:
+        backend.add(order_id, doc_type, downloaded=downloaded, uploaded=uploaded)
+    return len(rows)
+
+
+def export_csv(backend, csv_path) -> int:
+    """
+    Export all rows of a state backend to a downloads.csv-compatible file.
+
+    Returns:
+        int: The number of rows exported.
+    """
+    entries = backend.load()
+    csv_path = Path(csv_path)
+    create_directory_if_not_exists(csv_path.parent)
+    with csv_path.open("w", newline="", encoding="utf-8") as fh:
+      writer = csv.DictWriter(fh, fieldnames=STATE_FIELDNAMES)
+      writer.writeheader()
+      writer.writerows({k: entry.get(k, "") for k in STATE_FIELDNAMES} for entry in entries)
+    return len(entries)
+
+
+save_state = SaveDownloadState()
+atexit.register(save_state.flush)
@@ -0,0 +1,248 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from automation.config.settings import settings
+from automation.utilities.logger import logger
+from automation.utilities.file_manager import create_directory_if_not_exists
+
+
+class Tracer:
+    """
+    Records timed spans for report flows and exports them as Chrome trace events.
+
+    Three kinds of spans are recorded:
+    - "report" spans around a report (or a batch of reports), tagged with order_id,
+      report_name, report_type and page; every span opened inside one inherits its tags;
+    - "step" spans, marked with step() at the "Step N" points of the ReportDownloader
+      flows; a step runs until the next step is marked or the enclosing span ends;
+    - "wait" and "webdriver" spans for settle waits and every WebDriver command of an
+      instrumented driver.
+
+    Events are kept in memory (up to settings.TRACE_MAX_EVENTS) and written with export()
+    in the trace-event JSON format, which chrome://tracing and Perfetto can open. summary()
+    gives per-span p50/p95 latencies. Tracing is off unless settings.TRACE_ENABLED is set,
+    in which case every call is a cheap no-op.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self._threads = {}
+        self.events = []
+        self.dropped = 0
+
+    @property
+    def enabled(self):
+        return settings.TRACE_ENABLED
+
+    # --- Recording ---
+
+    @contextmanager
+    def span(self, name, cat="span", **tags):
+        """
+        Records a span around the block.
+
+        Args:
+            name (str): The span name.
+            cat (str): The category ("report", "step", "wait", "webdriver", ...).
+            **tags: Tags for this span and every span nested in it.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        frames = self._frames()
+        inherited = frames[-1]["tags"] if frames else {}
+        frame = {"tags": {**inherited, **tags}, "step": None}
+        frames.append(frame)
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._end_step(frame)
+            frames.pop()
+            self.record(name, cat, started_at, time.perf_counter() - started_at, frame["tags"])
+
+    def step(self, name):
+        """
+        Marks the start of a step of the current flow, ending the previous one.
+
+        Steps only make sense inside a span (usually the "report" span); outside of one the
+        mark is ignored.
+        """
+        if not self.enabled:
+            return
+        frames = self._frames()
+        if not frames:
+            return
+        frame = frames[-1]
+        self._end_step(frame)
+        frame["step"] = (name, time.perf_counter())
+
+    def record(self, name, cat, started_at, seconds, tags=None):
+        """
+        Records a finished span.
+
+        Args:
+            name (str): The span name.
+            cat (str): The category.
+            started_at (float): time.perf_counter() at the start of the span.
+            seconds (float): The span duration.
+            tags (dict, optional): Tags; defaults to the tags of the enclosing span.
+        """
+        if not self.enabled:
+            return
+        if tags is None:
+            frames = self._frames()
+            tags = frames[-1]["tags"] if frames else {}
+
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((started_at - self._origin) * 1e6, 1),
+            "dur": round(seconds * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": tags,
+        }
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            if len(self.events) >= settings.TRACE_MAX_EVENTS:
+                self.dropped += 1
+                return
+            self.events.append(event)
+
+    def instrument(self, driver):
+        """
+        Records a "webdriver" span for every command the driver sends.
+
+        Every WebDriver call (find_element, click, execute_script, get, ...) goes through
+        driver.execute, which is wrapped once per driver instance.
+
+        Returns:
+            The driver.
+        """
+        if not self.enabled or driver is None or getattr(driver, "_traced", False):
+            return driver
+
+        execute = driver.execute
+
+        def traced_execute(driver_command, params=None):
+            with self.span(driver_command, cat="webdriver"):
+                return execute(driver_command, params)
+
+        driver.execute = traced_execute
+        driver._traced = True
+        return driver
+
+    # --- Results ---
+
+    def summary(self, cats=("report", "step", "wait")):
+        """
+        Returns latency percentiles per span.
+
+        Args:
+            cats (tuple): Categories to include; None includes every category.
+
+        Returns:
+            dict: (cat, name) -> count, total, p50 and p95, in seconds.
+        """
+        with self._lock:
+            events = list(self.events)
+
+        durations = {}
+        for event in events:
+            if cats is None or event["cat"] in cats:
+                durations.setdefault((event["cat"], event["name"]), []).append(event["dur"] / 1e6)
+
+        return {
+            key: {
+                "count": len(values),
+                "total": sum(values),
+                "p50": self._percentile(values, 50),
+                "p95": self._percentile(values, 95),
+            }
+            for key, values in durations.items()
+        }
+
+    def report(self):
+        """Logs the step latencies, slowest first, and returns the summary."""
+        summary = self.summary()
+        if not summary:
+            return summary
+
+        for (cat, name), entry in sorted(summary.items(), key=lambda item: -item[1]["total"]):
+            logger.info(
+                f"Trace {cat} '{name}': {entry['count']} spans, p50 {entry['p50']:.2f}s, "
+                f"p95 {entry['p95']:.2f}s, {entry['total']:.1f}s total."
+            )
+        if self.dropped:
+            logger.warning(f"Trace buffer full; {self.dropped} spans were not recorded.")
+        return summary
+
+    def export(self, path=None):
+        """
+        Writes the recorded spans as Chrome trace-event JSON.
+
+        Args:
+            path (str, optional): Where to write. Defaults to settings.TRACE_PATH.
+
+        Returns:
+            str | None: The path written, or None when nothing was recorded.
+        """
+        path = path or settings.TRACE_PATH
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        if not events:
+            return None
+
+        pid = os.getpid()
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        create_directory_if_not_exists(os.path.dirname(path))
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, fh, default=str)
+
+        logger.info(f"Wrote {len(events)} trace events to {path}")
+        return path
+
+    def reset(self):
+        """Drops every recorded span."""
+        with self._lock:
+            self.events = []
+            self._threads = {}
+            self.dropped = 0
+
+    # --- Internals ---
+
+    def _frames(self):
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    def _end_step(self, frame):
+        if frame["step"] is None:
+            return
+        name, started_at = frame["step"]
+        frame["step"] = None
+        self.record(name, "step", started_at, time.perf_counter() - started_at, frame["tags"])
+
+    @staticmethod
+    def _percentile(values, percent):
+        """Nearest-rank percentile."""
+        ordered = sorted(values)
+        rank = max(1, -(-len(ordered) * percent // 100))
+        return ordered[int(rank) - 1]
+
+
+tracer = Tracer()
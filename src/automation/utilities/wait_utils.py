@@ -0,0 +1,305 @@
+import os
+import threading
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from automation.config.settings import settings
+from automation.utilities.logger import logger
+from automation.utilities.tracer import tracer
+
+
+class SettleStats:
+    """
+    Collects how long each settle step actually waited compared with the fixed
+    sleep it replaced, so a run can report how much dead time was avoided.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps = {}
+
+    def record(self, step, waited, replaces, settled):
+        """Records a single settle call."""
+        with self._lock:
+            entry = self.steps.setdefault(step, {"calls": 0, "waited": 0.0, "replaced": 0.0, "timeouts": 0})
+            entry["calls"] += 1
+            entry["waited"] += waited
+            entry["replaced"] += replaces
+            if not settled:
+                entry["timeouts"] += 1
+
+    def reset(self):
+        """Clears all recorded steps."""
+        with self._lock:
+            self.steps = {}
+
+    def summary(self):
+        """
+        Returns the per-step totals.
+
+        Returns:
+            dict: step -> calls, waited, replaced (the fixed sleep budget), avoided and timeouts.
+        """
+        with self._lock:
+            return {
+                step: {**entry, "avoided": max(0.0, entry["replaced"] - entry["waited"])}
+                for step, entry in self.steps.items()
+            }
+
+    def report(self):
+        """Logs how much sleep time the settle steps avoided and returns the summary."""
+        summary = self.summary()
+        if not summary:
+            return summary
+
+        total_waited = sum(entry["waited"] for entry in summary.values())
+        total_replaced = sum(entry["replaced"] for entry in summary.values())
+        for step, entry in sorted(summary.items(), key=lambda item: -item[1]["avoided"]):
+            logger.info(
+                f"Settle step '{step}': {entry['calls']} calls, waited {entry['waited']:.1f}s "
+                f"instead of {entry['replaced']:.1f}s ({entry['avoided']:.1f}s avoided, {entry['timeouts']} timeouts)."
+            )
+        logger.info(
+            f"Settle summary: waited {total_waited:.1f}s instead of {total_replaced:.1f}s of fixed sleeps "
+            f"({max(0.0, total_replaced - total_waited):.1f}s avoided)."
+        )
+        return summary
+
+
+settle_stats = SettleStats()
+
+
+class WaitUtils:
+
+    # Default upper bounds (seconds) for settle steps; settings.SETTLE_STEP_MAX_WAIT overrides them
+    SETTLE_STEP_MAX_WAIT = {
+        "page_load": 20,
+        "search": 15,
+        "open_modal": 15,
+    }
+
+    # Reports every readiness signal in one round-trip. A MutationObserver is installed on
+    # first use so DOM quiescence can be measured as "time since the last mutation".
+    SETTLE_PROBE_SCRIPT = """
+        const [checkGrid] = arguments;
+        if (!window.__settleObserver && document.documentElement) {
+            window.__settleLastMutation = Date.now();
+            window.__settleObserver = new MutationObserver(() => { window.__settleLastMutation = Date.now(); });
+            window.__settleObserver.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+        }
+        const visible = (el) => {
+            if (!el || !(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+            const style = window.getComputedStyle(el);
+            return style.display !== 'none' && style.visibility !== 'hidden';
+        };
+        const anyVisible = (selector) => Array.from(document.querySelectorAll(selector)).some(visible);
+        return {
+            ready: document.readyState === 'complete',
+            ajax: (typeof jQuery === 'undefined') || jQuery.active === 0,
+            overlay: !anyVisible('.ui-widget-overlay, .blockUI.blockOverlay'),
+            grid: !checkGrid || !anyVisible('.ui-jqgrid .loading, .ag-overlay-loading-wrapper'),
+            quietFor: Date.now() - (window.__settleLastMutation || 0),
+        };
+    """
+
+    def __init__(self, driver, timeout=10):
+        self.driver = driver
+        self.timeout = timeout
+
+    def settle_timeout(self, step):
+        """Returns the configured maximum wait for a settle step."""
+        if step in settings.SETTLE_STEP_MAX_WAIT:
+            return settings.SETTLE_STEP_MAX_WAIT[step]
+        return self.SETTLE_STEP_MAX_WAIT.get(step, settings.SETTLE_MAX_WAIT)
+
+    def settle(self, step, replaces=0.0, max_wait=None, grid=False, overlay=True, quiet_ms=None):
+        """
+        Waits until the page has settled instead of sleeping for a fixed time.
+
+        The page counts as settled once the document has loaded, no jQuery AJAX requests
+        are active, no blocking overlay is visible, no grid (jqGrid / ag-Grid) is showing
+        its loading indicator (when grid=True) and the DOM has not changed for quiet_ms.
+
+        Args:
+            step (str): Name of the step, used for the per-step maximum and for reporting.
+            replaces (float): The fixed sleep, in seconds, this call replaces (for reporting).
+            max_wait (float, optional): Upper bound in seconds. Defaults to the step's configured maximum.
+            grid (bool): Also wait for grid loading indicators to disappear.
+            overlay (bool): Also wait for blocking overlays to disappear.
+            quiet_ms (int, optional): Required DOM quiet period. Defaults to settings.SETTLE_QUIET_MS.
+
+        Returns:
+            bool: True if the page settled, False if max_wait elapsed first.
+        """
+        max_wait = self.settle_timeout(step) if max_wait is None else max_wait
+        quiet_ms = settings.SETTLE_QUIET_MS if quiet_ms is None else quiet_ms
+        started_at = time.perf_counter()
+        settled = False
+        state = None
+
+        while True:
+            try:
+                state = self.driver.execute_script(self.SETTLE_PROBE_SCRIPT, grid)
+            except WebDriverException:
+                # The page may be navigating; treat it as not settled yet
+                state = None
+
+            if state and state["ready"] and state["ajax"] and state["grid"] \
+                    and (state["overlay"] or not overlay) and state["quietFor"] >= quiet_ms:
+                settled = True
+                break
+
+            if time.perf_counter() - started_at >= max_wait:
+                break
+            time.sleep(settings.SETTLE_POLL_INTERVAL)
+
+        waited = time.perf_counter() - started_at
+        settle_stats.record(step, waited, replaces, settled)
+        tracer.record(f"settle:{step}", "wait", started_at, waited)
+        if settled:
+            logger.debug("Settled '%s' in %.2fs (replaces %ss sleep).", step, waited, replaces)
+        else:
+            logger.warning(f"Page did not settle for step '{step}' within {max_wait}s; last state: {state}")
+        return settled
+
+    def wait_for_number_of_windows(self, count, step="new_window", replaces=0.0, timeout=None):
+        """
+        Waits until the browser has the given number of windows open.
+
+        Returns:
+            bool: True if the window count was reached within the timeout.
+        """
+        timeout = self.settle_timeout(step) if timeout is None else timeout
+        started_at = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=settings.SETTLE_POLL_INTERVAL).until(
+                EC.number_of_windows_to_be(count)
+            )
+            settled = True
+        except TimeoutException:
+            logger.error(f"Expected {count} windows within {timeout} seconds.")
+            settled = False
+        settle_stats.record(step, time.perf_counter() - started_at, replaces, settled)
+        tracer.record(f"settle:{step}", "wait", started_at, time.perf_counter() - started_at)
+        return settled
+
+    def wait_for_element_to_be_visible(self, by_locator, timeout=None):
+        """Waits for an element to be visible on the page."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            with tracer.span("wait_visible", cat="wait", locator=str(by_locator[1])):
+                return WebDriverWait(self.driver, timeout).until(
+                    EC.visibility_of_element_located(by_locator)
+                )
+        except TimeoutException:
+            logger.error(f"Element with locator {by_locator} was not visible within {timeout} seconds.")
+            return None
+
+    def wait_for_element_to_be_clickable(self, by_locator, timeout=None):
+        """Waits for an element to be clickable on the page."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            with tracer.span("wait_clickable", cat="wait", locator=str(by_locator[1])):
+                return WebDriverWait(self.driver, timeout).until(
+                    EC.element_to_be_clickable(by_locator)
+                )
+        except TimeoutException:
+            logger.error(f"Element with locator {by_locator} was not clickable within {timeout} seconds.")
+            return None
+
+    def wait_for_presence_of_element_located(self, by_locator, timeout=None):
+        """Waits for an element to be present in the DOM."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            with tracer.span("wait_presence", cat="wait", locator=str(by_locator[1])):
+                return WebDriverWait(self.driver, timeout).until(
+                    EC.presence_of_element_located(by_locator)
+                )
+        except TimeoutException:
+            logger.error(f"Element with locator {by_locator} was not present within {timeout} seconds.")
+            return None
+        
+    def wait_for_title_contains(self, title_substring, timeout=None):
+        """Waits for the page title to contain a specific substring."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return WebDriverWait(self.driver, timeout).until(
+                EC.title_contains(title_substring)
+            )
+        except TimeoutException:
+            logger.error(f"Page title did not contain '{title_substring}' within {timeout} seconds.")
+            return False
+
+    def wait_for_page_load(self, timeout=None):
+        """
+        Wait until document.readyState == 'complete'.
+        Equivalent to waiting for the page to fully load.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            logger.info("Page load complete.")
+        except TimeoutException:
+            logger.warning("Page did not fully load within the expected timeout.")
+
+    def wait_for_ajax(self, timeout=None):
+        """
+        Wait until all jQuery AJAX requests are complete.
+        Safe even if jQuery is not present.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda d: d.execute_script(
+                    "return (typeof jQuery === 'undefined') || (jQuery.active === 0);"
+                )
+            )
+            logger.debug("All AJAX requests completed.")
+        except TimeoutException:
+            logger.warning("AJAX requests did not finish in time (or jQuery not found).")
+
+    def wait_for_download_to_complete(self, download_dir, timeout=60):
+        """
+        Waits for all Chrome `.crdownload` files to finish downloading in the given directory.
+        Returns True when all downloads are done, False if timeout.
+        """
+        logger.info(f"Waiting for downloads to complete in: {download_dir}")
+        end_time = time.time() + timeout
+
+        while time.time() < end_time:
+            try:
+                tmp_files = [
+                    f for f in os.listdir(download_dir)
+                    if f.endswith(".crdownload") or f.endswith(".tmp")
+                ]
+                if not tmp_files:
+                    logger.info("All downloads completed successfully.")
+                    return True
+            except FileNotFoundError:
+                logger.error(f"Download folder not found: {download_dir}")
+                return False
+
+            time.sleep(1)
+
+        logger.warning("Download did not complete within timeout.")
+        return False
+    
+    def wait_for_overlay_to_disappear(self, timeout=20):
+        """Waits for any jQuery UI overlay to disappear before proceeding."""
+        try:
+            WebDriverWait(self.driver, timeout).until_not(
+                EC.presence_of_element_located((By.CLASS_NAME, "ui-widget-overlay"))
+            )
+            logger.debug("Overlay cleared — safe to click next element.")
+            return True
+        except TimeoutException:
+            logger.warning("Overlay still present after waiting; forcing hide via JS.")
+            self.driver.execute_script("""
+                document.querySelectorAll('.ui-widget-overlay').forEach(o => o.style.display = 'none');
+            """)
+            return False
+
@@ -1,21 +1,44 @@
 import os
+import re
+import shutil
+import threading
+import time
+import zipfile
 
 from automation.ui.navigation import Navigation
 from automation.ui.page_base import PageBase
-from automation.utilities.excel_reader import excel_reader
-from automation.utilities.save_download_state import save_state
+from automation.utilities.excel_reader import ExcelStreamReader, excel_reader
+from automation.utilities.wait_utils import settle_stats
 from automation.utilities.file_manager import (
     create_directory_if_not_exists,
     check_if_folder_exists,
+    move_file,
     remove_directory
 )
 from automation.utilities.report_downloader import ReportDownloader
+from automation.utilities.direct_downloader import direct_downloader
+from automation.utilities.download_tracker import DownloadTracker
+from automation.utilities.tracer import tracer
 from automation.config.settings import settings
 from automation.utilities.excel_mapper import ReportPageMapperKeys, report_mapper
 from automation.utilities.save_download_state import save_state
 
+from automation.workflows.scheduler import ReportScheduler
+from automation.workflows.upload_pipeline import UploadPipeline
+from automation.authentication.login import authenticate
+from automation.utilities.memory_watchdog import MemoryWatchdog
 from automation.utilities.logger import logger
-# from .upload_reports import UploadReportsWorkflow
+
+class ResumePolicy:
+    """How a run treats reports already recorded in the download state store."""
+    RESUME = "resume"  # Skip reports that were downloaded
+    FORCE = "force"  # Download everything again
+    RETRY_FAILED = "retry_failed"  # Only download reports that were attempted and not confirmed
+
+    @classmethod
+    def get_all_keys(cls):
+        """Returns all resume policies as a list."""
+        return [cls.RESUME, cls.FORCE, cls.RETRY_FAILED]
 
 class DownloadReportsWorkflow(PageBase):
     """
@@ -24,121 +47,661 @@ class DownloadReportsWorkflow(PageBase):
 
     CUSTOM_FIELDS = None
 
-    def __init__(self, driver = None):
+    def __init__(self, driver = None, load_excel=True, scheduler=None, upload_pipeline=None, session_manager=None):
         """
         Initializes the DownloadReportsWorkflow.
 
         Args:
             driver: The Selenium WebDriver instance.
+            load_excel (bool): Whether to (re)load the Excel sheet. Worker pools load it
+                               once up front and pass False for each worker.
+            scheduler (ReportScheduler, optional): Receives the observed latency of every order.
+            upload_pipeline (UploadPipeline, optional): Receives every order whose downloads are
+                               confirmed. run() starts one when settings.PIPELINE_UPLOADS is on.
+            session_manager (SessionManager, optional): Owns the driver. With it, and
+                               settings.MEMORY_WATCHDOG on, the session is restarted between
+                               orders when it uses too much memory.
         """
+        self.scheduler = scheduler
+        self.upload_pipeline = upload_pipeline
+        self._owns_upload_pipeline = False
+        self.session_manager = session_manager
+        self.memory_watchdog = (
+            MemoryWatchdog(threading.current_thread().name)
+            if settings.MEMORY_WATCHDOG and session_manager is not None else None
+        )
+        if load_excel:
+            excel_reader.read_excel_file(sheet_name="Sheet1", custom_fields=self.CUSTOM_FIELDS)
+        self.report_keys = report_mapper.get_all_keys()
+        self.save_state = save_state
+        # Order ID -> names of the reports whose downloads were confirmed in this run
+        self.confirmed_downloads = {}
+        self._attach(driver)
+
+    def _attach(self, driver):
+        """Binds the workflow and the page objects and helpers it owns to a driver."""
         super().__init__(driver)
         self.navigation = Navigation(driver)
-        excel_reader.read_excel_file(sheet_name="Sheet1", custom_fields=self.CUSTOM_FIELDS)
-        self.report_keys = report_mapper.get_all_keys()
         self.download_function = ReportDownloader(driver)
-        self.save_state = save_state
+        self.download_tracker = DownloadTracker(driver)
+        if settings.TRACK_DOWNLOADS:
+            self.download_tracker.start()
 
-    def run(self):
-        """Runs the download reports workflow."""
-        logger.info("Starting the download reports workflow.")
+    def _detach(self):
+        """Stops the helpers bound to the current driver and logs their summaries."""
+        self.download_function.context.report()
+        summary = self.download_tracker.summary()
+        if summary["count"]:
+            logger.info(
+                f"Tracked {summary['count']} downloads: {summary['completed']} completed, "
+                f"{summary['canceled']} canceled, {summary['bytes']} bytes in {summary['seconds']:.1f}s."
+            )
+        self.download_tracker.stop()
 
-        last_downloaded_order = self.save_state.get_last_entry()
+    def close(self):
+        """Stops the background helpers owned by the workflow and logs their summaries."""
+        self._detach()
+        if self.memory_watchdog and self.memory_watchdog.orders:
+            summary = self.memory_watchdog.summary()
+            logger.info(
+                f"Memory watchdog: {summary['recycles']} session recycles over {summary['orders']} orders, "
+                f"peak browser RSS {summary['peak_rss_mb']} MB (samples in {settings.MEMORY_LOG_PATH})."
+            )
+        if self._owns_upload_pipeline:
+            # Downloads are done; wait for the uploads still queued behind them
+            self.upload_pipeline.close()
+            self.upload_pipeline = None
+            self._owns_upload_pipeline = False
 
-        print(f"Last downloaded order: {last_downloaded_order}")
-        try:
-            if last_downloaded_order.get("order_id"):
-                logger.info(f"Resuming from last downloaded order ID: {last_downloaded_order.get('order_id')}")
-        except Exception:
-            logger.info("No previous download state found, starting fresh.")
+    @classmethod
+    def build_plan(cls, policy=None):
+        """
+        Builds the work plan from the loaded Excel sheet and the download state store.
 
-        # return
+        The state store is read once and every report is checked against it in memory, so
+        this runs before any browser is started and a resumed run goes straight to the
+        first report that still needs work.
 
-        # Get data from the Excel file
+        Args:
+            policy (str, optional): One of ResumePolicy. Defaults to settings.RESUME_POLICY.
+
+        Returns:
+            dict: Order IDs mapped to the report rows still to download, in Excel order.
+                  Orders with nothing left to do are left out.
+        """
+        policy, state = cls._load_resume_state(policy)
         orders = excel_reader.get_orders_from_excel()
 
-        if not orders:
-            logger.error("No orders found in the Excel file.")
-            return
+        plan = {}
+        total = 0
+        for order_id in orders:
+            reports = excel_reader.get_order_data_from_excel(order_id=order_id) or []
+            total += len(reports)
+            pending = cls._pending_reports(policy, state, order_id, reports)
+            if pending:
+                plan[order_id] = pending
+
+        remaining = sum(len(reports) for reports in plan.values())
+        logger.info(
+            f"Work plan ({policy}): {remaining} of {total} reports across {len(plan)} of {len(orders)} orders; "
+            f"{total - remaining} skipped."
+        )
+        return plan
+
+    @classmethod
+    def stream_plan(cls, policy=None, sheet_name="Sheet1"):
+        """
+        Streams the work plan straight from the workbook instead of the loaded sheet.
+
+        Orders are yielded as soon as their rows are parsed (see ExcelStreamReader), so the
+        first downloads start while the rest of a very large sheet is still being read. The
+        sheet must be grouped by Order ID.
+
+        Args:
+            policy (str, optional): One of ResumePolicy. Defaults to settings.RESUME_POLICY.
+            sheet_name (str): The sheet to stream. Defaults to "Sheet1".
+
+        Yields:
+            tuple: (order_id, report rows still to download).
+        """
+        policy, state = cls._load_resume_state(policy)
+        if cls.CUSTOM_FIELDS is not None:
+            excel_reader.COLUMNS_MAPPER.set_multiple_custom_fields(cls.CUSTOM_FIELDS)
+
+        total = remaining = 0
+        for order_id, reports in ExcelStreamReader(sheet_name=sheet_name).iter_orders():
+            total += len(reports)
+            pending = cls._pending_reports(policy, state, order_id, reports)
+            if pending:
+                remaining += len(pending)
+                yield order_id, pending
+
+        logger.info(f"Streamed work plan ({policy}): {remaining} of {total} reports; {total - remaining} skipped.")
+
+    @staticmethod
+    def _load_resume_state(policy):
+        """Validates the resume policy and loads the state store index it needs."""
+        policy = str(policy or settings.RESUME_POLICY).lower()
+        if policy not in ResumePolicy.get_all_keys():
+            raise ValueError(f"Unknown resume policy '{policy}'. Expected one of: {', '.join(ResumePolicy.get_all_keys())}")
+        state = {} if policy == ResumePolicy.FORCE else save_state.load_index()
+        return policy, state
+
+    @classmethod
+    def _pending_reports(cls, policy, state, order_id, reports):
+        """Returns the report rows of an order the resume policy still wants downloaded."""
+        return [
+            report_data for report_data in reports
+            if cls._needs_download(policy, state.get(
+                (str(order_id), str(report_data.get(excel_reader.COLUMNS_MAPPER.REPORT_NAME)))
+            ))
+        ]
+
+    @staticmethod
+    def _needs_download(policy, entry):
+        """Decides from a state store entry (or None) whether a report goes into the plan."""
+        downloaded = bool(entry) and str(entry.get("download")).lower() == "true"
+        if policy == ResumePolicy.FORCE:
+            return True
+        if policy == ResumePolicy.RETRY_FAILED:
+            return bool(entry) and not downloaded
+        return not downloaded
+
+    def run(self, plan=None):
+        """
+        Runs the download reports workflow.
+
+        Args:
+            plan (dict | iterable, optional): A plan from build_plan(), or the (order_id, reports)
+                                              pairs from stream_plan(). Built here when not given.
+        """
+        logger.info("Starting the download reports workflow.")
+
+        if plan is None:
+            plan = self.stream_plan() if settings.EXCEL_STREAMING else self.build_plan()
+
+        if isinstance(plan, dict):
+            if not plan:
+                logger.info("Nothing to download; every report in the Excel file is already done.")
+                self.close()
+                return
+            plan = plan.items()
 
-        for order_id in orders:            
-            logger.info(f"Setting up download for Order ID: {order_id}")
-            reports_download_path = os.path.join(settings.DOWNLOAD_PATH, str(order_id))
-            create_directory_if_not_exists(reports_download_path)
+        if settings.PRIORITY_SCHEDULING:
+            plan = self.scheduler = ReportScheduler(plan)
+
+        if settings.PIPELINE_UPLOADS and self.upload_pipeline is None:
+            self.upload_pipeline = UploadPipeline().start()
+            self._owns_upload_pipeline = True
+
+        for window in self.iter_windows(plan):
+            self.process_orders(window)
+
+        if self.scheduler:
+            self.scheduler.report()
+        settle_stats.report()
+        self.close()
+        logger.info("Download reports workflow completed.")
+
+    @staticmethod
+    def iter_windows(items, size=None):
+        """
+        Groups (order_id, reports) pairs into lists of settings.INBOUND_BATCH_SIZE orders.
+
+        Yields:
+            list: The next window of (order_id, reports) pairs.
+        """
+        size = max(1, int(size or settings.INBOUND_BATCH_SIZE))
+        window = []
+        for item in items:
+            window.append(item)
+            if len(window) >= size:
+                yield window
+                window = []
+        if window:
+            yield window
+
+    def process_orders(self, items):
+        """
+        Processes a window of orders, downloading shared inbound reports in batches first.
+
+        Args:
+            items (list): (order_id, reports) pairs.
+        """
+        planned = list(items)
+        if settings.INBOUND_BATCH_SIZE > 1 and len(items) > 1:
+            started_at = time.perf_counter()
+            queued = sum(len(reports or []) for _, reports in items)
+            items = self.download_inbound_batches(items)
+            if self.scheduler:
+                batched = queued - sum(len(reports or []) for _, reports in items)
+                self.scheduler.record(batched, time.perf_counter() - started_at)
+
+        for order_id, reports in items:
+            if reports is not None and not reports:
+                logger.info(f"Every report for Order ID: {order_id} was downloaded in a batch.")
+                self.recycle_session_if_needed()
+                continue
+            started_at = time.perf_counter()
+            self.process_order(order_id, reports)
+            if self.scheduler:
+                self.scheduler.record(len(reports or []), time.perf_counter() - started_at)
+            self.recycle_session_if_needed()
+
+        if self.upload_pipeline:
+            for order_id, reports in planned:
+                self.upload_pipeline.submit_if_confirmed(
+                    order_id, reports, self.confirmed_downloads.get(str(order_id), set())
+                )
+
+    def recycle_session_if_needed(self):
+        """
+        Restarts and logs in the browser session if the memory watchdog says it is due.
+
+        Called between orders, where no download or dialog is in flight.
+
+        Returns:
+            bool: True if the session was recycled.
+
+        Raises:
+            RuntimeError: If the new session could not be started or logged in.
+        """
+        if self.memory_watchdog is None:
+            return False
+        reason = self.memory_watchdog.check(self.driver)
+        if not reason:
+            return False
+
+        logger.warning(f"Recycling the browser session after {self.memory_watchdog.orders} orders: {reason}")
+        started_at = time.perf_counter()
+        with tracer.span("recycle_session", cat="session", reason=reason):
+            self._detach()
+            driver = self.session_manager.restart_session()
+            if driver:
+                driver = authenticate(self.session_manager, driver)
+            if not driver:
+                raise RuntimeError("The browser session could not be recycled.")
+            self._attach(driver)
+
+        seconds = time.perf_counter() - started_at
+        self.memory_watchdog.recycled(reason, seconds)
+        logger.info(f"Browser session recycled in {seconds:.1f}s.")
+        return True
+
+    def download_inbound_batches(self, items):
+        """
+        Downloads inbound reports shared by several orders through one Print/Download modal each.
+
+        Reports are grouped by (report name, report type). Every group of two or more orders
+        is downloaded into a staging folder and the files are routed back to the order folders
+        by the order ID in their names. Reports that could not be batched or routed stay in
+        the returned plan and are downloaded one by one.
+
+        Args:
+            items (list): (order_id, reports) pairs.
+
+        Returns:
+            list: The same pairs without the reports that were downloaded in a batch.
+        """
+        groups = {}
+        for order_id, reports in items:
+            for report_data in reports or []:
+                report_name = report_data.get(excel_reader.COLUMNS_MAPPER.REPORT_NAME)
+                report_type = report_data.get(excel_reader.COLUMNS_MAPPER.REPORT_TYPE)
+                page = report_data.get(excel_reader.COLUMNS_MAPPER.PAGE)
+                if report_name and report_mapper.get_key(page) == ReportPageMapperKeys.INBOUND:
+                    groups.setdefault((report_name, report_type), []).append(order_id)
+
+        done = set()
+        for (report_name, report_type), order_ids in groups.items():
+            if len(order_ids) < 2:
+                continue
+            with tracer.span(
+                "download_inbound_batch", cat="report", order_id=[str(order_id) for order_id in order_ids],
+                report_name=report_name, report_type=report_type, page=ReportPageMapperKeys.INBOUND,
+            ):
+                for order_id in self._download_inbound_batch(report_name, report_type, order_ids):
+                    done.add((str(order_id), report_name))
 
+        if done:
+            logger.info(f"Downloaded {len(done)} inbound reports in batches.")
+        return [
+            (order_id, [
+                report_data for report_data in reports
+                if (str(order_id), report_data.get(excel_reader.COLUMNS_MAPPER.REPORT_NAME)) not in done
+            ] if reports is not None else None)
+            for order_id, reports in items
+        ]
+
+    def _download_inbound_batch(self, report_name, report_type, order_ids):
+        """
+        Downloads one inbound report for several orders and routes the files to the order folders.
+
+        Returns:
+            list: The order IDs whose report was downloaded and routed.
+        """
+        staging_path = os.path.join(settings.DOWNLOAD_PATH, "_batch", f"{int(time.time() * 1000)}")
+        create_directory_if_not_exists(staging_path)
+        if not self.download_tracker.set_download_path(staging_path):
             self.driver.execute_cdp_cmd("Page.setDownloadBehavior", {
                 "behavior": "allow",
-                "downloadPath": reports_download_path
+                "downloadPath": staging_path
             })
 
-            if not order_id:
-                logger.warning("Skipping row with no Order ID.")
-                continue
+        with self.save_state.batch():
+            for order_id in order_ids:
+                self.save_state.add(order_id, report_name, downloaded=False, uploaded=False)
+
+        # A batch arrives as one archive or as one file per order; every file can be tracked
+        label = f"batch_{order_ids[0]}"
+        tracked_downloads = [self.download_tracker.expect(label, report_name) for _ in order_ids]
+
+        try:
+            selected = self.download_function.download_inbound_batch(
+                locator=ReportPageMapperKeys.INBOUND,
+                report_name=report_name,
+                order_ids=order_ids,
+                report_type=report_type,
+            )
+        except Exception:
+            for tracked_download in tracked_downloads:
+                self.download_tracker.discard(tracked_download)
+            self.download_function.context.invalidate()
+            raise
+        if not selected:
+            for tracked_download in tracked_downloads:
+                self.download_tracker.discard(tracked_download)
+            remove_directory(staging_path)
+            return []
+
+        tracer.step("wait_download")
+        if tracked_downloads[0]:
+            files = self._wait_for_batch_downloads(tracked_downloads[:len(selected)], staging_path)
+            for tracked_download in tracked_downloads[len(selected):]:
+                self.download_tracker.discard(tracked_download)
+        else:
+            files = self._wait_for_batch_files(staging_path)
+        routed = self._route_batch_files(files, selected, staging_path)
+
+        with self.save_state.batch():
+            for order_id in routed:
+                self.save_state.add(order_id, report_name, downloaded=True, uploaded=False)
+                self._download_confirmed(order_id, report_name)
+
+        unrouted = [order_id for order_id in selected if order_id not in routed]
+        if unrouted:
+            logger.warning(f"No '{report_name}' file could be routed for orders {unrouted}; they are downloaded one by one.")
+        if not os.listdir(staging_path):
+            remove_directory(staging_path)
+        else:
+            logger.warning(f"Unrouted batch files were kept in: {staging_path}")
+
+        # The original Excel values, so the caller can match them against its plan
+        return [order_id for order_id in order_ids if str(order_id) in routed]
+
+    def _wait_for_batch_downloads(self, tracked_downloads, staging_path):
+        """
+        Waits for the download events of a batch: the first file, then any further files
+        that start within settings.INBOUND_BATCH_FILE_GRACE of it.
+
+        Returns:
+            list: Paths of the finished files.
+        """
+        first, *others = tracked_downloads
+        if self.download_tracker.wait(first) is None:
+            for tracked_download in others:
+                self.download_tracker.discard(tracked_download)
+            return []
+        for tracked_download in others:
+            if tracked_download.begun.wait(settings.INBOUND_BATCH_FILE_GRACE):
+                self.download_tracker.wait(tracked_download)
+            else:
+                self.download_tracker.discard(tracked_download)
+
+        # Chrome may rename files whose names collide, so the folder is read rather than the events
+        return [
+            os.path.join(staging_path, name) for name in os.listdir(staging_path)
+            if not name.endswith((".crdownload", ".tmp"))
+        ]
 
-            logger.info(f"Processing order: {order_id}")
-            order_data = excel_reader.get_order_data_from_excel(order_id=order_id)
+    def _wait_for_batch_files(self, staging_path, timeout=None):
+        """
+        Waits until the staging folder has files and no download is in progress any more.
+        Used when download events are not tracked.
+
+        Returns:
+            list: Paths of the finished files.
+        """
+        timeout = settings.DOWNLOAD_TIMEOUT if timeout is None else timeout
+        deadline = time.perf_counter() + timeout
+        previous = None
+        while time.perf_counter() < deadline:
+            names = sorted(os.listdir(staging_path))
+            in_progress = any(name.endswith((".crdownload", ".tmp")) for name in names)
+            # Done once the file list is stable across two polls with nothing still downloading
+            if names and not in_progress and names == previous:
+                return [os.path.join(staging_path, name) for name in names]
+            previous = names
+            time.sleep(1)
 
-            if not order_data:
-                logger.warning(f"No data found for Order ID: {order_id}. Skipping.")
+        logger.warning(f"Batch download into {staging_path} did not finish within {timeout}s.")
+        return [
+            os.path.join(staging_path, name) for name in os.listdir(staging_path)
+            if not name.endswith((".crdownload", ".tmp"))
+        ]
+
+    def _route_batch_files(self, files, order_ids, staging_path):
+        """
+        Moves batch files into the folder of the single order whose ID appears in the file name.
+        Zip archives are unpacked and their members routed the same way. A batch of one order
+        that produced one file is routed to that order.
+
+        Returns:
+            set: The order IDs that received at least one file.
+        """
+        candidates = []
+        for path in files:
+            if zipfile.is_zipfile(path):
+                with zipfile.ZipFile(path) as archive:
+                    for member in archive.infolist():
+                        if member.is_dir():
+                            continue
+                        target = os.path.join(staging_path, os.path.basename(member.filename))
+                        with archive.open(member) as src, open(target, "wb") as dst:
+                            shutil.copyfileobj(src, dst)
+                        candidates.append(target)
+                os.remove(path)
+            else:
+                candidates.append(path)
+
+        routed = set()
+        for path in candidates:
+            name = os.path.basename(path)
+            matches = [
+                order_id for order_id in order_ids
+                if re.search(rf"(?<![0-9A-Za-z]){re.escape(order_id)}(?![0-9A-Za-z])", name)
+            ]
+            if len(matches) != 1 and len(order_ids) == 1 and len(candidates) == 1:
+                matches = list(order_ids)
+            if len(matches) != 1:
                 continue
 
-            # Create a directory for the order
-            order_download_path = os.path.join(settings.DOWNLOAD_PATH, str(order_id))
+            order_download_path = os.path.join(settings.DOWNLOAD_PATH, matches[0])
             create_directory_if_not_exists(order_download_path)
+            move_file(path, os.path.join(order_download_path, name))
+            routed.add(matches[0])
+        return routed
 
-            for report_data in order_data:
-                report_name = report_data.get(excel_reader.COLUMNS_MAPPER.REPORT_NAME)
-                report_type = report_data.get(excel_reader.COLUMNS_MAPPER.REPORT_TYPE)
-                page = report_data.get(excel_reader.COLUMNS_MAPPER.PAGE)
+    def process_order(self, order_id, reports=None):
+        """
+        Downloads every report listed in the Excel sheet for a single order.
+
+        Args:
+            order_id (str): The order to process.
+            reports (list, optional): The report rows to download, usually from build_plan().
+                                      Defaults to every row of the order in the Excel sheet.
+
+        Returns:
+            bool: False if the order was skipped, True otherwise.
+        """
+        if not order_id:
+            logger.warning("Skipping row with no Order ID.")
+            return False
+
+        logger.info(f"Setting up download for Order ID: {order_id}")
+        order_download_path = os.path.join(settings.DOWNLOAD_PATH, str(order_id))
+        create_directory_if_not_exists(order_download_path)
+
+        if not self.download_tracker.set_download_path(order_download_path):
+            self.driver.execute_cdp_cmd("Page.setDownloadBehavior", {
+                "behavior": "allow",
+                "downloadPath": order_download_path
+            })
+
+        logger.info(f"Processing order: {order_id}")
+        order_data = reports if reports is not None else excel_reader.get_order_data_from_excel(order_id=order_id)
+
+        if not order_data:
+            logger.warning(f"No data found for Order ID: {order_id}. Skipping.")
+            return False
+
+        for report_data in order_data:
+            self.download_report(order_id, report_data, order_download_path)
+
+        return True
+
+    def download_report(self, order_id, report_data, order_download_path):
+        """
+        Dispatches a single report row to the matching ReportDownloader method.
+
+        The report is traced as one "report" span tagged with the order, report and page.
+
+        Args:
+            order_id (str): The order the report belongs to.
+            report_data (dict): The Excel row describing the report.
+            order_download_path (str): The folder the report is downloaded into.
+        """
+        with tracer.span(
+            "download_report", cat="report", order_id=str(order_id),
+            report_name=report_data.get(excel_reader.COLUMNS_MAPPER.REPORT_NAME),
+            report_type=report_data.get(excel_reader.COLUMNS_MAPPER.REPORT_TYPE),
+            page=report_data.get(excel_reader.COLUMNS_MAPPER.PAGE),
+        ):
+            self._download_report(order_id, report_data, order_download_path)
+
+    def _download_report(self, order_id, report_data, order_download_path):
+        report_name = report_data.get(excel_reader.COLUMNS_MAPPER.REPORT_NAME)
+        report_type = report_data.get(excel_reader.COLUMNS_MAPPER.REPORT_TYPE)
+        page = report_data.get(excel_reader.COLUMNS_MAPPER.PAGE)
+
+        logger.info(f"Preparing to download report for Order ID: {order_id} - Report Name: {report_name}, Report Type: {page}")
+        self.save_state.add(order_id, report_name, downloaded=False, uploaded=False)
+
+        if not report_name:
+            logger.warning(f"Skipping report with no name for Order ID: {order_id}.")
+            return
+
+        report_name_map = report_mapper.get_key(page)
+        logger.debug("Report map for report : %s is map: %s", report_name, report_name_map)
+        if report_name_map is None:
+            logger.warning(f"Report name '{report_name}' not recognized. Skipping download.")
+            return
+
+        direct_key = direct_downloader.template_key(report_name_map, report_name, report_type)
+        if direct_downloader.enabled:
+            if direct_downloader.has_template(direct_key) and direct_downloader.download(
+                self.driver, direct_key, order_id, report_name, order_download_path
+            ):
+                self.save_state.add(order_id, report_name, downloaded=True, uploaded=False)
+                self._download_confirmed(order_id, report_name)
+                return
+            direct_downloader.begin_capture(self.driver)
+
+        tracked_download = self.download_tracker.expect(order_id, report_name)
+        started = None
 
-                logger.info(f"Preparing to download report for Order ID: {order_id} - Report Name: {report_name}, Report Type: {page}")
-                save_state.add(order_id, report_name, downloaded=False, uploaded=False)
-
-                if not report_name:
-                    logger.warning(f"Skipping report with no name for Order ID: {order_id}.")
-                    continue
-
-                report_name_map = report_mapper.get_key(page)
-                logger.info(f"Report map for report : {report_name} is map: {report_name_map}")
-                if report_name_map is None:
-                    logger.warning(f"Report name '{report_name}' not recognized. Skipping download.")
-                    continue
-
-                if report_name_map == ReportPageMapperKeys.INBOUND:
-                    self.download_function.download_inbound_page(
-                        locator=ReportPageMapperKeys.INBOUND,
-                        report_name=report_name,
-                        download_path=order_download_path,
-                        order_id=order_id,
-                        report_type=report_type
-                    )
-                elif report_name_map == ReportPageMapperKeys.INVOICE:
-                    self.download_function.download_transaction_report(
-                        locator=ReportPageMapperKeys.INVOICE, 
-                        report_name=report_name, 
-                        download_path=order_download_path,
-                        order_id=order_id, 
-                        report_type=report_type
-                    )
-                elif report_name_map is ReportPageMapperKeys.SETTLEMENT:
-                    continue
-                    self.download_function.download_settlement_page(
-                        locator=ReportPageMapperKeys.SETTLEMENT,
-                        report_name=report_name,
-                        download_path=order_download_path,
-                        order_id=order_id,
-                        report_type=report_type
+        try:
+            if report_name_map == ReportPageMapperKeys.INBOUND:
+                started = self.download_function.download_inbound_page(
+                    locator=ReportPageMapperKeys.INBOUND,
+                    report_name=report_name,
+                    download_path=order_download_path,
+                    order_id=order_id,
+                    report_type=report_type
+                )
+            elif report_name_map == ReportPageMapperKeys.INVOICE:
+                started = self.download_function.download_transaction_report(
+                    locator=ReportPageMapperKeys.INVOICE, 
+                    report_name=report_name, 
+                    download_path=order_download_path,
+                    order_id=order_id, 
+                    report_type=report_type
                 )
-                elif report_name_map is ReportPageMapperKeys.AUDIT:
-                    self.download_function.download_audit_report(
-                        locator=ReportPageMapperKeys.AUDIT,
-                        report_name=report_name,
-                        download_path=order_download_path,
-                        order_id=order_id,
-                        report_type=report_type
-                    )
-                else:
-                    logger.warning(f"No download method defined for report type: {report_name_map}")
-
-            # DownloadReportsWorkflow
-
-        logger.info("Download reports workflow completed.")
\ No newline at end of file
+            elif report_name_map is ReportPageMapperKeys.SETTLEMENT:
+                self.download_tracker.discard(tracked_download)
+                return
+                self.download_function.download_settlement_page(
+                    locator=ReportPageMapperKeys.SETTLEMENT,
+                    report_name=report_name,
+                    download_path=order_download_path,
+                    order_id=order_id,
+                    report_type=report_type
+            )
+            elif report_name_map is ReportPageMapperKeys.AUDIT:
+                started = self.download_function.download_audit_report(
+                    locator=ReportPageMapperKeys.AUDIT,
+                    report_name=report_name,
+                    download_path=order_download_path,
+                    order_id=order_id,
+                    report_type=report_type
+                )
+            else:
+                logger.warning(f"No download method defined for report type: {report_name_map}")
+                self.download_tracker.discard(tracked_download)
+                return
+        except Exception:
+            # The page was left in an unknown state; the next report must not trust the context
+            self.download_tracker.discard(tracked_download)
+            self.download_function.context.invalidate()
+            raise
+
+        if started is False:
+            # The page was left in an unknown state; the next report starts from scratch
+            self.download_function.context.invalidate()
+
+        if tracked_download:
+            tracer.step("wait_download")
+            self._confirm_download(tracked_download, started)
+        elif started:
+            # Without download events the click path's result is the only confirmation there is
+            self.save_state.add(order_id, report_name, downloaded=True, uploaded=False)
+
+        if direct_downloader.enabled and direct_downloader.should_capture(direct_key):
+            direct_downloader.capture(self.driver, direct_key, order_id)
+
+    def _download_confirmed(self, order_id, report_name):
+        """Remembers a confirmed download for the upload pipeline."""
+        self.confirmed_downloads.setdefault(str(order_id), set()).add(report_name)
+
+    def _confirm_download(self, tracked_download, started):
+        """
+        Waits for the browser to confirm a triggered download and records it in the state store.
+
+        Args:
+            tracked_download (TrackedDownload): The download registered before the report was triggered.
+            started (bool | None): The ReportDownloader result; False means nothing was triggered.
+        """
+        if started is False:
+            self.download_tracker.discard(tracked_download)
+            return
+
+        record = self.download_tracker.wait(tracked_download)
+        if record and record["state"] == "completed":
+            self.save_state.add(tracked_download.order_id, tracked_download.report_name, downloaded=True, uploaded=False)
+            self._download_confirmed(tracked_download.order_id, tracked_download.report_name)
+        else:
+            # A timed out or canceled download must be retried by the next resumed run
+            self.save_state.add(tracked_download.order_id, tracked_download.report_name, downloaded=False, uploaded=False)
+            logger.warning(
+                f"Download for order {tracked_download.order_id}, report '{tracked_download.report_name}' was not confirmed."
+            )
@@ -0,0 +1,195 @@
+import heapq
+import itertools
+import threading
+import time
+
+from automation.config.settings import settings
+from automation.utilities.excel_reader import excel_reader
+from automation.utilities.logger import logger
+
+
+class ReportScheduler:
+    """
+    Orders the work plan by the PRIORITY column of the Excel sheet.
+
+    Orders are scheduled whole, at the priority of their most urgent report, so an order
+    is handed to one session once and its uploads see all of its reports. Orders are
+    served from a heap keyed by priority (lower is more urgent), then by deadline, then
+    by arrival. With aging, every settings.PRIORITY_AGING_SECONDS an order waits counts
+    as one priority level, so a long stream of urgent orders cannot starve the rest.
+
+    Deadlines (settings.PRIORITY_DEADLINES, seconds from the start of the run per priority)
+    are checked against an exponential moving average of the observed per-report latency;
+    a warning is logged when the reports queued up to a deadline are not expected to make it.
+
+    The scheduler is an iterator of (order_id, reports) pairs and is thread-safe, so the
+    single-session workflow and every worker of the pool can pull from the same instance.
+    A streamed plan is read ahead settings.SCHEDULER_LOOKAHEAD orders at a time.
+    """
+
+    # Text priorities some sheets use instead of numbers
+    NAMED_PRIORITIES = {"urgent": 0, "critical": 0, "high": 1, "medium": 2, "normal": 2, "low": 3}
+
+    # Weight of the latest observation in the per-report latency average
+    LATENCY_ALPHA = 0.2
+
+    def __init__(self, plan, workers=1):
+        """
+        Initializes the ReportScheduler.
+
+        Args:
+            plan (dict | iterable): A plan from build_plan(), or the pairs from stream_plan().
+            workers (int): How many sessions pull from the scheduler, used for deadline estimates.
+        """
+        self.workers = max(1, int(workers))
+        self.started_at = time.perf_counter()
+        self.deadlines = {
+            self.parse_priority(priority): float(seconds)
+            for priority, seconds in settings.PRIORITY_DEADLINES.items()
+        }
+        self.aging_seconds = settings.PRIORITY_AGING_SECONDS
+        # A loaded plan is scheduled as a whole; a streamed one through a bounded lookahead
+        self.lookahead = float("inf") if isinstance(plan, dict) else max(1, settings.SCHEDULER_LOOKAHEAD)
+        self.latency = None
+        self.completed = 0
+
+        self._source = iter(plan.items() if isinstance(plan, dict) else plan)
+        self._exhausted = False
+        self._heap = []
+        self._queued_reports = {}
+        self._sequence = itertools.count()
+        self._warned = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse_priority(cls, value):
+        """
+        Converts a PRIORITY cell to a number; lower numbers are more urgent.
+
+        Returns:
+            float: The priority, or settings.DEFAULT_PRIORITY for empty or unknown values.
+        """
+        if value is None or value != value:  # None or NaN
+            return float(settings.DEFAULT_PRIORITY)
+        if isinstance(value, (int, float)):
+            return float(value)
+
+        text = str(value).strip().lower()
+        if text in cls.NAMED_PRIORITIES:
+            return float(cls.NAMED_PRIORITIES[text])
+        try:
+            return float(text.lstrip("p"))
+        except ValueError:
+            return float(settings.DEFAULT_PRIORITY)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._lock:
+            self._fill()
+            if not self._heap:
+                raise StopIteration
+
+            _, _, _, order_id, reports = heapq.heappop(self._heap)
+            for priority in self._priorities(reports):
+                self._queued_reports[priority] -= 1
+            self._check_deadlines()
+            return order_id, reports
+
+    def record(self, reports, seconds):
+        """
+        Records how long an order took, updating the latency average and the deadline checks.
+
+        Args:
+            reports (int): Number of reports processed.
+            seconds (float): Wall time spent on it.
+        """
+        if reports <= 0:
+            return
+        with self._lock:
+            per_report = seconds / reports
+            if self.latency is None:
+                self.latency = per_report
+            else:
+                self.latency += self.LATENCY_ALPHA * (per_report - self.latency)
+            self.completed += reports
+            self._check_deadlines()
+
+    def summary(self):
+        """
+        Returns the scheduler state for the run summary.
+
+        Returns:
+            dict: completed reports, average latency, queued reports per priority and the
+                  priorities whose deadline was reported at risk.
+        """
+        with self._lock:
+            return {
+                "completed": self.completed,
+                "latency": self.latency,
+                "queued": {p: n for p, n in sorted(self._queued_reports.items()) if n},
+                "at_risk": sorted(self._warned),
+            }
+
+    def report(self):
+        """Logs the summary."""
+        summary = self.summary()
+        latency = f"{summary['latency']:.1f}s" if summary["latency"] is not None else "n/a"
+        logger.info(
+            f"Scheduler: {summary['completed']} reports completed, {latency} per report"
+            + (f", deadlines at risk for priorities {summary['at_risk']}" if summary["at_risk"] else "")
+            + "."
+        )
+
+    # --- Internals (called with the lock held) ---
+
+    def _fill(self):
+        """Reads orders from the plan until the lookahead is full or the plan is exhausted."""
+        while not self._exhausted and len(self._heap) < self.lookahead:
+            try:
+                order_id, reports = next(self._source)
+            except StopIteration:
+                self._exhausted = True
+                break
+            self._push(order_id, reports or [])
+
+    def _priorities(self, reports):
+        """The priority of every report row."""
+        return [self.parse_priority(report_data.get(excel_reader.COLUMNS_MAPPER.PRIORITY)) for report_data in reports]
+
+    def _push(self, order_id, reports):
+        priorities = self._priorities(reports)
+        key = min(priorities, default=float(settings.DEFAULT_PRIORITY))
+        if self.aging_seconds:
+            # Waiting lowers the key; the shared "now" term cancels out between orders
+            key += (time.perf_counter() - self.started_at) / self.aging_seconds
+        deadline = min((self.deadlines.get(priority, float("inf")) for priority in priorities), default=float("inf"))
+        heapq.heappush(self._heap, (key, deadline, next(self._sequence), order_id, reports))
+        for priority in priorities:
+            self._queued_reports[priority] = self._queued_reports.get(priority, 0) + 1
+
+    def _queued_up_to(self, priority):
+        """Reports still queued at the given priority or a more urgent one."""
+        return sum(n for p, n in self._queued_reports.items() if p <= priority)
+
+    def _check_deadlines(self):
+        """Warns once per priority when its queued reports are not expected to meet the deadline."""
+        if self.latency is None:
+            return
+
+        elapsed = time.perf_counter() - self.started_at
+        for priority, deadline in self.deadlines.items():
+            if priority in self._warned:
+                continue
+            queued = self._queued_up_to(priority)
+            if not queued:
+                continue
+            expected = elapsed + queued * self.latency / self.workers
+            if expected > deadline:
+                self._warned.add(priority)
+                logger.warning(
+                    f"Deadline at risk for priority {priority:g}: {queued} reports queued at "
+                    f"{self.latency:.1f}s each on {self.workers} sessions finish in ~{expected:.0f}s, "
+                    f"deadline is {deadline:.0f}s."
+                )
@@ -0,0 +1,182 @@
+import os
+import queue
+import threading
+import time
+
+from automation.authentication.session_manager import SessionManager
+from automation.authentication.login import authenticate
+from automation.workflows.upload_reports import UploadReportsWorkflow
+from automation.utilities.excel_reader import excel_reader
+from automation.utilities.save_download_state import save_state
+from automation.utilities.file_manager import get_files_in_directory
+from automation.config.settings import settings
+from automation.utilities.logger import logger
+
+
+class UploadPipeline:
+    """
+    Uploads the reports of finished orders while later orders are still downloading.
+
+    Download workflows submit an order once the download of every one of its reports was
+    confirmed by the browser (the DownloadTracker's completion event, or a direct or batch
+    download that wrote the file); without download tracking, clicked reports are never
+    confirmed and their orders are left to the regular upload run. A background thread with its own logged in browser
+    session (a WebDriver session cannot drive two tabs at the same time) uploads the
+    order's download folder with UploadReportsWorkflow and records the result in the
+    upload column of the state store. Orders are uploaded in the order they were submitted;
+    an order folder is only uploaded once it holds a finished file for every report, and a
+    failed upload is retried up to settings.UPLOAD_RETRIES times.
+    """
+
+    _STOP = object()
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.uploaded = 0
+        self.failed = 0
+        self.upload_seconds = 0.0
+        self._thread = None
+
+    def start(self):
+        """Starts the upload thread, which logs in while the first orders are downloading."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="upload-pipeline", daemon=True)
+            self._thread.start()
+            logger.info("Upload pipeline started.")
+        return self
+
+    def submit(self, order_id, report_names):
+        """
+        Queues the upload of an order's download folder.
+
+        Args:
+            order_id (str): The order to upload.
+            report_names (list): The reports whose upload state is recorded.
+        """
+        self.queue.put((str(order_id), list(report_names)))
+
+    def submit_if_confirmed(self, order_id, reports, confirmed):
+        """
+        Queues an order for upload if the download of every one of its reports is confirmed.
+
+        Reports planned in this run must be in `confirmed`; the order's other reports (done by
+        an earlier run) must be marked as downloaded in the state store, which only records
+        confirmed downloads.
+
+        Args:
+            order_id (str): The order that was just processed.
+            reports (list): Its report rows planned in this run.
+            confirmed (set): Names of the reports whose downloads were confirmed in this run.
+
+        Returns:
+            bool: True if the order was queued.
+        """
+        report_name_key = excel_reader.COLUMNS_MAPPER.REPORT_NAME
+        planned = {report_data.get(report_name_key) for report_data in reports or []}
+        rows = list(reports or [])
+        if excel_reader.EXCEL_FILE_DATA is not None:
+            rows += excel_reader.get_order_data_from_excel(order_id=order_id) or []
+        report_names = [report_name for report_name in dict.fromkeys(row.get(report_name_key) for row in rows) if report_name]
+        if not report_names:
+            return False
+
+        pending = [
+            report_name for report_name in report_names
+            if report_name not in confirmed and (
+                report_name in planned
+                or str((save_state.get_state(str(order_id), report_name) or {}).get("download")).lower() != "true"
+            )
+        ]
+        if pending:
+            logger.info(f"Order ID: {order_id} is not queued for upload; downloads not confirmed: {pending}")
+            return False
+
+        self.submit(order_id, report_names)
+        logger.info(f"Queued Order ID: {order_id} for upload ({self.queue.qsize()} waiting).")
+        return True
+
+    def close(self, timeout=None):
+        """
+        Waits for the queued uploads to finish and stops the upload thread.
+
+        Returns:
+            dict: The summary.
+        """
+        if self._thread is not None:
+            self.queue.put(self._STOP)
+            self._thread.join(timeout)
+            self._thread = None
+        summary = self.summary()
+        logger.info(
+            f"Upload pipeline finished: {summary['uploaded']} orders uploaded, {summary['failed']} failed "
+            f"in {summary['upload_seconds']:.1f}s of upload time."
+        )
+        return summary
+
+    def summary(self):
+        return {"uploaded": self.uploaded, "failed": self.failed, "upload_seconds": self.upload_seconds}
+
+    # --- Upload thread ---
+
+    def _run(self):
+        session_manager = SessionManager()
+        driver = session_manager.start_session()
+        try:
+            if driver:
+                driver = authenticate(session_manager, driver)
+            if not driver:
+                logger.error("The upload pipeline could not start a logged in session; queued uploads are skipped.")
+                self._drain()
+                return
+
+            workflow = UploadReportsWorkflow(driver)
+            while True:
+                item = self.queue.get()
+                if item is self._STOP:
+                    break
+                self._upload(workflow, *item)
+        finally:
+            session_manager.end_session()
+
+    def _upload(self, workflow, order_id, report_names):
+        upload_dir = os.path.join(settings.DOWNLOAD_PATH, order_id)
+        started_at = time.perf_counter()
+        uploaded = False
+        for attempt in range(1, settings.UPLOAD_RETRIES + 2):
+            try:
+                if attempt > 1:
+                    # Start the retry from a freshly loaded page
+                    workflow.driver.refresh()
+                    workflow.wait.settle("page_load", replaces=2, grid=True)
+                self._check_files(workflow, upload_dir, len(report_names))
+                uploaded = workflow.upload_reports(order_id, upload_dir)
+            except Exception as e:
+                logger.error(f"Upload of Order ID: {order_id} failed: {e}")
+                uploaded = False
+            if uploaded:
+                break
+            logger.warning(f"Upload attempt {attempt} of {settings.UPLOAD_RETRIES + 1} for Order ID: {order_id} failed.")
+        self.upload_seconds += time.perf_counter() - started_at
+
+        if not uploaded:
+            self.failed += 1
+            return
+
+        with save_state.batch():
+            for report_name in report_names:
+                save_state.mark_uploaded(order_id, report_name)
+        self.uploaded += 1
+
+    @staticmethod
+    def _check_files(workflow, upload_dir, expected):
+        """Raises unless the order folder holds `expected` finished files (one per report)."""
+        if not workflow.wait.wait_for_download_to_complete(upload_dir, timeout=settings.DOWNLOAD_TIMEOUT):
+            raise TimeoutError(f"downloads in {upload_dir} did not finish")
+        files = get_files_in_directory(upload_dir)
+        if len(files) < expected:
+            raise RuntimeError(f"{upload_dir} holds {len(files)} finished files, {expected} expected")
+
+    def _drain(self):
+        """Counts every queued order as failed until the pipeline is closed."""
+        while self.queue.get() is not self._STOP:
+            self.failed += 1
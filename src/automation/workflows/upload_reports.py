@@ -1,19 +1,52 @@
 import os
 import time
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 
 from automation.ui.page_base import PageBase
 from automation.ui.navigation import Navigation
-from automation.config.locators import InboundPageLocators, report_mapper_locator, ReportMapperKeys
-from automation.utilities.excel_mapper import report_mapper
+from automation.config.locators import InboundPageLocators, UploadPageLocators
+from automation.config.settings import settings
+from automation.utilities.excel_mapper import ReportPageMapperKeys, report_mapper
 from automation.utilities.logger import logger
+from automation.utilities.tracer import tracer
+from automation.utilities.wait_utils import settle_stats
 from automation.utilities.file_manager import get_files_in_directory, create_directory_if_not_exists
 
 
 class UploadReportsWorkflow(PageBase):
     """Handles uploading of reports for given recycling orders."""
 
+    # Shows the (usually hidden) file input of the upload widget and lets it take several files
+    EXPOSE_FILE_INPUT_SCRIPT = """
+        const input = document.querySelector("input[type='file'][name='files[]']");
+        if (input) {
+            input.style.display = 'block';
+            input.removeAttribute('hidden');
+            input.classList.remove('d-none');
+            input.multiple = true;
+        }
+        return !!input;
+    """
+
+    # Reports the state of the upload widget in one round-trip. The files[] input belongs to a
+    # jQuery File Upload widget: queued/uploading files are .template-upload rows (with a
+    # progress bar), finished ones .template-download rows, and every upload is a jQuery AJAX request.
+    UPLOAD_PROBE_SCRIPT = """
+        const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+        const texts = (selector) => Array.from(document.querySelectorAll(selector))
+            .map(el => el.textContent.trim()).filter(Boolean);
+        return {
+            ajax: (typeof jQuery === 'undefined') ? 0 : jQuery.active,
+            pending: Array.from(document.querySelectorAll('.template-upload, .fileupload-processing')).filter(visible).length,
+            done: document.querySelectorAll('.template-download').length,
+            errors: texts('.template-download .error, .template-upload .error, .template-download .text-danger'),
+        };
+    """
+
+    # Uploads that show no activity within this many seconds are taken to have never started
+    UPLOAD_START_GRACE = 5
+
     def __init__(self, driver):
         super().__init__(driver)
         self.navigation = Navigation(driver)
@@ -21,16 +54,21 @@ class UploadReportsWorkflow(PageBase):
     def upload_reports(self, order_id: str, upload_dir: str) -> bool:
         """
         Uploads all report files for a given order.
+
+        With settings.UPLOAD_BULK all files are handed to the files[] input in a single
+        send_keys call, so the widget uploads them as one batch; either way the workflow
+        waits for the widget to report the uploads as finished instead of sleeping.
+
         Returns True if successful, False otherwise.
         """
         logger.info(f"🚀 Starting upload for Order ID: {order_id}")
 
         # --- Step 1️⃣: Ensure correct page ---
         try:
-            page_url = report_mapper_locator.get_page_url(ReportMapperKeys.INBOUND_PAGE)
+            page_url = report_mapper.get_page_url(ReportPageMapperKeys.INBOUND)
             if self.driver.current_url != page_url:
                 self.driver.get(page_url)
-                time.sleep(5)
+                self.wait.settle("page_load", replaces=5, grid=True)
                 self.driver.execute_script("""
                     const el = document.getElementById('gritter-notice-wrapper');
                     if (el) { el.style.display = 'none'; el.style.visibility = 'hidden'; }
@@ -46,27 +84,23 @@ class UploadReportsWorkflow(PageBase):
             self.wait.wait_for_overlay_to_disappear(timeout=5)
             self.click(InboundPageLocators.SETTLEMENTS_TAB)
             logger.info("✅ Clicked 'Settlements' tab successfully.")
-            time.sleep(2)
+            self.wait.settle("open_tab", replaces=2, grid=True)
         except Exception as e:
             logger.warning(f"⚠️ Settlements tab click intercepted, retrying via JS: {e}")
             try:
                 tab_elem = self.driver.find_element(*InboundPageLocators.SETTLEMENTS_TAB)
                 self.driver.execute_script("arguments[0].click();", tab_elem)
-                time.sleep(2)
+                self.wait.settle("open_tab", replaces=2, grid=True)
             except Exception as e2:
                 logger.error(f"❌ Failed to open Settlements tab: {e2}")
                 return False
 
         # --- Step 3️⃣: Search for the order ---
         try:
-            search_field = self.wait.wait_for_element_to_be_visible(InboundPageLocators.SEARCH_FIELD, timeout=10)
-            search_field.clear()
-            time.sleep(0.5)
-            search_field.send_keys(order_id)
-            time.sleep(0.5)
-            search_field.send_keys(Keys.ENTER)
+            if not self.search(InboundPageLocators.SEARCH_FIELD, order_id, timeout=10):
+                raise RuntimeError("search field not found")
             logger.info(f"🔍 Searched for Order ID: {order_id}")
-            time.sleep(2)
+            self.wait.settle("search", replaces=3, grid=True)
         except Exception as e:
             logger.error(f"❌ Failed to search for order {order_id}: {e}")
             return False
@@ -93,35 +127,33 @@ class UploadReportsWorkflow(PageBase):
 
         # --- Step 5️⃣: Click 'Change' button ---
         try:
-            change_btn = self.wait.wait_for_element_to_be_clickable((By.ID, "bt_Change"), timeout=10)
+            change_btn = self.wait.wait_for_element_to_be_clickable(UploadPageLocators.CHANGE_BUTTON, timeout=10)
             change_btn.click()
             logger.info("✅ Clicked 'Change' button.")
-            time.sleep(2)
+            self.wait.settle("page_load", replaces=2)
         except Exception as e:
             logger.error(f"❌ Failed to click 'Change' button: {e}")
             return False
 
         # --- Step 6️⃣: Open 'Files' tab ---
         try:
-            files_tab = self.wait.wait_for_element_to_be_visible(
-                (By.XPATH, "//a[@href='#tab_RecyclingFiles']"), timeout=10
-            )
+            files_tab = self.wait.wait_for_element_to_be_visible(UploadPageLocators.FILES_TAB, timeout=10)
             self.driver.execute_script("arguments[0].click();", files_tab)
             logger.info("✅ Opened 'Files' tab successfully.")
-            time.sleep(3)
 
-            # Ensure Files tab actually loaded
-            if "RecyclingFiles" not in self.driver.page_source:
+            # Ensure Files tab actually loaded: probe its pane instead of scanning the page source
+            if not self.wait.wait_for_element_to_be_visible(UploadPageLocators.FILES_TAB_PANE, timeout=10):
                 logger.warning("⚠️ Files tab content not loaded properly.")
+            self.wait.settle("open_tab", replaces=3)
         except Exception as e:
             logger.error(f"❌ Failed to open 'Files' tab: {e}")
             return False
 
         # --- Step 7️⃣: Wait for modal to appear ---
         try:
-            modal = self.wait.wait_for_element_to_be_visible(
-                (By.CSS_SELECTOR, "div.modal-dialog"), timeout=30
-            )
+            modal = self.wait.wait_for_element_to_be_visible(UploadPageLocators.UPLOAD_MODAL, timeout=30)
+            if not modal:
+                raise TimeoutError("modal not visible")
             logger.info("✅ Upload modal appeared.")
         except Exception as e:
             logger.error(f"❌ Upload modal did not appear — upload button might have failed: {e}")
@@ -130,34 +162,23 @@ class UploadReportsWorkflow(PageBase):
 
         # --- Step 8️⃣: Locate upload input and upload files ---
         try:
+            files_to_upload = get_files_in_directory(upload_dir)
+            if not files_to_upload:
+                logger.warning(f"⚠️ No files found in directory: {upload_dir}")
+                return False
+
             # Expose hidden input if necessary
-            self.driver.execute_script("""
-                const input = document.querySelector("input[type='file'][name='files[]']");
-                if (input) {
-                    input.style.display = 'block';
-                    input.removeAttribute('hidden');
-                    input.classList.remove('d-none');
-                }
-            """)
-            time.sleep(1)
-
-            file_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='file'][name='files[]']")
-            if not file_input:
+            if not self.driver.execute_script(self.EXPOSE_FILE_INPUT_SCRIPT):
                 logger.error("❌ Upload input not found — check locator or iframe.")
                 self._capture_debug(order_id)
                 return False
+            file_input = self.driver.find_element(*UploadPageLocators.FILE_INPUT)
 
-            files_to_upload = get_files_in_directory(upload_dir)
-            if not files_to_upload:
-                logger.warning(f"⚠️ No files found in directory: {upload_dir}")
+            if not self.upload_files(file_input, files_to_upload):
+                self._capture_debug(order_id)
                 return False
 
-            for file_path in files_to_upload:
-                logger.info(f"⬆️ Uploading file: {os.path.basename(file_path)}")
-                file_input.send_keys(file_path)
-                time.sleep(1.5)
-
-            logger.info("✅ All files uploaded successfully.")
+            logger.info(f"✅ All {len(files_to_upload)} files uploaded successfully.")
         except Exception as e:
             logger.error(f"❌ File upload failed: {e}")
             self._capture_debug(order_id)
@@ -165,19 +186,103 @@ class UploadReportsWorkflow(PageBase):
 
         # --- Step 9️⃣: Save / Confirm upload ---
         try:
-            save_btn = self.wait.wait_for_element_to_be_clickable(
-                (By.XPATH, "//button[contains(text(),'Save') or contains(text(),'Upload')]"),
-                timeout=10
-            )
+            save_btn = self.wait.wait_for_element_to_be_clickable(UploadPageLocators.SAVE_BUTTON, timeout=10)
             save_btn.click()
             logger.info("💾 Clicked 'Save/Upload' button.")
         except Exception as e:
             logger.warning(f"⚠️ Save/Upload button not found or not clickable: {e}")
 
-        time.sleep(3)
+        self.wait.settle("save_upload", replaces=3)
         logger.info(f"✅ Upload completed for Order ID: {order_id}")
         return True
 
+    def upload_files(self, file_input, file_paths) -> bool:
+        """
+        Hands files to the upload widget and waits until it reports them as uploaded.
+
+        With settings.UPLOAD_BULK the paths are sent newline-separated in one send_keys
+        call, which selects them all at once on a multiple file input; otherwise they are
+        sent one at a time, each waiting for its upload.
+
+        Args:
+            file_input: The files[] input element.
+            file_paths (list): Absolute paths of the files to upload.
+
+        Returns:
+            bool: True if every upload completed without an error.
+        """
+        batches = [file_paths] if settings.UPLOAD_BULK else [[file_path] for file_path in file_paths]
+        for batch in batches:
+            logger.info(f"⬆️ Uploading {len(batch)} file(s): {', '.join(os.path.basename(path) for path in batch)}")
+            baseline = self._upload_state()
+            with tracer.span("upload_files", cat="wait", files=len(batch)):
+                file_input.send_keys("\n".join(os.path.abspath(path) for path in batch))
+                if not self.wait_for_uploads(len(batch), baseline):
+                    return False
+        return True
+
+    def wait_for_uploads(self, count, baseline=None, timeout=None) -> bool:
+        """
+        Waits until the upload widget has finished the uploads that were just started.
+
+        Uploads count as finished once no AJAX request is active, no file is still queued or
+        uploading, and either `count` new finished rows appeared or the widget was seen busy
+        and went idle again. A widget that shows neither within UPLOAD_START_GRACE seconds
+        never started the uploads, which counts as a failure.
+
+        Args:
+            count (int): Number of files handed to the widget.
+            baseline (dict, optional): The widget state from before the files were sent.
+            timeout (float, optional): Defaults to settings.UPLOAD_TIMEOUT.
+
+        Returns:
+            bool: True if the uploads finished without errors within the timeout.
+        """
+        timeout = settings.UPLOAD_TIMEOUT if timeout is None else timeout
+        done_before = (baseline or {}).get("done", 0)
+        errors_before = len((baseline or {}).get("errors", []))
+        started_at = time.perf_counter()
+        seen_busy = False
+        finished = False
+        never_started = False
+        state = None
+
+        while time.perf_counter() - started_at < timeout:
+            state = self._upload_state()
+            if state:
+                busy = state["ajax"] > 0 or state["pending"] > 0
+                seen_busy = seen_busy or busy
+                if not busy and (state["done"] - done_before >= count or seen_busy):
+                    finished = True
+                    break
+            if not seen_busy and time.perf_counter() - started_at >= self.UPLOAD_START_GRACE:
+                never_started = True
+                break
+            time.sleep(settings.SETTLE_POLL_INTERVAL)
+
+        waited = time.perf_counter() - started_at
+        # The per-file path used to sleep 1.5s per file
+        settle_stats.record("upload", waited, 1.5 * count, finished)
+        if never_started:
+            logger.error(f"❌ Upload widget showed no activity within {self.UPLOAD_START_GRACE}s; last state: {state}")
+            return False
+        if not finished:
+            logger.error(f"❌ Uploads did not finish within {timeout}s; last state: {state}")
+            return False
+
+        errors = state["errors"][errors_before:]
+        if errors:
+            logger.error(f"❌ Upload widget reported errors: {errors}")
+            return False
+        logger.debug("Uploaded %d file(s) in %.2fs.", count, waited)
+        return True
+
+    def _upload_state(self):
+        try:
+            return self.driver.execute_script(self.UPLOAD_PROBE_SCRIPT)
+        except WebDriverException:
+            return None
+
     # --- Helper: capture screenshot + page source for debugging ---
     def _capture_debug(self, order_id: str):
         try:
@@ -0,0 +1,160 @@
+import itertools
+import threading
+import time
+
+from automation.authentication.session_manager import SessionManager
+from automation.authentication.login import authenticate
+from automation.workflows.download_reports import DownloadReportsWorkflow
+from automation.workflows.scheduler import ReportScheduler
+from automation.workflows.upload_pipeline import UploadPipeline
+from automation.utilities.excel_reader import excel_reader
+from automation.utilities.wait_utils import settle_stats
+from automation.config.settings import settings
+from automation.utilities.logger import logger
+
+
+class DownloadWorkerPool:
+    """
+    Runs the download reports workflow across several browser sessions in parallel.
+
+    Every worker starts its own SessionManager session, logs in on its own and keeps
+    its own DownloadReportsWorkflow (and therefore its own ReportDownloader). Orders are
+    pulled from the shared work plan, so a slow or failed worker never holds back the others,
+    and all results are written to the shared download state store.
+    """
+
+    def __init__(self, workers=None):
+        """
+        Initializes the DownloadWorkerPool.
+
+        Args:
+            workers (int, optional): Number of parallel browser sessions. Defaults to settings.WORKERS.
+        """
+        self.workers = max(1, int(workers or settings.WORKERS))
+        self.results = {}
+        self.scheduler = None
+        self.upload_pipeline = None
+        self._results_lock = threading.Lock()
+
+    def run(self, plan=None):
+        """
+        Spreads the orders of a work plan across the workers and waits for them to finish.
+
+        Args:
+            plan (dict | iterable, optional): A plan from DownloadReportsWorkflow.build_plan(),
+                or the (order_id, reports) pairs from stream_plan(). When not given, a plan is
+                built (or streamed when settings.EXCEL_STREAMING is on).
+
+        Returns:
+            dict: Per-worker counts of processed and failed orders.
+        """
+        logger.info(f"Starting the download worker pool with {self.workers} workers.")
+        if plan is None:
+            if settings.EXCEL_STREAMING:
+                plan = DownloadReportsWorkflow.stream_plan()
+            else:
+                excel_reader.read_excel_file(sheet_name="Sheet1", custom_fields=DownloadReportsWorkflow.CUSTOM_FIELDS)
+                plan = DownloadReportsWorkflow.build_plan()
+
+        workers = self.workers
+        total = None
+        if isinstance(plan, dict):
+            if not plan:
+                logger.info("Nothing to download; every report in the Excel file is already done.")
+                return {}
+            workers = min(workers, len(plan))
+            total = len(plan)
+            plan = plan.items()
+
+        self.scheduler = ReportScheduler(plan, workers=workers) if settings.PRIORITY_SCHEDULING else None
+        if self.scheduler:
+            plan = self.scheduler
+
+        # One upload session serves every worker, uploading orders as their downloads finish
+        self.upload_pipeline = UploadPipeline().start() if settings.PIPELINE_UPLOADS else None
+
+        # Workers pull from one shared iterator, so a streamed plan is consumed as it is parsed
+        self._orders = iter(plan)
+        self._orders_lock = threading.Lock()
+        self._consumed = 0
+
+        started_at = time.perf_counter()
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(index,),
+                name=f"download-worker-{index}",
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self.upload_pipeline:
+            self.upload_pipeline.close()
+
+        if self.scheduler:
+            self.scheduler.report()
+        settle_stats.report()
+        elapsed = time.perf_counter() - started_at
+        processed = sum(result["processed"] for result in self.results.values())
+        failed = sum(result["failed"] for result in self.results.values())
+        # Streamed plans have no known length; the rest of them is not read just to count it
+        unprocessed = f", {total - self._consumed} left unprocessed" if total is not None else ""
+        rate = processed / (elapsed / 60) if elapsed else 0.0
+        logger.info(
+            f"Download worker pool finished: {processed} orders processed, {failed} failed"
+            f"{unprocessed} in {elapsed:.1f}s ({rate:.1f} orders/min)."
+        )
+        return self.results
+
+    def _next_orders(self):
+        """Returns the next window of (order_id, reports) pairs; empty when the plan is exhausted."""
+        size = max(1, settings.INBOUND_BATCH_SIZE)
+        with self._orders_lock:
+            window = list(itertools.islice(self._orders, size))
+            self._consumed += len(window)
+            return window
+
+    def _work(self, index):
+        """Starts a logged in session and pulls orders from the plan until it is exhausted."""
+        result = {"processed": 0, "failed": 0}
+        with self._results_lock:
+            self.results[index] = result
+
+        session_manager = SessionManager()
+        driver = session_manager.start_session()
+        if not driver:
+            logger.error(f"Worker {index} could not start a WebDriver session.")
+            return
+
+        workflow = None
+        try:
+            driver = authenticate(session_manager, driver)
+            if not driver:
+                logger.error(f"Worker {index} could not log in.")
+                return
+
+            workflow = DownloadReportsWorkflow(
+                driver, load_excel=False, scheduler=self.scheduler, upload_pipeline=self.upload_pipeline,
+                session_manager=session_manager,
+            )
+            while True:
+                window = self._next_orders()
+                if not window:
+                    break
+
+                try:
+                    workflow.process_orders(window)
+                    result["processed"] += len(window)
+                except Exception as e:
+                    result["failed"] += len(window)
+                    order_ids = [order_id for order_id, _ in window]
+                    logger.error(f"Worker {index} failed to process orders {order_ids}: {e}")
+        finally:
+            if workflow is not None:
+                workflow.close()
+            session_manager.end_session()
+            logger.info(f"Worker {index} finished: {result['processed']} processed, {result['failed']} failed.")
@@ -0,0 +1,23 @@
+import os
+import sys
+import tempfile
+
+# Settings are read when automation is first imported; point them at a throwaway directory
+_tmp = tempfile.mkdtemp(prefix="automation-tests-")
+os.environ.setdefault("BASE_URL", "http://erp.test")
+os.environ.setdefault("USER_EMAIL", "tests@example.com")
+os.environ.setdefault("USER_PASSWORD", "tests")
+for _name, _path in {
+    "LOG_FILE_PATH": "logs/run.log",
+    "LOG_JSON_PATH": "logs/run.jsonl",
+    "TRACE_PATH": "logs/trace.json",
+    "MEMORY_LOG_PATH": "logs/memory.csv",
+    "STATE_DB_PATH": "state/downloads.db",
+    "EXCEL_CACHE_DIR": "cache/excel",
+    "INVOICE_CACHE_PATH": "cache/sales_orders.json",
+    "DOWNLOAD_PATH": "downloads",
+}.items():
+    os.environ.setdefault(_name, os.path.join(_tmp, _path))
+os.environ.setdefault("LOG_ASYNC", "false")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
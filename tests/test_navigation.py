@@ -0,0 +1,106 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from automation.ui.navigation import Navigation, NavigationPlan, NavigationPlanError
+
+
+def row(action, locator_type=None, locator_value=None, value=None):
+    return {"Action": action, "LocatorType": locator_type, "LocatorValue": locator_value, "Value": value}
+
+
+class FakeNavigation(Navigation):
+    """Records what the handlers would do instead of driving a browser."""
+
+    def __init__(self):
+        self.calls = []
+        self._handlers = {action: self._record for action in self.ACTIONS}
+
+    def _record(self, step, value):
+        self.calls.append((step.action, value))
+
+
+def test_compile_builds_locators_and_timeouts():
+    plan = Navigation.compile([
+        row("navigate", value="https://erp.test/orders"),
+        row("Click", "css", "#search"),
+        row("wait", "id", "grid", "2.5"),
+        row("wait"),
+    ])
+
+    assert isinstance(plan, NavigationPlan)
+    assert [step.action for step in plan] == ["navigate", "click", "wait", "wait"]
+    assert plan.steps[1].locator == (By.CSS_SELECTOR, "#search")
+    assert plan.steps[2].timeout == 2.5
+    assert plan.steps[3].locator is None and plan.steps[3].timeout is None
+
+
+def test_compile_treats_empty_and_nan_cells_as_missing():
+    plan = Navigation.compile([row("click", " xpath ", "//a", float("nan"))])
+    assert plan.steps[0].value is None
+    assert plan.steps[0].locator == (By.XPATH, "//a")
+
+
+def test_compile_reports_every_invalid_row():
+    with pytest.raises(NavigationPlanError) as excinfo:
+        Navigation.compile([
+            row("hover", "id", "x"),
+            row("click"),
+            row("send_keys", "id", "search"),
+            row("click", "shadow", "x"),
+            row("click", "id", None),
+            row("wait", value="soon"),
+        ])
+
+    assert excinfo.value.errors == [
+        "step 1: unsupported action 'hover'",
+        "step 2: 'click' needs a locator",
+        "step 3: 'send_keys' needs a value",
+        "step 4: unsupported locator type 'shadow'",
+        "step 5: locator type 'id' has no locator value",
+        "step 6: wait time 'soon' is not a number",
+    ]
+
+
+def test_only_identifier_braces_are_placeholders():
+    plan = Navigation.compile([
+        row("navigate", value="https://erp.test/orders?id={order_id}"),
+        row("send_keys", "id", "payload", '{"json": 1} for {order_id}'),
+    ])
+
+    assert plan.fields == {"order_id"}
+    assert plan.steps[1].fields == ("order_id",)
+
+
+def test_literal_braces_are_typed_as_they_are():
+    navigation = FakeNavigation()
+    plan = Navigation.compile([row("send_keys", "id", "payload", '{"json": 1}')])
+
+    assert plan.fields == frozenset()
+    assert navigation.execute_plan(plan)["ok"]
+    assert navigation.calls == [("send_keys", '{"json": 1}')]
+
+
+def test_execute_plan_fills_placeholders_and_requires_them():
+    navigation = FakeNavigation()
+    plan = Navigation.compile([row("send_keys", "id", "search", "{order_id} / {order_id}")])
+
+    with pytest.raises(NavigationPlanError):
+        navigation.execute_plan(plan)
+
+    result = navigation.execute_plan(plan, order_id="SO1")
+    assert result["ok"] and result["failed_step"] is None
+    assert navigation.calls == [("send_keys", "SO1 / SO1")]
+
+
+def test_plan_is_immutable():
+    plan = Navigation.compile([row("wait")])
+
+    with pytest.raises(AttributeError):
+        plan._steps = ()
+    with pytest.raises(TypeError):
+        plan[0] = None
+
+
+def test_wait_of_zero_seconds_is_kept():
+    plan = Navigation.compile([row("wait", "id", "grid", "0")])
+    assert plan.steps[0].timeout == 0.0